@@ -0,0 +1,237 @@
+# benchmarks/bench_visualizaciones.py
+"""
+Benchmarks de las rutas calientes de utils/visualizaciones_ext.py sobre datos
+sintéticos (ver sintetico.py) de 1, 38 y 380 partidos.
+
+Etapas (para el jugador de referencia, en todos sus partidos):
+    load        índice jugador→partido + get_match_data_for_player + CSV de la temporada
+    normalise   normalize_events de cada partido
+    compute     build_pass_network de cada partido
+    render_72   dashboard (red de pases + acciones de la temporada), savefig a 72 dpi
+    render_300  lo mismo a 300 dpi
+
+Por etapa: tiempo (mejor de --repeat), pico de memoria (tracemalloc, en
+una pasada aparte para no falsear el tiempo), filas y nº de Artists.
+
+    python benchmarks/bench_visualizaciones.py --scales 1 38 380
+    python benchmarks/bench_visualizaciones.py --compare benchmarks/results/A.json benchmarks/results/B.json
+
+Los resultados se guardan en benchmarks/results/<commit>.json para poder
+comparar entre commits.
+"""
+from pathlib import Path
+import argparse
+import gc
+import io
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import pandas as pd
+
+BENCH_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = BENCH_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+import sintetico  # noqa: E402
+from utils import eventos, indice_partidos, red_pases  # noqa: E402
+import utils.visualizaciones_ext as vis  # noqa: E402
+
+DATA_DIR = BENCH_DIR / "_data"
+RESULTS_DIR = BENCH_DIR / "results"
+DEFAULT_SCALES = [1, 38, 380]
+
+
+# --- Estado compartido entre etapas ----------------------------------------------
+class _Ctx:
+    def __init__(self, data_dir, player_id):
+        self.data_dir = data_dir
+        self.player_id = player_id
+        self.entries = []
+        self.raw = []        # [(entry, df_eventos, df_jugadores)]
+        self.frames = []     # [EventsFrame]
+        self.networks = []
+
+
+def _clear_caches():
+    indice_partidos._DIR_INDEXES.clear()
+    indice_partidos._LIST_INDEXES.clear()
+    eventos.clear_events_cache()
+    red_pases.clear_network_cache()
+
+
+def stage_load(ctx):
+    idx = indice_partidos.build_player_index(ctx.data_dir, save=False)
+    cols = eventos.EVENTS_FRAME_COLUMNS   # mismas columnas que leen los gráficos
+    dfe, dfp = vis.get_match_data_for_player(ctx.player_id, index=idx, columns=cols)
+    ctx.entries = idx.lookup(ctx.player_id)
+    ctx.raw = [(ctx.entries[0], dfe, dfp)] + [
+        (e, vis._auto_csv_vis(e["events_file"], cols), vis._auto_csv_vis(e["players_file"]))
+        for e in ctx.entries[1:]
+    ]
+    return {"rows": int(sum(len(d) for _, d, _ in ctx.raw)), "matches": len(ctx.raw)}
+
+
+def stage_normalise(ctx):
+    ctx.frames = [eventos.normalize_events(d, match_id=e["match"]) for e, d, _ in ctx.raw]
+    return {"rows": int(sum(len(f) for f in ctx.frames))}
+
+
+def stage_compute(ctx):
+    ctx.networks = [
+        red_pases.build_pass_network(f, p, player_id=ctx.player_id)
+        for f, (_, _, p) in zip(ctx.frames, ctx.raw)
+    ]
+    return {"rows": int(sum(n.n_edges for n in ctx.networks if n is not None))}
+
+
+def _render(ctx, dpi):
+    fig, (ax_red, ax_acc) = plt.subplots(1, 2, figsize=(12, 4.5))
+    vis.draw_pitch_panel(ax_red)
+    vis.draw_pitch_panel(ax_acc)
+    vis.plot_pass_network_for_player(ax_red, None, player_id=ctx.player_id,
+                                     network=ctx.networks[0])
+    # Acciones de toda la temporada en un solo panel (crece con los datos)
+    season = eventos.concat_events(ctx.frames)
+    vis.plot_winger_actions_for_player(ax_acc, season, player_id=ctx.player_id)
+    fig.savefig(io.BytesIO(), dpi=dpi, format="png")
+    artists = len(fig.findobj())
+    plt.close(fig)
+    return {"rows": len(season), "artists": artists}
+
+
+def stage_render_72(ctx):
+    return _render(ctx, 72)
+
+
+def stage_render_300(ctx):
+    return _render(ctx, 300)
+
+
+STAGES = [
+    ("load", stage_load),
+    ("normalise", stage_normalise),
+    ("compute", stage_compute),
+    ("render_72", stage_render_72),
+    ("render_300", stage_render_300),
+]
+
+
+# --- Medición ----------------------------------------------------------------------
+def _measure(fn, ctx, repeat, *, cold):
+    # Tiempo: mejor de `repeat` (sin tracemalloc). Memoria: una pasada con tracemalloc.
+    best, info = None, {}
+    for _ in range(repeat):
+        if cold:
+            _clear_caches()
+        gc.collect()
+        t0 = time.perf_counter()
+        info = fn(ctx) or {}
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+
+    if cold:
+        _clear_caches()
+    gc.collect()
+    tracemalloc.start()
+    fn(ctx)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"wall_s": round(best, 4), "peak_mb": round(peak / 2**20, 2), **info}
+
+
+def run_scale(n_matches, *, repeat=3, seed=0):
+    data_dir = sintetico.generate(DATA_DIR / f"n{n_matches}", n_matches, seed=seed)
+    ctx = _Ctx(data_dir, sintetico.BENCH_PLAYER_ID)
+    rows = []
+    for name, fn in STAGES:
+        # load y normalise se miden en frío (sin cachés en memoria)
+        res = _measure(fn, ctx, repeat, cold=name in ("load", "normalise"))
+        res.setdefault("artists", None)
+        rows.append({"scale": n_matches, "stage": name, **res})
+        print(f"  n={n_matches:<4} {name:<11} {res['wall_s']:>8.3f} s  "
+              f"{res['peak_mb']:>8.1f} MB  artists={res['artists']}")
+    return rows
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "sin-git"
+
+
+def run(scales, *, repeat=3, out=None):
+    import matplotlib as mpl
+    import numpy as np
+
+    commit = _git_commit()
+    results = []
+    for n in scales:
+        print(f"Escala {n} partidos")
+        results += run_scale(n, repeat=repeat)
+    doc = {
+        "meta": {
+            "commit": commit,
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pandas": pd.__version__, "numpy": np.__version__, "matplotlib": mpl.__version__,
+            "repeat": repeat,
+            "player_id": sintetico.BENCH_PLAYER_ID,
+        },
+        "results": results,
+    }
+    out = Path(out) if out else RESULTS_DIR / f"{commit}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(doc, indent=1), encoding="utf-8")
+    print(f"Resultados en {out}")
+    return doc
+
+
+# --- Comparación entre dos ejecuciones --------------------------------------------
+def compare(path_a, path_b, *, threshold=1.10):
+    """Imprime B/A por (escala, etapa) y marca las regresiones (> threshold)."""
+    a = json.loads(Path(path_a).read_text(encoding="utf-8"))
+    b = json.loads(Path(path_b).read_text(encoding="utf-8"))
+    key = lambda r: (r["scale"], r["stage"])  # noqa: E731
+    ra = {key(r): r for r in a["results"]}
+    print(f"A={a['meta']['commit']}  B={b['meta']['commit']}")
+    print(f"{'escala':>6} {'etapa':<11} {'A s':>8} {'B s':>8} {'B/A':>6} {'A MB':>7} {'B MB':>7}")
+    regressions = 0
+    for r in b["results"]:
+        p = ra.get(key(r))
+        if p is None:
+            continue
+        ratio = r["wall_s"] / p["wall_s"] if p["wall_s"] else float("nan")
+        mark = "  ← regresión" if ratio > threshold else ""
+        regressions += ratio > threshold
+        print(f"{r['scale']:>6} {r['stage']:<11} {p['wall_s']:>8.3f} {r['wall_s']:>8.3f} "
+              f"{ratio:>6.2f} {p['peak_mb']:>7.1f} {r['peak_mb']:>7.1f}{mark}")
+    return regressions
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmarks de visualizaciones_ext.")
+    ap.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--out", default=None, help="JSON de salida (por defecto results/<commit>.json)")
+    ap.add_argument("--compare", nargs=2, metavar=("A", "B"), default=None)
+    args = ap.parse_args(argv)
+    if args.compare:
+        return 1 if compare(*args.compare) else 0
+    run(args.scales, repeat=args.repeat, out=args.out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,323 @@
+# benchmarks/sintetico.py
+"""
+Generador de datos sintéticos con la forma de WhoScored (lg_eventos,
+lg_jugadores y features_jugadores) para medir rendimiento con temporadas
+enteras sin depender de los CSV reales.
+
+    python benchmarks/sintetico.py --matches 380 --out benchmarks/_data/n380
+
+Estructura generada (igual que data/matches):
+    <out>/jornada_N/<N>J_<LOC>_<VIS>_lg_eventos.csv
+    <out>/jornada_N/<N>J_<LOC>_<VIS>_lg_jugadores.csv
+    <out>/jornada_N/<N>J_<LOC>_<VIS>_features_jugadores.csv
+
+Las columnas se copian de data/matches/jornada_1 si existe (mismo orden y
+anchura que los reales); si no, se usa la lista mínima de este módulo.
+Con la misma semilla el resultado es idéntico.
+"""
+from pathlib import Path
+import argparse
+import json
+import math
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+TEMPLATE_DIR = PROJECT_ROOT / "data" / "matches" / "jornada_1"
+
+N_TEAMS = 20
+MATCHES_PER_JORNADA = 10
+EVENTS_PER_MATCH = 1500
+TEAM_ID_BASE = 9000          # teamId sintéticos: 9001..9020
+PLAYER_ID_BASE = 900000      # playerId = base + team*100 + dorsal
+
+# Jugador de referencia para los benchmarks (extremo titular del equipo 1)
+BENCH_TEAM = 1
+BENCH_SHIRT = 7
+BENCH_PLAYER_ID = PLAYER_ID_BASE + BENCH_TEAM * 100 + BENCH_SHIRT
+
+# Distribución de tipos y % de éxito (medida sobre la jornada 1 real)
+TYPE_FREQ = {
+    "Pass": 0.646, "BallRecovery": 0.052, "BallTouch": 0.041, "Foul": 0.030,
+    "Clearance": 0.028, "TakeOn": 0.026, "Tackle": 0.023, "Aerial": 0.021,
+    "CornerAwarded": 0.014, "Dispossessed": 0.011, "Challenge": 0.011,
+    "BlockedPass": 0.010, "Interception": 0.010, "SavedShot": 0.009,
+    "Save": 0.009, "KeeperPickup": 0.008, "MissedShots": 0.006,
+    "OffsidePass": 0.004, "Goal": 0.003, "Card": 0.003, "ShotOnPost": 0.001,
+}
+SUCCESS_RATE = {"Pass": 0.82, "TakeOn": 0.41, "Tackle": 0.62, "Aerial": 0.5,
+                "BallTouch": 0.5, "Foul": 0.5, "CornerAwarded": 0.5, "Challenge": 0.0}
+SHOT_TYPES = {"SavedShot", "MissedShots", "Goal", "ShotOnPost"}
+
+# Posiciones base (4-3-3, coordenadas Opta atacando hacia x=100) por dorsal
+FORMATION = {
+    1: ("GK", 6, 50), 2: ("DR", 30, 15), 3: ("DL", 30, 85), 4: ("DC", 25, 38),
+    5: ("DC", 25, 62), 6: ("DMC", 42, 50), 8: ("MC", 52, 35), 10: ("AMC", 58, 65),
+    7: ("FWR", 72, 12), 11: ("FWL", 72, 88), 9: ("FW", 80, 50),
+}
+SUBS = {12: ("Sub", 55, 30), 14: ("Sub", 55, 70), 16: ("Sub", 70, 50),
+        18: ("Sub", 40, 50), 21: ("Sub", 28, 50)}
+
+MIN_EVENT_COLUMNS = [
+    "id", "eventId", "minute", "second", "teamId", "x", "y", "expandedMinute",
+    "period", "type", "outcomeType", "satisfiedEventsTypes", "isTouch", "playerId",
+    "endX", "endY", "relatedEventId", "relatedPlayerId", "goalMouthZ", "goalMouthY",
+    "isGoal", "isShot", "qNone_Zone", "qNone_ShotAssist", "qNone_IntentionalAssist",
+    "qNone_Cross", "qNone_BigChanceCreated", "qNone_IntentionalGoalAssist",
+    "qNone_KeyPass", "qNone_Assisted", "qNone_BigChance", "qNone_BlockedCross",
+]
+MIN_PLAYER_COLUMNS = [
+    "playerId", "shirtNo", "name", "position", "age", "isFirstEleven", "field",
+    "s_touches", "s_passesTotal", "s_passesAccurate", "s_passesKey",
+    "s_dribblesWon", "s_dribblesAttempted", "s_shotsTotal", "s_shotsOnTarget",
+    "s_tacklesTotal", "s_tackleSuccessful", "s_interceptions", "s_clearances",
+    "s_aerialsTotal", "s_aerialsWon", "teamId", "s_passSuccess", "s_dribbleSuccess",
+]
+
+
+def _header(pattern, fallback):
+    files = sorted(TEMPLATE_DIR.glob(pattern)) if TEMPLATE_DIR.exists() else []
+    if not files:
+        return list(fallback)
+    with open(files[0], "r", encoding="utf-8-sig") as f:
+        cols = [c.strip() for c in f.readline().rstrip("\n").split(",")]
+    # las columnas que genera este módulo siempre están
+    return cols + [c for c in fallback if c not in cols]
+
+
+def team_acronym(t):
+    return f"T{t:02d}"
+
+
+def team_id(t):
+    return TEAM_ID_BASE + t
+
+
+def player_id(t, shirt):
+    return PLAYER_ID_BASE + t * 100 + shirt
+
+
+def fixtures(n_matches):
+    """[(jornada, local, visitante)] con 10 partidos por jornada (round-robin)."""
+    teams = list(range(1, N_TEAMS + 1))
+    out = []
+    j = 0
+    while len(out) < n_matches:
+        j += 1
+        r = (j - 1) % (N_TEAMS - 1)
+        rot = [teams[0]] + teams[1:][r:] + teams[1:][:r]
+        for k in range(MATCHES_PER_JORNADA):
+            home, away = rot[k], rot[-1 - k]
+            if j % 2 == 0:
+                home, away = away, home
+            out.append((j, home, away))
+            if len(out) == n_matches:
+                break
+    return out
+
+
+# --- Eventos -------------------------------------------------------------------
+def _match_events(rng, n, home, away, next_id):
+    types = np.array(list(TYPE_FREQ))
+    p = np.array(list(TYPE_FREQ.values()))
+    typ = rng.choice(types, size=n, p=p / p.sum())
+
+    # Posesiones: rachas del mismo equipo (media ~5 eventos)
+    runs = rng.geometric(0.2, size=n)
+    side = np.repeat(np.arange(len(runs)) % 2, runs)[:n]
+    teams = np.where(side == 0, home, away)
+
+    # Jugador: titulares casi siempre, algún suplente
+    shirts_start = np.array(list(FORMATION))
+    shirts_sub = np.array(list(SUBS))
+    w = np.array([0.3 if s == 1 else 1.0 for s in shirts_start])
+    shirt = rng.choice(shirts_start, size=n, p=w / w.sum())
+    sub = rng.random(n) < 0.06
+    shirt[sub] = rng.choice(shirts_sub, size=sub.sum())
+    # solo los porteros paran/atrapan
+    keeper = np.isin(typ, ["Save", "KeeperPickup"])
+    shirt[keeper] = 1
+
+    base = {**FORMATION, **SUBS}
+    bx = np.array([base[s][1] for s in shirt], dtype=float)
+    by = np.array([base[s][2] for s in shirt], dtype=float)
+    x = np.clip(bx + rng.normal(0, 12, n), 0, 100)
+    y = np.clip(by + rng.normal(0, 12, n), 0, 100)
+
+    is_shot = np.isin(typ, list(SHOT_TYPES))
+    x[is_shot] = rng.uniform(78, 97, is_shot.sum())
+    y[is_shot] = rng.uniform(30, 70, is_shot.sum())
+
+    end_x = np.full(n, np.nan)
+    end_y = np.full(n, np.nan)
+    is_pass = typ == "Pass"
+    end_x[is_pass] = np.clip(x[is_pass] + rng.normal(8, 15, is_pass.sum()), 0, 100)
+    end_y[is_pass] = np.clip(y[is_pass] + rng.normal(0, 15, is_pass.sum()), 0, 100)
+    gmy = np.full(n, np.nan)
+    gmz = np.full(n, np.nan)
+    gmy[is_shot] = rng.uniform(40, 60, is_shot.sum())
+    gmz[is_shot] = rng.uniform(0, 40, is_shot.sum())
+    end_x[is_shot] = 100.0
+    end_y[is_shot] = gmy[is_shot]
+
+    succ = np.array([SUCCESS_RATE.get(t, 1.0) for t in typ])
+    outcome = np.where(rng.random(n) < succ, "Successful", "Unsuccessful")
+
+    t = np.sort(rng.uniform(0, 95 * 60, n))
+    minute = (t // 60).astype(int)
+    second = (t % 60).astype(int)
+
+    def flag(mask):
+        return np.where(mask, 1.0, np.nan)
+
+    wide = (y < 20) | (y > 80)
+    cross = is_pass & wide & (x > 70) & (rng.random(n) < 0.35)
+    key = is_pass & (x > 65) & (rng.random(n) < 0.03)
+    assist = key & (rng.random(n) < 0.15)
+
+    df = pd.DataFrame({
+        "id": np.arange(next_id, next_id + n, dtype=np.int64),
+        "eventId": np.arange(1, n + 1),
+        "minute": minute,
+        "second": second,
+        "teamId": [team_id(tm) for tm in teams],
+        "x": x.round(1),
+        "y": y.round(1),
+        "expandedMinute": minute,
+        "period": np.where(minute < 45, "FirstHalf", "SecondHalf"),
+        "type": typ,
+        "outcomeType": outcome,
+        "satisfiedEventsTypes": "[]",
+        "isTouch": ~np.isin(typ, ["CornerAwarded", "Card", "Foul"]),
+        "playerId": [player_id(tm, s) for tm, s in zip(teams, shirt)],
+        "endX": end_x.round(1),
+        "endY": end_y.round(1),
+        "goalMouthZ": gmz.round(1),
+        "goalMouthY": gmy.round(1),
+        "isGoal": np.where(typ == "Goal", True, None),
+        "isShot": np.where(is_shot, True, None),
+        "qNone_Zone": np.where(x < 33, "Back", np.where(y < 33, "Right",
+                      np.where(y > 66, "Left", "Center"))),
+        "qNone_Cross": flag(cross),
+        "qNone_KeyPass": flag(key & ~assist),
+        "qNone_ShotAssist": np.where(key, 15.0, np.nan),
+        "qNone_IntentionalAssist": flag(assist),
+        "qNone_IntentionalGoalAssist": flag(assist & (rng.random(n) < 0.5)),
+        "qNone_Assisted": flag(assist),
+        "qNone_BigChance": flag(is_shot & (rng.random(n) < 0.1)),
+        "qNone_BigChanceCreated": flag(key & (rng.random(n) < 0.2)),
+        "qNone_BlockedCross": flag(cross & (outcome == "Unsuccessful") & (rng.random(n) < 0.3)),
+    })
+    return df
+
+
+# --- Jugadores -----------------------------------------------------------------
+def _match_players(rng, home, away, events):
+    rows = []
+    for field, t in (("home", home), ("away", away)):
+        for shirt, (pos, _, _) in {**FORMATION, **SUBS}.items():
+            pid = player_id(t, shirt)
+            ev = events[events["playerId"] == pid]
+            passes = ev[ev["type"] == "Pass"]
+            drib = ev[ev["type"] == "TakeOn"]
+            shots = ev[ev["type"].isin(SHOT_TYPES)]
+            starter = shirt in FORMATION
+            minutes = 95 if starter else int(rng.integers(10, 45))
+            n_pass = len(passes)
+            n_ok = int((passes["outcomeType"] == "Successful").sum())
+            n_drib = len(drib)
+            n_drib_ok = int((drib["outcomeType"] == "Successful").sum())
+            rows.append({
+                "playerId": pid, "shirtNo": shirt,
+                "name": f"Jugador {team_acronym(t)}-{shirt}",
+                "position": pos, "age": int(rng.integers(18, 35)),
+                "isFirstEleven": 1.0 if starter else np.nan, "field": field,
+                "teamId": team_id(t), "minutes": minutes,
+                "s_touches": float(len(ev)), "s_passesTotal": float(n_pass),
+                "s_passesAccurate": float(n_ok),
+                "s_passesKey": float(ev["qNone_KeyPass"].notna().sum()),
+                "s_dribblesWon": float(n_drib_ok), "s_dribblesAttempted": float(n_drib),
+                "s_shotsTotal": float(len(shots)),
+                "s_shotsOnTarget": float(shots["type"].isin(["SavedShot", "Goal"]).sum()),
+                "s_tacklesTotal": float((ev["type"] == "Tackle").sum()),
+                "s_tackleSuccessful": float(((ev["type"] == "Tackle")
+                                             & (ev["outcomeType"] == "Successful")).sum()),
+                "s_interceptions": float((ev["type"] == "Interception").sum()),
+                "s_clearances": float((ev["type"] == "Clearance").sum()),
+                "s_aerialsTotal": float((ev["type"] == "Aerial").sum()),
+                "s_aerialsWon": float(((ev["type"] == "Aerial")
+                                       & (ev["outcomeType"] == "Successful")).sum()),
+                "s_passSuccess": round(100 * n_ok / n_pass, 2) if n_pass else np.nan,
+                "s_dribbleSuccess": round(100 * n_drib_ok / n_drib, 2) if n_drib else np.nan,
+            })
+    return pd.DataFrame(rows)
+
+
+def _features(players):
+    f = players.copy()
+    m = f["minutes"].clip(lower=1)
+    for c in ["s_touches", "s_passesTotal", "s_passesAccurate", "s_passesKey",
+              "s_shotsTotal", "s_shotsOnTarget", "s_dribblesAttempted", "s_dribblesWon",
+              "s_tacklesTotal", "s_tackleSuccessful", "s_interceptions", "s_clearances",
+              "s_aerialsTotal", "s_aerialsWon"]:
+        f[f"{c}_per90"] = (f[c] * 90 / m).round(2)
+    return f
+
+
+# --- Escritura -----------------------------------------------------------------
+def generate(out_dir, n_matches, *, seed=0, events_per_match=None):
+    """
+    Genera n_matches partidos en out_dir. Si ya existe un juego con los
+    mismos parámetros (ver _sintetico.json) no hace nada. Devuelve out_dir.
+    """
+    out_dir = Path(out_dir)
+    params = {"matches": n_matches, "seed": seed,
+              "events_per_match": events_per_match or EVENTS_PER_MATCH, "version": 1}
+    stamp = out_dir / "_sintetico.json"
+    if stamp.exists():
+        try:
+            if json.loads(stamp.read_text(encoding="utf-8")) == params:
+                return out_dir
+        except ValueError:
+            pass
+
+    ev_cols = _header("*_lg_eventos.csv", MIN_EVENT_COLUMNS)
+    pl_cols = _header("*_lg_jugadores.csv", MIN_PLAYER_COLUMNS)
+    ft_cols = _header("*_features_jugadores.csv", MIN_PLAYER_COLUMNS + ["minutes"])
+
+    rng = np.random.default_rng(seed)
+    next_id = 2_000_000_000
+    for jornada, home, away in fixtures(n_matches):
+        jdir = out_dir / f"jornada_{jornada}"
+        jdir.mkdir(parents=True, exist_ok=True)
+        key = f"{jornada}J_{team_acronym(home)}_{team_acronym(away)}"
+        ev = _match_events(rng, params["events_per_match"], home, away, next_id)
+        next_id += len(ev)
+        pl = _match_players(rng, home, away, ev)
+        ft = _features(pl)
+        ev.reindex(columns=ev_cols).to_csv(jdir / f"{key}_lg_eventos.csv", index=False)
+        pl.reindex(columns=pl_cols).to_csv(jdir / f"{key}_lg_jugadores.csv", index=False)
+        ft.reindex(columns=ft_cols).to_csv(jdir / f"{key}_features_jugadores.csv", index=False)
+
+    stamp.write_text(json.dumps(params), encoding="utf-8")
+    return out_dir
+
+
+def n_jornadas(n_matches):
+    return math.ceil(n_matches / MATCHES_PER_JORNADA)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Datos WhoScored sintéticos para benchmarks.")
+    ap.add_argument("--matches", type=int, default=38)
+    ap.add_argument("--out", default=None)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+    out = args.out or PROJECT_ROOT / "benchmarks" / "_data" / f"n{args.matches}"
+    generate(out, args.matches, seed=args.seed)
+    print(f"{args.matches} partidos ({n_jornadas(args.matches)} jornadas) en {out}")
+
+
+if __name__ == "__main__":
+    main()
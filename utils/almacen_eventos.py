@@ -0,0 +1,308 @@
+# utils/almacen_eventos.py
+"""
+Almacén columnar (Parquet) de eventos y jugadores WhoScored.
+
+La ingesta convierte data/matches/jornada_*/*_lg_eventos.csv y
+*_lg_jugadores.csv a Parquet tipado, particionado como:
+
+    <data_dir>/_cache/almacen/jornada=1/competicion=laliga/partido=1J_ATH_SEV/
+        eventos.parquet
+        jugadores.parquet
+
+Después cada gráfico lee solo las columnas que usa (y, si se pide, solo las
+filas de un jugador). Requiere pyarrow.
+"""
+from pathlib import Path
+import json
+import os
+
+import pandas as pd
+
+from .indice_partidos import (
+    CACHE_DIRNAME, discover_match_files, match_key_from_path, _jornada_num,
+)
+
+STORE_DIRNAME = "almacen"
+MANIFEST_FILENAME = "_ingesta.json"
+
+# --- Esquema de tipos ----------------------------------------------------------
+ID_COLUMNS = ["id", "eventId", "teamId", "playerId", "relatedEventId", "relatedPlayerId"]
+MINUTE_COLUMNS = ["minute", "expandedMinute"]
+COORD_COLUMNS = ["x", "y", "endX", "endY", "blockedX", "blockedY",
+                 "goalMouthY", "goalMouthZ", "second"]
+CATEGORY_COLUMNS = ["type", "outcomeType", "period", "cardType", "qNone_Zone",
+                    "qNone_PlayerPosition"]
+BOOL_COLUMNS = ["isTouch", "isShot", "isGoal"]
+
+PLAYER_ID_COLUMNS = ["playerId", "teamId", "subbedInPlayerId", "subbedOutPlayerId"]
+PLAYER_CATEGORY_COLUMNS = ["position", "field"]
+
+# Partición de los partidos sin competición conocida (ni en el mapa explícito
+# ni en master_partidos): se dejan aparte en vez de suponer una liga
+UNKNOWN_COMPETITION = "sin_competicion"
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as exc:
+        raise ImportError(
+            "El almacén columnar necesita pyarrow (pip install pyarrow)."
+        ) from exc
+
+
+def _to_bool(s):
+    # True/False/"True"/1.0/NaN -> boolean con NA
+    if s.dtype == bool:
+        return s.astype("boolean")
+    low = s.astype(str).str.strip().str.lower()
+    out = pd.Series(pd.NA, index=s.index, dtype="boolean")
+    out[low.isin({"true", "1", "1.0", "t", "yes"})] = True
+    out[low.isin({"false", "0", "0.0", "f", "no"})] = False
+    return out
+
+
+def typed_events(df):
+    """Aplica el esquema de tipos a un lg_eventos (ids Int64, coords float32...)."""
+    df = df.copy()
+    for c in df.columns:
+        s = df[c]
+        if c in ID_COLUMNS:
+            df[c] = pd.to_numeric(s, errors="coerce").astype("Int64")
+        elif c in MINUTE_COLUMNS:
+            df[c] = pd.to_numeric(s, errors="coerce").astype("Int16")
+        elif c in COORD_COLUMNS:
+            df[c] = pd.to_numeric(s, errors="coerce").astype("float32")
+        elif c in CATEGORY_COLUMNS:
+            df[c] = s.astype("string").astype("category")
+        elif c in BOOL_COLUMNS:
+            df[c] = _to_bool(s)
+        elif c.startswith("qNone_") and pd.api.types.is_numeric_dtype(s):
+            # flags (1.0) y valores pequeños: float32 basta
+            df[c] = s.astype("float32")
+    return df
+
+
+def typed_players(df):
+    """Esquema de tipos para lg_jugadores."""
+    df = df.copy()
+    for c in df.columns:
+        s = df[c]
+        if c in PLAYER_ID_COLUMNS:
+            df[c] = pd.to_numeric(s, errors="coerce").astype("Int64")
+        elif c in PLAYER_CATEGORY_COLUMNS:
+            df[c] = s.astype("string").astype("category")
+        elif c.startswith("s_") and pd.api.types.is_numeric_dtype(s):
+            df[c] = s.astype("float32")
+    return df
+
+
+def default_masters_dir(data_dir):
+    # data/matches -> data/masters
+    return Path(data_dir).resolve().parent / "masters"
+
+
+def match_competition_map(data_dir, competitions=None, masters_dir=None):
+    """
+    {match_key: competición} de master_partidos (columnas partido y
+    competicion) con competitions por encima para forzar alguno.
+    """
+    from .masters import match_competitions
+    masters_dir = masters_dir if masters_dir is not None else default_masters_dir(data_dir)
+    return {**match_competitions(masters_dir), **(competitions or {})}
+
+
+def competition_for_match(match_key, competitions=None):
+    """
+    Competición del partido según el mapa (p. ej. match_competition_map),
+    o None si no está: no se deduce de los equipos.
+    """
+    return (competitions or {}).get(match_key)
+
+
+# --- Almacén -------------------------------------------------------------------
+class EventStore:
+    """
+    Acceso de lectura al almacén Parquet. Las particiones se localizan por
+    clave de partido ("1J_ATH_SEV") sin abrir ningún fichero.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self._parts = None
+
+    def _partitions(self):
+        if self._parts is None:
+            parts = {}
+            for d in self.root.glob("jornada=*/competicion=*/partido=*"):
+                if not (d / "eventos.parquet").exists():
+                    continue   # restos de una partición movida o borrada
+                jornada = int(d.parent.parent.name.split("=", 1)[1])
+                comp = d.parent.name.split("=", 1)[1]
+                match = d.name.split("=", 1)[1]
+                parts[match] = {"jornada": jornada, "competicion": comp, "dir": d}
+            self._parts = parts
+        return self._parts
+
+    def refresh(self):
+        self._parts = None
+
+    def matches(self):
+        """DataFrame con las particiones: match, jornada, competicion."""
+        rows = [{"match": m, "jornada": p["jornada"], "competicion": p["competicion"]}
+                for m, p in self._partitions().items()]
+        df = pd.DataFrame(rows, columns=["match", "jornada", "competicion"])
+        return df.sort_values(["jornada", "match"]).reset_index(drop=True)
+
+    def __contains__(self, match):
+        return match in self._partitions()
+
+    def _file(self, match, name):
+        part = self._partitions().get(match)
+        if part is None:
+            raise KeyError(f"Partido no ingerido en el almacén: {match}")
+        return part["dir"] / name
+
+    def events_path(self, match):
+        """Fichero de eventos del partido (para sellos de caché)."""
+        return self._file(match, "eventos.parquet")
+
+    def _read(self, path, columns=None, filters=None):
+        _require_pyarrow()
+        import pyarrow.parquet as pq
+        if columns is not None:
+            schema_names = set(pq.read_schema(path).names)
+            columns = [c for c in dict.fromkeys(columns) if c in schema_names]
+        table = pq.read_table(path, columns=columns, filters=filters)
+        return table.to_pandas()
+
+    def load_events(self, match, columns=None):
+        """Eventos de un partido (solo las columnas pedidas si se indican)."""
+        return self._read(self._file(match, "eventos.parquet"), columns=columns)
+
+    def load_players(self, match, columns=None):
+        """lg_jugadores de un partido."""
+        return self._read(self._file(match, "jugadores.parquet"), columns=columns)
+
+    def load_player_events(self, player_id, *, matches=None, columns=None):
+        """
+        Eventos de un jugador. Si no se pasan matches se recorren todas las
+        particiones; lo normal es pasar los partidos del índice
+        (PlayerMatchIndex.lookup) para leer solo esos ficheros.
+        """
+        pid = int(float(player_id))
+        if matches is None:
+            matches = list(self.matches()["match"])
+        cols = None if columns is None else list(dict.fromkeys(["playerId", *columns]))
+        frames = []
+        for m in matches:
+            if m not in self:
+                continue
+            df = self._read(self._file(m, "eventos.parquet"), columns=cols,
+                            filters=[("playerId", "==", pid)])
+            if not df.empty:
+                df["match"] = m
+                frames.append(df)
+        if not frames:
+            return pd.DataFrame(columns=(cols or []) + ["match"])
+        return pd.concat(frames, ignore_index=True)
+
+
+def store_dir_for(data_dir):
+    return Path(data_dir) / CACHE_DIRNAME / STORE_DIRNAME
+
+
+# --- Ingesta -------------------------------------------------------------------
+def _remove_partition(root, rel):
+    # Borra la partición (ficheros y carpeta) y las carpetas padre que queden vacías
+    part = root / rel
+    for f in part.glob("*"):
+        if f.is_file():
+            f.unlink()
+    d = part
+    while d != root and d.is_dir() and not any(d.iterdir()):
+        d.rmdir()
+        d = d.parent
+
+
+def _read_csv_auto(path):
+    from .lectura_csv import sniff_sep   # lectura_csv importa el esquema de aquí
+
+    with open(path, "r", encoding="utf-8") as f:
+        sep = sniff_sep(f.readline())
+    df = pd.read_csv(path, sep=sep, encoding="utf-8", low_memory=False)
+    df.columns = [c.strip() for c in df.columns]
+    return df
+
+
+def _write_parquet(df, path):
+    tmp = path.with_suffix(".tmp")
+    df.to_parquet(tmp, engine="pyarrow", index=False)
+    os.replace(tmp, path)
+
+
+def ingest_matches(data_dir, store_dir=None, *, competitions=None, masters_dir=None,
+                   force=False):
+    """
+    Convierte los CSV de data_dir/jornada_* al almacén Parquet.
+    Es incremental: solo reconvierte partidos nuevos o cuyos CSV han cambiado.
+    La competición sale de master_partidos (masters_dir, por defecto
+    data_dir/../masters); competitions: {match_key: "laliga"|"premier"|...}
+    para forzarla. Los partidos sin competición van a UNKNOWN_COMPETITION.
+    Devuelve el EventStore.
+    """
+    _require_pyarrow()
+    data_dir = Path(data_dir)
+    root = Path(store_dir) if store_dir is not None else store_dir_for(data_dir)
+    root.mkdir(parents=True, exist_ok=True)
+
+    manifest_path = root / MANIFEST_FILENAME
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+
+    comps = match_competition_map(data_dir, competitions, masters_dir)
+    seen = set()
+    for p_path, e_path in discover_match_files(data_dir):
+        if not os.path.exists(e_path):
+            continue
+        match = match_key_from_path(p_path)
+        seen.add(match)
+        st_p, st_e = os.stat(p_path), os.stat(e_path)
+        stamp = [st_p.st_mtime_ns, st_p.st_size, st_e.st_mtime_ns, st_e.st_size]
+        jornada = _jornada_num(Path(p_path).parent)
+        comp = competition_for_match(match, comps) or UNKNOWN_COMPETITION
+        part = root / f"jornada={jornada}" / f"competicion={comp}" / f"partido={match}"
+
+        prev = manifest.get(match)
+        if (not force and prev is not None and prev["stamp"] == stamp
+                and prev["dir"] == part.relative_to(root).as_posix()
+                and (part / "eventos.parquet").exists()):
+            continue
+
+        # Si el partido cambió de competición/jornada, borra la partición vieja
+        if prev is not None and prev["dir"] != part.relative_to(root).as_posix():
+            _remove_partition(root, prev["dir"])
+
+        part.mkdir(parents=True, exist_ok=True)
+        _write_parquet(typed_events(_read_csv_auto(e_path)), part / "eventos.parquet")
+        _write_parquet(typed_players(_read_csv_auto(p_path)), part / "jugadores.parquet")
+        manifest[match] = {"stamp": stamp, "dir": part.relative_to(root).as_posix()}
+
+    # Partidos que ya no están en data_dir
+    for match in [m for m in manifest if m not in seen]:
+        _remove_partition(root, manifest.pop(match)["dir"])
+
+    tmp = manifest_path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, manifest_path)
+    return EventStore(root)
+
+
+def open_store(data_dir=None, store_dir=None):
+    """Abre un almacén ya ingerido (sin reconvertir nada)."""
+    root = Path(store_dir) if store_dir is not None else store_dir_for(data_dir)
+    return EventStore(root)
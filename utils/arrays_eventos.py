@@ -0,0 +1,342 @@
+# utils/arrays_eventos.py
+"""
+Eventos normalizados de toda la carpeta de datos como arrays NumPy de ancho
+fijo, guardados en .npy y abiertos con memory-map:
+
+    <data_dir>/_cache/arrays/
+        _arrays.json              partidos (offsets), vocabularios, sellos
+        x.npy y.npy ...           float32 (coordenadas, minuto, segundo)
+        pid.npy tid.npy rel.npy   int32 (-1 = sin id)
+        eid.npy                   int64 (los id de WhoScored pasan de 2^31)
+        type.npy                  uint8 = typeId Opta (Opta_typeId.xlsx)
+        outc.npy                  uint8 (vocabulario en _arrays.json)
+        flags.npy                 uint8 (n, 2): FLAG_COLUMNS en bits (ver FlagMatrix)
+        jugador_*.npy             índice jugador -> filas
+
+Las filas de cada partido son contiguas (tabla de offsets), así que
+match_frame() da un EventsFrame cuyas columnas numéricas son vistas del
+memmap, sin copiar. player_frame() junta solo las filas de un jugador.
+Los EventsFrame resultantes se pasan tal cual a build_pass_network y a
+plot_winger_actions_for_player, y EventArrays sirve como store= en las
+funciones *_auto de visualizaciones_ext.
+"""
+from pathlib import Path
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .eventos import FLAG_COLUMNS, EventsFrame, FlagMatrix
+from .indice_partidos import (
+    CACHE_DIRNAME, _jornada_num, _stamp, discover_match_files, match_key_from_path,
+)
+from .ingesta import read_matches
+from .lectura_csv import read_whoscored_csv
+from .opta import norm_name, type_id_lut, type_ids
+
+ARRAYS_DIRNAME = "arrays"
+META_FILENAME = "_arrays.json"
+ARRAYS_VERSION = 1
+
+NO_ID = -1
+FLOAT_COLUMNS = ["x", "y", "endX", "endY", "minute", "second", "gmy", "gmz"]
+ID_COLUMNS = ["pid", "tid", "rel"]
+# Códigos de tipo que no están en el xlsx de Opta (p. ej. OffsideGiven) se
+# asignan de 255 hacia abajo; 0 = sin tipo
+EXTRA_TYPE_CODE = 255
+
+
+def arrays_dir_for(data_dir):
+    return Path(data_dir) / CACHE_DIRNAME / ARRAYS_DIRNAME
+
+
+# --- Codificación de un partido ---------------------------------------------------
+class _Vocab:
+    # Vocabularios de type (typeId Opta + extras) y outcome, compartidos por todos los partidos
+    def __init__(self, types=None, outcomes=None):
+        self.types = dict(types or {})          # code -> nombre WhoScored
+        self.outcomes = dict(outcomes or {})    # code -> outcome en minúsculas
+        self._type_code = {norm_name(n): c for c, n in self.types.items()}
+        self._outc_code = {o: c for c, o in self.outcomes.items()}
+
+    def type_codes(self, raw_type):
+        cat = pd.Categorical(raw_type)
+        lut = np.zeros(len(cat.categories) + 1, dtype=np.uint8)   # -1 (NaN) -> 0
+        for i, name in enumerate(cat.categories):
+            key = norm_name(name)
+            code = self._type_code.get(key)
+            if code is None:
+                code = type_ids().get(key)
+                if code is None or code in self.types:
+                    code = EXTRA_TYPE_CODE
+                    while code in self.types:
+                        code -= 1
+                self.types[code] = str(name)
+                self._type_code[key] = code
+            lut[i] = code
+        return lut[cat.codes]
+
+    def outcome_codes(self, outc):
+        cat = pd.Categorical(outc)
+        lut = np.zeros(len(cat.categories) + 1, dtype=np.uint8)
+        for i, o in enumerate(cat.categories):
+            code = self._outc_code.get(o)
+            if code is None:
+                code = len(self.outcomes) + 1
+                self.outcomes[code] = o
+                self._outc_code[o] = code
+            lut[i] = code
+        return lut[cat.codes]
+
+
+def _encode(ev, vocab):
+    # EventsFrame -> {columna: ndarray} con los tipos de ancho fijo
+    d = ev.df
+    out = {c: d[c].to_numpy(dtype=np.float32, na_value=np.nan) for c in FLOAT_COLUMNS}
+    for c in ID_COLUMNS:
+        out[c] = d[c].fillna(NO_ID).to_numpy(dtype=np.int32)
+    out["eid"] = d["eid"].fillna(NO_ID).to_numpy(dtype=np.int64)
+    out["type"] = vocab.type_codes(d["type"])
+    out["outc"] = vocab.outcome_codes(d["outc"])
+    dense = np.column_stack([ev.flags.column(n) for n in FLAG_COLUMNS])
+    out["flags"] = np.packbits(dense, axis=1, bitorder="little")
+    return out
+
+
+COLUMNS = FLOAT_COLUMNS + ID_COLUMNS + ["eid", "type", "outc", "flags"]
+DTYPES = {**{c: np.float32 for c in FLOAT_COLUMNS}, **{c: np.int32 for c in ID_COLUMNS},
+          "eid": np.int64, "type": np.uint8, "outc": np.uint8, "flags": np.uint8}
+
+
+# --- Lectura -----------------------------------------------------------------------
+def _ids(a):
+    # int32/int64 con -1 -> Int64 con NA
+    return pd.arrays.IntegerArray(a.astype(np.int64), a == NO_ID)
+
+
+class EventArrays:
+    """
+    Acceso a los arrays (memmap de solo lectura). Las filas de un partido son
+    arrays[start:stop]; las de un jugador, arrays[rows] con rows del índice.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        with open(self.root / META_FILENAME, "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self._matches = {m["match"]: m for m in self.meta["matches"]}
+        self._cols = {c: np.load(self.root / f"{c}.npy", mmap_mode="r") for c in COLUMNS}
+        self._player_ids = np.load(self.root / "jugador_pid.npy", mmap_mode="r")
+        self._player_off = np.load(self.root / "jugador_off.npy", mmap_mode="r")
+        self._player_rows = np.load(self.root / "jugador_filas.npy", mmap_mode="r")
+
+        # código -> posición en las categorías (para Categorical.from_codes)
+        types = {int(c): n for c, n in self.meta["types"].items()}
+        self._type_names = [n for _, n in sorted(types.items())]
+        self._type_lut = np.full(256, -1, dtype=np.int16)
+        for i, c in enumerate(sorted(types)):
+            self._type_lut[c] = i
+        # código guardado -> typeId Opta (los extras y los repetidos se resuelven por nombre)
+        self._type_id_lut = np.zeros(256, dtype=np.int16)
+        self._type_id_lut[sorted(types)] = type_id_lut(self._type_names)
+        outcomes = {int(c): o for c, o in self.meta["outcomes"].items()}
+        self._outc_names = [o for _, o in sorted(outcomes.items())]
+        self._outc_lut = np.full(256, -1, dtype=np.int16)
+        for i, c in enumerate(sorted(outcomes)):
+            self._outc_lut[c] = i
+
+    def __len__(self):
+        return len(self._cols["x"])
+
+    def __contains__(self, match):
+        return match in self._matches
+
+    def __repr__(self):
+        return f"EventArrays(matches={len(self._matches)}, rows={len(self)})"
+
+    @property
+    def matches(self):
+        """Claves de partido en el orden en que están guardadas."""
+        return list(self._matches)
+
+    def match_slice(self, match):
+        m = self._matches[match]
+        return slice(m["start"], m["stop"])
+
+    def player_rows(self, player_id, matches=None):
+        """Filas (ordenadas) de player_id; con matches, solo las de esos partidos."""
+        pid = int(float(player_id))
+        i = int(np.searchsorted(self._player_ids, pid))
+        if i >= len(self._player_ids) or self._player_ids[i] != pid:
+            return np.zeros(0, dtype=np.int64)
+        rows = self._player_rows[self._player_off[i]:self._player_off[i + 1]]
+        if matches is not None:
+            keep = np.zeros(len(rows), dtype=bool)
+            for m in matches:
+                if m in self._matches:
+                    s = self.match_slice(m)
+                    keep |= (rows >= s.start) & (rows < s.stop)
+            rows = rows[keep]
+        return np.asarray(rows)
+
+    def frame(self, rows, match_id=None):
+        """
+        EventsFrame de las filas rows (slice -> vistas sin copia de las
+        columnas numéricas; array de índices -> solo esas filas).
+        """
+        c = {k: v[rows] for k, v in self._cols.items()}
+        n = len(c["x"])
+        types = pd.Categorical.from_codes(self._type_lut[c["type"]], categories=self._type_names) \
+            if self._type_names else pd.Categorical([None] * n)
+        outc = pd.Categorical.from_codes(self._outc_lut[c["outc"]], categories=self._outc_names) \
+            if self._outc_names else pd.Categorical(["nan"] * n)
+
+        data = {
+            "type":      types,
+            "type_norm": types.rename_categories([norm_name(t) for t in types.categories]),
+            "type_id":   self._type_id_lut[c["type"]],
+            "outc":      outc,
+            "pid":       _ids(c["pid"]),
+            "tid":       _ids(c["tid"]),
+            "rel":       _ids(c["rel"]),
+            "eid":       _ids(c["eid"]),
+        }
+        for k in FLOAT_COLUMNS:
+            data[k] = c[k]
+        d = pd.DataFrame(data, copy=False)
+        d["t"] = d["minute"].fillna(0).astype(np.float64)*60 + d["second"].fillna(0)
+        flags = FlagMatrix(np.asarray(c["flags"]), FLAG_COLUMNS)
+        return EventsFrame(d, match_id=match_id, flags=flags)
+
+    def match_frame(self, match):
+        """EventsFrame de un partido (vistas del memmap)."""
+        return self.frame(self.match_slice(match), match_id=("arrays", match))
+
+    def player_frame(self, player_id, matches=None):
+        """EventsFrame con los eventos de player_id (todos sus partidos o los de matches)."""
+        return self.frame(self.player_rows(player_id, matches))
+
+    # --- Interfaz de almacén (store=) para visualizaciones_ext -----------------------
+    def load_events(self, match, columns=None):
+        # Devuelve el EventsFrame (los gráficos lo aceptan igual que lg_eventos)
+        return self.match_frame(match)
+
+    def load_players(self, match, columns=None):
+        return read_whoscored_csv(self._matches[match]["players_file"], columns,
+                                  schema={}, engine="c")
+
+    def events_path(self, match):
+        if match not in self._matches:
+            raise KeyError(f"Partido no incluido en los arrays: {match}")
+        return self.root / META_FILENAME
+
+
+# --- Construcción -------------------------------------------------------------------
+def _save(path, arr):
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, arr)
+    os.replace(tmp, path)
+
+
+def _player_index(pid):
+    # Filas ordenadas por (jugador, fila): cada jugador es un tramo contiguo
+    valid = np.flatnonzero(pid != NO_ID)
+    order = valid[np.argsort(pid[valid], kind="stable")]
+    ids, starts = np.unique(pid[order], return_index=True)
+    off = np.append(starts, len(order)).astype(np.int64)
+    return ids.astype(np.int64), off, order.astype(np.int64)
+
+
+def build_event_arrays(data_dir, root=None, *, force=False, workers=None, processes=True):
+    """
+    Genera (o reutiliza) los arrays de data_dir y devuelve el EventArrays.
+    Solo se vuelven a leer los CSV de partidos nuevos o cambiados; el resto
+    se copia de los arrays anteriores. Esos CSV se leen en paralelo con
+    utils.ingesta.read_matches (workers: None = CPUs disponibles, 1 = en
+    este proceso); la codificación va después y en orden, así que los
+    arrays no dependen de workers.
+    """
+    data_dir = Path(data_dir)
+    root = Path(root) if root is not None else arrays_dir_for(data_dir)
+    root.mkdir(parents=True, exist_ok=True)
+
+    old = None
+    if not force and (root / META_FILENAME).exists():
+        try:
+            old = EventArrays(root)
+            if old.meta.get("version") != ARRAYS_VERSION:
+                old = None
+        except (OSError, ValueError, KeyError):
+            old = None
+
+    pairs = []
+    for p_path, e_path in discover_match_files(data_dir):
+        if os.path.exists(e_path):
+            pairs.append((match_key_from_path(p_path), _jornada_num(Path(p_path).parent),
+                          p_path, e_path, list(_stamp(e_path))))
+    pairs.sort(key=lambda r: (r[1], r[0]))
+
+    if old is not None and [(m["match"], m["stamp"]) for m in old.meta["matches"]] == \
+            [(k, st) for k, _, _, _, st in pairs]:
+        return old
+
+    vocab = _Vocab(
+        {int(c): n for c, n in old.meta["types"].items()} if old else None,
+        {int(c): o for c, o in old.meta["outcomes"].items()} if old else None,
+    )
+    def reusable(key, st):
+        prev = old._matches.get(key) if old is not None else None
+        return prev if prev is not None and prev["stamp"] == st else None
+
+    # Partidos nuevos o cambiados: lectura + normalización (en paralelo si workers > 1)
+    todo = [e_path for key, _, _, e_path, st in pairs if reusable(key, st) is None]
+    fresh = {r["path"]: r["events"]
+             for r in read_matches(todo, workers=workers, processes=processes)} if todo else {}
+
+    parts = {c: [] for c in COLUMNS}
+    matches, start = [], 0
+    for key, jornada, p_path, e_path, st in pairs:
+        prev = reusable(key, st)
+        if prev is not None:
+            s = slice(prev["start"], prev["stop"])
+            enc = {c: np.array(old._cols[c][s]) for c in COLUMNS}
+        else:
+            enc = _encode(fresh.pop(str(e_path)), vocab)
+        n = len(enc["x"])
+        for c in COLUMNS:
+            parts[c].append(enc[c])
+        matches.append({"match": key, "jornada": jornada, "start": start, "stop": start + n,
+                        "stamp": st, "players_file": str(p_path), "events_file": str(e_path)})
+        start += n
+
+    arrays = {c: np.concatenate(parts[c]) if parts[c] else np.zeros(0, DTYPES[c])
+              for c in COLUMNS}
+    if not parts["flags"]:
+        arrays["flags"] = np.zeros((0, (len(FLAG_COLUMNS) + 7) // 8), np.uint8)
+    del old   # suelta los memmap antes de reemplazar los ficheros
+    for c, arr in arrays.items():
+        _save(root / f"{c}.npy", arr)
+    ids, off, order = _player_index(arrays["pid"])
+    _save(root / "jugador_pid.npy", ids)
+    _save(root / "jugador_off.npy", off)
+    _save(root / "jugador_filas.npy", order)
+
+    meta = {
+        "version": ARRAYS_VERSION,
+        "flags": FLAG_COLUMNS,
+        "types": {str(c): n for c, n in sorted(vocab.types.items())},
+        "outcomes": {str(c): o for c, o in sorted(vocab.outcomes.items())},
+        "matches": matches,
+    }
+    tmp = root / (META_FILENAME + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp, root / META_FILENAME)
+    return EventArrays(root)
+
+
+def open_event_arrays(data_dir=None, root=None):
+    """Abre arrays ya generados (sin comprobar los CSV)."""
+    return EventArrays(Path(root) if root is not None else arrays_dir_for(data_dir))
@@ -0,0 +1,636 @@
+# utils/dashboard_batch.py
+"""
+Render en lote de las hojas comparativas (dashboards) desde línea de comandos.
+
+Lee un manifiesto JSON con las comparativas (jugadores, jornada, grupo de
+posición, títulos) y genera un PNG por comparativa en paralelo, un proceso por
+núcleo y backend Agg. Cada proceso mantiene sus propias cachés (índice de
+jugadores, registro de masters, EventsFrame y redes de pases), así que las comparativas
+de una misma jornada reutilizan lo ya cargado.
+
+El render es incremental: por cada comparativa se calcula un hash de sus
+entradas (CSV de los partidos, masters, imágenes, parámetros y código de
+dibujo) y solo se rehacen las que han cambiado. <out_dir>/_build.json
+registra qué se construyó, cuándo y por qué.
+
+Uso:
+    python -m utils.dashboard_batch manifests/comparativas.json --workers 4
+    python -m utils.dashboard_batch manifests/comparativas.json --trace lote.json
+
+Con --trace (o COMPARATIVA_TRAZAS, ver utils.trazas) cada proceso recoge
+spans por etapa y se juntan en una traza Chrome.
+
+Formato del manifiesto:
+    {
+      "defaults": {"dpi": 150, "out_dir": "outputs/dashboards"},
+      "comparisons": [
+        {"name": "Comparativa_extremos_j1", "grupo": "extremos", "jornada": 1,
+         "players": [{"id": 408449, "label": "Nico"}, 480249, 299490],
+         "title": "Comparativa · Extremos · Liga/Premier",
+         "subtitle": "(Jornada 1ª, 17 Agosto)",
+         "logos": ["images/logos/laliga.png"]}
+      ]
+    }
+"jornada": "*" genera una comparativa por cada jornada_N de data_dir.
+"players": {"similar_to": 408449, "k": 2} pone al jugador y sus k más
+parecidos de data_dir (ver utils.similares; admite también "position" y
+"min_minutes").
+Las rutas relativas se resuelven desde la raíz del proyecto.
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+from . import trazas
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULTS = {
+    "data_dir":    "data/matches",
+    "masters_dir": "data/masters",
+    "out_dir":     "outputs/dashboards",
+    "dpi":         150,
+    "figsize":     [16, 12],
+}
+
+# --- Paleta "Dark Cyan" (la misma del notebook dashboard_ext) ------------------
+BG_MAIN      = "#0F1420"
+TEXT_MAIN    = "#E6EDF3"
+TEXT_SECOND  = "#9DA7B3"
+TITLE_COLOR  = "#F7FAFC"
+ACCENT_CYAN  = "#00E5FF"
+GRID_COLOR   = "#2B3240"
+PITCH_BG     = "#1A1730"
+PITCH_LINES  = "#00E5FF"
+
+RC_PARAMS = {
+    "figure.facecolor":  BG_MAIN,
+    "axes.facecolor":    BG_MAIN,
+    "savefig.facecolor": BG_MAIN,
+    "text.color":        TEXT_MAIN,
+    "axes.labelcolor":   TEXT_MAIN,
+    "xtick.color":       TEXT_SECOND,
+    "ytick.color":       TEXT_SECOND,
+    "axes.edgecolor":    GRID_COLOR,
+}
+
+
+def _abs(path):
+    p = Path(path)
+    return p if p.is_absolute() else PROJECT_ROOT / p
+
+
+# --- Manifiesto ----------------------------------------------------------------
+def _player_spec(p):
+    # 408449 | {"id": 408449, "label": "Nico"}
+    if isinstance(p, dict):
+        return {"id": int(p["id"]), "label": p.get("label")}
+    return {"id": int(p), "label": None}
+
+
+def _similar_players(c):
+    # {"similar_to": id, "k": 2, ...} -> [id, parecido 1, ...] (utils.similares)
+    from .similares import build_similarity_index
+
+    spec = dict(c["players"])
+    target = int(spec.pop("similar_to"))
+    k = int(spec.pop("k", 2))
+    idx = build_similarity_index(_abs(c["data_dir"]))
+    return idx.player_list(target, k, **spec)
+
+
+def load_manifest(path):
+    """
+    Lee el manifiesto y devuelve la lista de comparativas ya expandida
+    (una por jornada) y con los valores por defecto aplicados.
+    """
+    from .indice_partidos import _jornada_num
+
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+    defaults = {**DEFAULTS, **raw.get("defaults", {})}
+
+    specs = []
+    for comp in raw.get("comparisons", []):
+        c = {**defaults, **comp}
+        if isinstance(c.get("players"), dict):
+            c["players"] = _similar_players(c)
+        c["players"] = [_player_spec(p) for p in c.get("players", [])]
+        if not c["players"]:
+            raise ValueError(f"Comparativa sin jugadores: {comp}")
+
+        jornadas = c.get("jornada")
+        if jornadas == "*":
+            jornadas = [_jornada_num(d) for d in sorted(_abs(c["data_dir"]).glob("jornada_*"))
+                        if d.is_dir()]
+            jornadas = sorted(j for j in jornadas if j >= 0)
+        elif not isinstance(jornadas, list):
+            jornadas = [jornadas]
+
+        for j in jornadas:
+            s = dict(c, jornada=j)
+            grupo = s.get("grupo", "comparativa")
+            s.setdefault("name", f"Comparativa_{grupo}_j{j}")
+            if len(jornadas) > 1 and "name" in comp:
+                s["name"] = f"{comp['name']}_j{j}"
+            s.setdefault("title", f"Comparativa · {grupo.capitalize()}")
+            s.setdefault("subtitle", f"(Jornada {j}ª)" if j is not None else "")
+            sub = f"jornada_{j}" if j is not None else ""
+            s["out_path"] = str(_abs(s["out_dir"]) / sub / f"{s['name']}.png")
+            specs.append(s)
+    return specs
+
+
+# --- Estado por proceso (cachés del worker) ------------------------------------
+_WORKER = {}
+
+
+def _init_worker(use_store=False, backend="Agg", trace=False, child=True):
+    """
+    Inicializador de cada proceso: backend Agg y cachés vacías.
+    En el proceso principal se llama con backend=None (no toca el backend,
+    p. ej. si se usa desde un notebook) y child=False. trace activa utils.trazas.
+    """
+    if child:
+        # Con fork el worker hereda el buffer de spans del padre: se vacía
+        trazas.clear()
+    if backend is not None:
+        import matplotlib
+        matplotlib.use(backend)
+    if trace:
+        trazas.enable()
+    _WORKER.clear()
+    _WORKER["use_store"] = use_store
+    _WORKER["child"] = child
+
+
+def _worker_index(data_dir, jornada):
+    # Índice (en memoria) de los partidos de una jornada; uno por jornada y proceso
+    from .indice_partidos import discover_match_files, index_for_files
+
+    key = ("index", str(data_dir), jornada)
+    if key not in _WORKER:
+        pairs = discover_match_files(data_dir)
+        if jornada is not None:
+            pairs = [(p, e) for p, e in pairs if Path(p).parent.name == f"jornada_{jornada}"]
+        if not pairs:
+            raise FileNotFoundError(f"No hay partidos de la jornada {jornada} en {data_dir}")
+        P, E = zip(*pairs)
+        _WORKER[key] = index_for_files(list(P), list(E))
+    return _WORKER[key]
+
+
+def _worker_store(data_dir):
+    if not _WORKER.get("use_store"):
+        return None
+    from .almacen_eventos import open_store
+
+    key = ("store", str(data_dir))
+    if key not in _WORKER:
+        _WORKER[key] = open_store(data_dir)
+    return _WORKER[key]
+
+
+def _player_card(pid, masters_dir):
+    """Nombre, equipo, posición, imágenes y color del jugador (desde masters)."""
+    from .masters import get_registry
+
+    reg = get_registry(masters_dir)
+    card = {"nombre": str(pid), "club": None, "pos": None,
+            "foto": None, "logo": None, "color": ACCENT_CYAN}
+    r = reg.player(pid)
+    if r is None:
+        return card
+
+    def _s(v):
+        return v if isinstance(v, str) and v.strip() else None
+
+    card.update(nombre=_s(r.get("name")) or str(pid), club=_s(r.get("team")),
+                pos=_s(r.get("position")), foto=_s(r.get("foto_local")),
+                logo=_s(r.get("logo_local")))
+    t = reg.team(r.get("teamId"))
+    if t is not None:
+        card["color"] = reg.team_color(r.get("teamId"), default=ACCENT_CYAN)
+        card["logo"] = card["logo"] or _s(t.get("logo_local"))
+    return card
+
+
+# --- Figura --------------------------------------------------------------------
+def _place_image(ax, path, *, height_px, dpi=None, pad_px=2):
+    # Imagen centrada con altura fija (mismo criterio que _place_img_uniform),
+    # ya recortada y a su tamaño final desde la caché de utils.imagenes
+    from matplotlib.offsetbox import AnnotationBbox, OffsetImage
+
+    from .imagenes import image_array
+    from .visualizaciones_ext import tidy_axes
+    tidy_axes(ax, with_frame=False)
+    if not path or not _abs(path).exists():
+        return
+    arr = image_array(_abs(path), height_px, dpi=dpi, pad_px=pad_px)
+    oi = OffsetImage(arr, zoom=height_px / arr.shape[0])
+    ax.add_artist(AnnotationBbox(oi, (0.5, 0.5), frameon=False,
+                                 boxcoords="axes fraction", box_alignment=(0.5, 0.5)))
+
+
+def build_comparison_figure(spec):
+    """
+    Figura de una comparativa: por jugador una fila con tarjeta (nombre,
+    club · posición, foto y escudo), red de pases y acciones en campo rival.
+    """
+    import matplotlib.pyplot as plt
+
+    from . import visualizaciones_ext as vis
+
+    data_dir = _abs(spec["data_dir"])
+    masters_dir = _abs(spec["masters_dir"])
+    index = _worker_index(data_dir, spec["jornada"])
+    store = _worker_store(data_dir)
+    master_teams = masters_dir / "master_equipos.csv"
+
+    n = len(spec["players"])
+    fig = plt.figure(figsize=tuple(spec["figsize"]))
+    gs = fig.add_gridspec(n, 3, width_ratios=[1.00, 2.35, 2.35], wspace=0.008, hspace=0.08)
+
+    ax_red, ax_acc = [], []
+    for r, p in enumerate(spec["players"]):
+        card = _player_card(p["id"], masters_dir)
+
+        # Columna 0: tarjeta
+        g0 = gs[r, 0].subgridspec(3, 1, height_ratios=[0.20, 0.42, 0.38], hspace=0.04)
+        ax_name = fig.add_subplot(g0[0, 0])
+        linea2 = " · ".join(x for x in (card["club"], card["pos"]) if x)
+        ax_name.text(0.50, 0.90, card["nombre"], va="top", ha="center",
+                     fontsize=14, fontweight="bold", color=card["color"])
+        if linea2:
+            ax_name.text(0.50, 0.58, linea2, va="top", ha="center",
+                         fontsize=10, fontweight="semibold", color=TEXT_SECOND)
+        vis.tidy_axes(ax_name, with_frame=False)
+        gi = g0[1, 0].subgridspec(1, 2, width_ratios=[0.80, 0.20], wspace=0.006)
+        _place_image(fig.add_subplot(gi[0, 0]), card["foto"], height_px=90,
+                     dpi=spec["dpi"], pad_px=0)
+        _place_image(fig.add_subplot(gi[0, 1]), card["logo"], height_px=40, dpi=spec["dpi"])
+        vis.tidy_axes(fig.add_subplot(g0[2, 0]), with_frame=False)
+
+        # Columna 1: red de pases
+        ax = fig.add_subplot(gs[r, 1])
+        vis.draw_pitch_panel(ax, title=spec.get("title_red", "Conexiones") if r == 0 else None,
+                             pitch_color=PITCH_BG, line_color=PITCH_LINES, title_color=ACCENT_CYAN,
+                             raster=spec.get("raster_pitch", True))
+        vis.plot_pass_network_for_player_auto(
+            ax, p["id"], master_teams_path=master_teams, team_color=card["color"],
+            index=index, store=store, show_all=True,
+            highlight_label=p["label"], highlight_text_color=TEXT_SECOND,
+        )
+        ax_red.append(ax)
+
+        # Columna 2: acciones en campo rival
+        ax = fig.add_subplot(gs[r, 2])
+        vis.draw_pitch_panel(ax, title=spec.get("title_acciones", "Eventos campo rival") if r == 0 else None,
+                             pitch_color=PITCH_BG, line_color=PITCH_LINES, title_color=ACCENT_CYAN,
+                             raster=spec.get("raster_pitch", True))
+        vis.plot_winger_actions_for_player_auto(ax, p["id"], index=index, store=store,
+                                                show_legend=True)
+        ax_acc.append(ax)
+
+    fig.subplots_adjust(top=0.875, left=0.07, right=0.98)
+    fig.suptitle(spec["title"], fontsize=27, fontweight="bold", color=TITLE_COLOR, y=0.975)
+    if spec.get("subtitle"):
+        fig.text(0.5, 0.94, spec["subtitle"], ha="center", va="top",
+                 fontsize=15, fontweight="semibold", color=TITLE_COLOR)
+
+    # Compactar columnas 1 y 2 (como en el notebook, sin un draw completo)
+    GAP = 0.002
+    for axA, axB in zip(ax_red, ax_acc):
+        axA.apply_aspect(); axB.apply_aspect()
+        xa, ya, wa, ha = axA.get_position().bounds
+        xb, yb, wb, hb = axB.get_position().bounds
+        new_w = (xb + wb - xa - GAP) / 2.0
+        axA.set_position([xa, ya, new_w, ha])
+        axB.set_position([xa + new_w + GAP, yb, new_w, hb])
+
+    for i, logo in enumerate(spec.get("logos", [])):
+        _place_image(fig.add_axes([0.082 + 0.07*i, 0.905, 0.055, 0.065]), logo, height_px=56,
+                     dpi=spec["dpi"])
+    return fig
+
+
+def render_comparison(spec):
+    """Renderiza y guarda una comparativa. Devuelve el resultado para el resumen."""
+    import matplotlib.pyplot as plt
+
+    t0 = time.perf_counter()
+    res = {"name": spec["name"], "jornada": spec["jornada"], "out": spec["out_path"],
+           "ok": False, "error": None, "seconds": 0.0, "pid": os.getpid()}
+    fig = None
+    try:
+        with trazas.span("dashboard.render", name=spec["name"]), plt.rc_context(RC_PARAMS):
+            with trazas.span("dashboard.figura") as s:
+                fig = build_comparison_figure(spec)
+                if trazas.enabled():
+                    s.set(artists=len(fig.findobj()))
+            out = Path(spec["out_path"])
+            out.parent.mkdir(parents=True, exist_ok=True)
+            tmp = out.with_name(out.stem + ".tmp.png")
+            with trazas.span("dashboard.savefig", dpi=spec["dpi"]):
+                fig.savefig(tmp, dpi=spec["dpi"], facecolor=fig.get_facecolor(),
+                            bbox_inches="tight", pad_inches=0.2)
+        os.replace(tmp, out)
+        res["ok"] = True
+    except Exception as exc:
+        res["error"] = f"{type(exc).__name__}: {exc}"
+    finally:
+        if fig is not None:
+            plt.close(fig)
+        res["seconds"] = time.perf_counter() - t0
+        if _WORKER.get("child") and trazas.enabled():
+            # Los spans del worker viajan con el resultado hasta el proceso principal
+            res["spans"] = trazas.drain()
+    return res
+
+
+# --- Render incremental (hash de entradas) -------------------------------------
+BUILD_MANIFEST = "_build.json"
+BUILD_VERSION = 2   # 2: builds por ruta de salida (antes por nombre)
+
+# Código que determina el aspecto de la figura: todos los utils/*.py (una lista
+# a mano se queda corta en cuanto la figura pasa a depender de otro módulo)
+RENDER_CODE_DIR = Path(__file__).resolve().parent
+
+# Claves de la comparativa que no afectan al PNG
+_NON_RENDER_KEYS = {"out_dir", "out_path", "data_dir", "masters_dir"}
+
+
+def _file_hash(path, memo):
+    """
+    Hash (blake2b) del contenido de path. memo guarda {ruta: [mtime_ns, size, hash]}
+    del build anterior: si mtime y tamaño no cambian no se vuelve a leer.
+    """
+    key = str(path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return "ausente"
+    prev = memo.get(key)
+    if prev is not None and prev[0] == st.st_mtime_ns and prev[1] == st.st_size:
+        return prev[2]
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    memo[key] = [st.st_mtime_ns, st.st_size, h.hexdigest()]
+    return memo[key][2]
+
+
+def spec_inputs(spec):
+    """
+    Ficheros de los que depende la figura: CSV de los partidos de sus
+    jugadores, masters, imágenes (fotos, escudos, logos) y el código de dibujo.
+    Devuelve {etiqueta: ruta}.
+    """
+    data_dir = _abs(spec["data_dir"])
+    masters_dir = _abs(spec["masters_dir"])
+    inputs = {
+        "master:jugadores": masters_dir / "master_jugadores.csv",
+        "master:equipos":   masters_dir / "master_equipos.csv",
+    }
+    try:
+        index = _worker_index(data_dir, spec["jornada"])
+    except FileNotFoundError:
+        index = None
+    for p in spec["players"]:
+        entry = index.first(p["id"]) if index is not None else None
+        if entry is not None:
+            inputs[f"eventos:{entry['match']}"] = Path(entry["events_file"])
+            inputs[f"jugadores:{entry['match']}"] = Path(entry["players_file"])
+        card = _player_card(p["id"], masters_dir)
+        for kind in ("foto", "logo"):
+            if card[kind]:
+                inputs[f"img:{card[kind]}"] = _abs(card[kind])
+    for logo in spec.get("logos", []):
+        inputs[f"img:{logo}"] = _abs(logo)
+    for mod in sorted(RENDER_CODE_DIR.glob("*.py")):
+        inputs[f"codigo:{mod.name}"] = mod
+    return inputs
+
+
+def _render_params(spec):
+    params = {k: v for k, v in spec.items() if k not in _NON_RENDER_KEYS}
+    # La lista de partidos de la jornada también cuenta (un partido nuevo puede
+    # cambiar en cuál aparece el jugador)
+    try:
+        index = _worker_index(_abs(spec["data_dir"]), spec["jornada"])
+        params["partidos"] = sorted(info["match"] for info in index._files.values())
+    except FileNotFoundError:
+        params["partidos"] = []
+    return params
+
+
+def load_build_manifest(out_dir):
+    path = _abs(out_dir) / BUILD_MANIFEST
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+    except (OSError, ValueError):
+        return {"version": BUILD_VERSION, "files": {}, "builds": {}}
+    if raw.get("version") != BUILD_VERSION:
+        return {"version": BUILD_VERSION, "files": {}, "builds": {}}
+    return raw
+
+
+def save_build_manifest(out_dir, manifest):
+    path = _abs(out_dir) / BUILD_MANIFEST
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)
+
+
+def build_key(spec):
+    """Clave de la comparativa en el manifiesto de build: su PNG relativo a out_dir."""
+    out = Path(spec["out_path"])
+    try:
+        return out.relative_to(_abs(spec["out_dir"])).as_posix()
+    except ValueError:
+        return out.as_posix()
+
+
+def plan_builds(specs, manifests, *, force=False):
+    """
+    Decide qué comparativas hay que renderizar. Añade a cada spec "_hash",
+    "_inputs" y "_reason" y devuelve (a_renderizar, sin_cambios).
+    manifests: {out_dir: manifiesto de build}. Dos comparativas con la
+    misma salida son un error (se pisarían el PNG y el registro).
+    """
+    seen = {}
+    for s in specs:
+        out = str(Path(s["out_path"]).resolve())
+        if out in seen:
+            raise ValueError(f"Comparativas con la misma salida: {seen[out]!r} y {s['name']!r} ({out})")
+        seen[out] = s["name"]
+
+    todo, skip = [], []
+    for s in specs:
+        m = manifests[s["out_dir"]]
+        inputs = {k: _file_hash(v, m["files"]) for k, v in spec_inputs(s).items()}
+        params = json.dumps(_render_params(s), sort_keys=True, ensure_ascii=False, default=str)
+        h = hashlib.blake2b(digest_size=16)
+        h.update(params.encode("utf-8"))
+        for k in sorted(inputs):
+            h.update(f"{k}={inputs[k]}".encode("utf-8"))
+        s["_hash"], s["_inputs"], s["_params"] = h.hexdigest(), inputs, params
+
+        prev = m["builds"].get(build_key(s))
+        if force:
+            reason = "forzado"
+        elif prev is None:
+            reason = "nuevo"
+        elif not Path(s["out_path"]).exists():
+            reason = "salida ausente"
+        elif prev["hash"] == s["_hash"]:
+            skip.append(s)
+            continue
+        else:
+            changed = sorted(k for k in set(inputs) | set(prev.get("inputs", {}))
+                             if inputs.get(k) != prev.get("inputs", {}).get(k))
+            if prev.get("params") != params:
+                changed.insert(0, "parámetros")
+            reason = "cambios: " + ", ".join(changed) if changed else "cambios"
+        s["_reason"] = reason
+        todo.append(s)
+    return todo, skip
+
+
+# --- Lote ----------------------------------------------------------------------
+def render_batch(specs, *, workers=None, use_store=False, force=False, trace=None):
+    """
+    Renderiza las comparativas cuyas entradas han cambiado desde el último
+    build (todas con force=True). workers=1 lo hace en este proceso (útil
+    para depurar). Con trace (ruta) se guarda la traza de todos los procesos
+    (ver utils.trazas). Devuelve el resumen (ver summarize).
+    """
+    workers = workers or os.cpu_count() or 1
+    # Mismas jornadas juntas: cada worker aprovecha mejor su caché
+    specs = sorted(specs, key=lambda s: (str(s["jornada"]), s["name"]))
+
+    t0 = time.perf_counter()
+    tracing = bool(trace) or trazas.enabled()
+    _init_worker(use_store, backend=None, trace=tracing, child=False)
+    manifests = {d: load_build_manifest(d) for d in {s["out_dir"] for s in specs}}
+    with trazas.span("dashboard.plan", rows=len(specs)):
+        todo, skipped = plan_builds(specs, manifests, force=force)
+
+    if use_store and todo:
+        from .almacen_eventos import ingest_matches
+        for data_dir in {str(_abs(s["data_dir"])) for s in todo}:
+            ingest_matches(data_dir)
+
+    results = []
+    if workers == 1 or len(todo) <= 1:
+        results = [render_comparison(s) for s in todo]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(todo)),
+                                 initializer=_init_worker,
+                                 initargs=(use_store, "Agg", tracing)) as ex:
+            futs = [ex.submit(render_comparison, s) for s in todo]
+            for f in as_completed(futs):
+                results.append(f.result())
+
+    for r in results:
+        trazas.add_spans(r.pop("spans", []))
+
+    # Registra lo construido (solo lo que ha salido bien)
+    by_out = {s["out_path"]: s for s in todo}
+    for r in results:
+        s = by_out[r["out"]]
+        r["reason"] = s["_reason"]
+        if r["ok"]:
+            manifests[s["out_dir"]]["builds"][build_key(s)] = {
+                "name":     s["name"],
+                "out":      s["out_path"],
+                "hash":     s["_hash"],
+                "inputs":   s["_inputs"],
+                "params":   s["_params"],
+                "reason":   s["_reason"],
+                "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "seconds":  round(r["seconds"], 3),
+            }
+    for d, m in manifests.items():
+        save_build_manifest(d, m)
+
+    summary = summarize(results, time.perf_counter() - t0, workers)
+    summary["skipped"] = len(skipped)
+    summary["skipped_names"] = sorted(s["name"] for s in skipped)
+    if trace:
+        summary["trace"] = str(trazas.export(trace))
+    return summary
+
+
+def summarize(results, wall, workers):
+    ok = [r for r in results if r["ok"]]
+    failed = [r for r in results if not r["ok"]]
+    busy = sum(r["seconds"] for r in results)
+    return {
+        "skipped":     0,
+        "total":       len(results),
+        "ok":          len(ok),
+        "failed":      len(failed),
+        "workers":     workers,
+        "wall_s":      round(wall, 3),
+        "figs_per_s":  round(len(ok) / wall, 3) if wall > 0 else None,
+        "mean_fig_s":  round(busy / len(results), 3) if results else None,
+        "max_fig_s":   round(max((r["seconds"] for r in results), default=0.0), 3),
+        "failures":    [{"name": r["name"], "error": r["error"]} for r in failed],
+        "results":     sorted(results, key=lambda r: r["name"]),
+    }
+
+
+def print_summary(summary, file=sys.stdout):
+    s = summary
+    print(f"Dashboards: {s['ok']}/{s['total']} OK · {s['failed']} fallidos · "
+          f"{s['skipped']} sin cambios · {s['workers']} procesos", file=file)
+    print(f"Tiempo: {s['wall_s']:.2f} s · {s['figs_per_s'] or 0:.2f} fig/s · "
+          f"media {s['mean_fig_s'] or 0:.2f} s/fig · máx {s['max_fig_s']:.2f} s", file=file)
+    for r in s["results"]:
+        if r["ok"]:
+            print(f"  ✓ {r['name']} ({r.get('reason', '')})", file=file)
+    for f in s["failures"]:
+        print(f"  ✗ {f['name']}: {f['error']}", file=file)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Render en lote de dashboards comparativos.")
+    ap.add_argument("manifest", help="JSON con las comparativas")
+    ap.add_argument("--workers", type=int, default=None, help="procesos (por defecto, núcleos)")
+    ap.add_argument("--dpi", type=int, default=None, help="sobrescribe el dpi del manifiesto")
+    ap.add_argument("--store", action="store_true", help="leer del almacén Parquet (pyarrow)")
+    ap.add_argument("--only", nargs="*", default=None, help="solo estas comparativas (name)")
+    ap.add_argument("--summary", default=None, help="guardar el resumen en JSON")
+    ap.add_argument("--force", action="store_true", help="renderizar aunque no haya cambios")
+    ap.add_argument("--trace", default=None,
+                    help="guardar traza por etapas (Chrome trace; .spans.json para lista + resumen)")
+    args = ap.parse_args(argv)
+
+    specs = load_manifest(args.manifest)
+    if args.only:
+        specs = [s for s in specs if s["name"] in set(args.only)]
+    if args.dpi:
+        for s in specs:
+            s["dpi"] = args.dpi
+
+    summary = render_batch(specs, workers=args.workers, use_store=args.store, force=args.force,
+                           trace=args.trace)
+    print_summary(summary)
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
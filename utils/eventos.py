@@ -0,0 +1,361 @@
+# utils/eventos.py
+"""
+Normalización única de eventos WhoScored (lg_eventos).
+
+normalize_events(df) -> EventsFrame con columnas canónicas, ids enteros,
+coordenadas numéricas, 'type' normalizado y 'type_id' (typeId Opta, para
+filtrar por tipo comparando enteros). Los flags (isGoal, isShot,
+isTouch y todos los qualifiers qNone_* que son de presencia) se decodifican
+una sola vez a un bitset empaquetado (FlagMatrix): los filtros de asistencias,
+pases clave, centros... son operaciones de bits sobre esa matriz.
+Se hace una vez por partido (memo por match_id) y la usan tanto la red de
+pases como el mapa de acciones y las métricas.
+"""
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .opta import norm_name, type_id_lut
+from .trazas import span
+
+# Columnas de origen aceptadas para cada columna canónica (primera que exista)
+SOURCE_COLUMNS = {
+    "type":   ["type", "type_display_name"],
+    "outc":   ["outcomeType", "outcome_type_display_name"],
+    "pid":    ["playerId", "player_id"],
+    "tid":    ["teamId", "team_id"],
+    "rel":    ["relatedPlayerId", "related_player_id"],
+    "eid":    ["id"],
+    "x":      ["x", "startX", "start_x"],
+    "y":      ["y", "startY", "start_y"],
+    "endX":   ["endX", "end_x"],
+    "endY":   ["endY", "end_y"],
+    "minute": ["expandedMinute", "minute"],
+    "second": ["second"],
+    "gmy":    ["goalMouthY", "qNone_GoalMouthY"],
+    "gmz":    ["goalMouthZ", "qNone_GoalMouthZ"],
+}
+
+# Flags conocidos (siempre en los primeros bits y en este orden)
+FLAG_COLUMNS = [
+    "isGoal", "isShot", "isTouch",
+    "qNone_Cross", "qNone_BlockedCross",
+    "qNone_KeyPass", "qNone_ShotAssist",
+    "qNone_Assisted", "qNone_IntentionalAssist", "qNone_IntentionalGoalAssist",
+    "qNone_BigChance", "qNone_BigChanceCreated",
+]
+
+# Qualifiers qNone_* que llevan un valor (coordenada, ángulo, id, texto) y no
+# son flags; cualquier otro qNone_* se trata como flag de presencia
+VALUE_QUALIFIERS = {
+    "qNone_Angle", "qNone_Length", "qNone_Zone",
+    "qNone_PassEndX", "qNone_PassEndY", "qNone_BlockedX", "qNone_BlockedY",
+    "qNone_GoalMouthY", "qNone_GoalMouthZ",
+    "qNone_RelatedEventId", "qNone_OppositeRelatedEvent",
+    "qNone_PlayerCaughtOffside", "qNone_CaptainPlayerId", "qNone_InvolvedPlayers",
+    "qNone_PlayerPosition", "qNone_JerseyNumber", "qNone_FormationSlot",
+    "qNone_TeamFormation", "qNone_TeamPlayerFormation",
+}
+
+# Texto que cuenta como verdadero (además de cualquier número >= 1)
+TRUTHY_STRINGS = {"1", "true", "t", "yes", "y", "si", "sí"}
+
+# Columnas crudas que hacen falta para construir un EventsFrame completo
+EVENTS_FRAME_COLUMNS = list(dict.fromkeys(
+    [c for opts in SOURCE_COLUMNS.values() for c in opts] + FLAG_COLUMNS
+))
+
+
+def flag_columns(columns):
+    """Columnas de df que son flags: FLAG_COLUMNS presentes + resto de qNone_* de presencia."""
+    cols = set(columns)
+    known = [c for c in FLAG_COLUMNS if c in cols]
+    extra = sorted(c for c in cols
+                   if c.startswith("qNone_") and c not in VALUE_QUALIFIERS and c not in FLAG_COLUMNS)
+    return known + extra
+
+
+def decode_flag(s):
+    """
+    Serie cruda -> ndarray bool, en bloque. Verdadero si es número >= 1
+    (mismo criterio que el antiguo truthy: int(x) > 0) o texto de TRUTHY_STRINGS.
+    """
+    if s.dtype == bool:
+        return s.to_numpy()
+    if isinstance(s.dtype, pd.BooleanDtype):    # almacén Parquet (boolean con NA)
+        return s.fillna(False).to_numpy(dtype=bool)
+    if pd.api.types.is_numeric_dtype(s):
+        return np.trunc(s.to_numpy(dtype=float, na_value=np.nan)) > 0
+    num = pd.to_numeric(s, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    out = np.trunc(num) > 0
+    txt = np.isnan(num) & s.notna().to_numpy()
+    if txt.any():
+        out[txt] = s[txt].astype(str).str.strip().str.lower().isin(TRUTHY_STRINGS).to_numpy()
+    return out
+
+
+if hasattr(np, "bitwise_count"):
+    def _popcount(a):
+        return np.bitwise_count(a)
+else:  # NumPy < 2.0
+    _POP8 = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+
+    def _popcount(a):
+        return _POP8[a]
+
+
+class FlagMatrix:
+    """
+    Flags de n eventos empaquetados en bits: bits es uint8 (n, ceil(k/8)),
+    un bit por flag (orden de names). Un flag que no está en names vale False.
+
+        f.any("qNone_KeyPass", "qNone_ShotAssist")   # OR  -> bool (n,)
+        f.all("qNone_Cross", "qNone_BlockedCross")   # AND -> bool (n,)
+        f.count("qNone_Cross", "qNone_BlockedCross") # nº de flags activos por fila
+    """
+    __slots__ = ("bits", "names", "_pos")
+
+    def __init__(self, bits, names):
+        self.bits = bits
+        self.names = tuple(names)
+        self._pos = {n: i for i, n in enumerate(self.names)}
+
+    def __len__(self):
+        return len(self.bits)
+
+    def __contains__(self, name):
+        return name in self._pos
+
+    def __repr__(self):
+        return f"FlagMatrix(rows={len(self)}, flags={len(self.names)}, bytes={self.bits.nbytes})"
+
+    def __getitem__(self, rows):
+        # filas (máscara booleana o índices posicionales)
+        return FlagMatrix(self.bits[rows], self.names)
+
+    def _query(self, names):
+        q = np.zeros(self.bits.shape[1], dtype=np.uint8)
+        for n in names:
+            i = self._pos.get(n)
+            if i is not None:
+                q[i >> 3] |= np.uint8(1 << (i & 7))
+        return q
+
+    def any(self, *names):
+        q = self._query(names)
+        nz = np.flatnonzero(q)
+        if len(nz) == 0:
+            return np.zeros(len(self), dtype=bool)
+        if len(nz) == 1:    # todos en el mismo byte: una sola columna
+            return (self.bits[:, nz[0]] & q[nz[0]]) != 0
+        return (self.bits[:, nz] & q[nz]).any(axis=1)
+
+    def all(self, *names):
+        if any(n not in self._pos for n in names):
+            return np.zeros(len(self), dtype=bool)
+        q = self._query(names)
+        nz = np.flatnonzero(q)
+        return ((self.bits[:, nz] & q[nz]) == q[nz]).all(axis=1)
+
+    def count(self, *names):
+        q = self._query(names)
+        nz = np.flatnonzero(q)
+        if len(nz) == 0:
+            return np.zeros(len(self), dtype=np.int64)
+        return _popcount(self.bits[:, nz] & q[nz]).sum(axis=1, dtype=np.int64)
+
+    def column(self, name):
+        return self.any(name)
+
+    def to_frame(self, index=None):
+        """DataFrame bool (una columna por flag), p. ej. para inspeccionar."""
+        dense = np.unpackbits(self.bits, axis=1, count=len(self.names), bitorder="little")
+        return pd.DataFrame(dense.astype(bool), columns=list(self.names), index=index)
+
+    @classmethod
+    def empty(cls, n, names=()):
+        return cls(np.zeros((n, (len(names) + 7) // 8), dtype=np.uint8), names)
+
+    @classmethod
+    def concat(cls, mats):
+        """Une matrices (p. ej. de varios partidos) alineando los nombres."""
+        mats = list(mats)
+        names = list(dict.fromkeys(n for m in mats for n in m.names))
+        if all(m.names == tuple(names) for m in mats):
+            return cls(np.concatenate([m.bits for m in mats]), names)
+        return encode_flags(pd.concat([m.to_frame().reindex(columns=names, fill_value=False)
+                                       for m in mats], ignore_index=True))
+
+
+def encode_flags(dense):
+    """DataFrame de booleanos (columnas = flags) -> FlagMatrix."""
+    arr = dense.to_numpy(dtype=bool) if len(dense.columns) else np.zeros((len(dense), 0), bool)
+    bits = np.packbits(arr, axis=1, bitorder="little") if arr.shape[1] else \
+        np.zeros((len(dense), 0), dtype=np.uint8)
+    return FlagMatrix(bits, list(dense.columns))
+
+
+def decode_flags(df_events):
+    """Decodifica todos los flags de un lg_eventos crudo a un FlagMatrix (una pasada)."""
+    names = flag_columns(df_events.columns)
+    n = len(df_events)
+    if not names:
+        return FlagMatrix.empty(n)
+    dense = np.empty((n, len(names)), dtype=bool)
+    for j, c in enumerate(names):
+        dense[:, j] = decode_flag(df_events[c])
+    return FlagMatrix(np.packbits(dense, axis=1, bitorder="little"), names)
+
+
+class EventsFrame:
+    """
+    Eventos normalizados de un partido. df tiene siempre:
+      type (texto original), type_norm (minúsculas sin espacios/_/-),
+      type_id (typeId Opta, int16; 0 si no tiene, ver utils.opta),
+      outc (minúsculas), pid/tid/rel/eid (Int64), x/y/endX/endY/gmy/gmz,
+      minute/second/t (segundos).
+    flags es el FlagMatrix de las mismas filas (en el mismo orden que df).
+    """
+    __slots__ = ("df", "match_id", "flags")
+
+    def __init__(self, df, match_id=None, flags=None):
+        self.df = df
+        self.match_id = match_id
+        self.flags = flags if flags is not None else FlagMatrix.empty(len(df))
+
+    def __len__(self):
+        return len(self.df)
+
+    def __repr__(self):
+        return f"EventsFrame(match_id={self.match_id!r}, rows={len(self.df)})"
+
+    def flag(self, name):
+        """Serie booleana del flag (False si el feed no lo trae)."""
+        return pd.Series(self.flags.column(name), index=self.df.index, name=name)
+
+    def take(self, mask):
+        """EventsFrame con las filas de mask (bool, mismo orden que df)."""
+        mask = np.asarray(mask, dtype=bool)
+        return EventsFrame(self.df[mask], self.match_id, self.flags[mask])
+
+
+def concat_events(frames):
+    """Une varios EventsFrame (p. ej. una temporada) en uno solo."""
+    frames = list(frames)
+    if not frames:
+        return EventsFrame(pd.DataFrame())
+    return EventsFrame(pd.concat([f.df for f in frames], ignore_index=True),
+                       match_id=tuple(f.match_id for f in frames),
+                       flags=FlagMatrix.concat(f.flags for f in frames))
+
+
+def _pick(df, opts):
+    for c in opts:
+        if c in df.columns:
+            return c
+    return None
+
+
+def _to_num(s):
+    return pd.to_numeric(s, errors="coerce")
+
+
+def norm_type(s):
+    # pasa a str, baja a minúsculas y quita espacios/guiones/underscores
+    return s.astype(str).str.lower().str.replace(r"[\s_\-]+", "", regex=True)
+
+
+def _by_category(raw):
+    # (nombres de las categorías + "nan" al final, códigos por fila): el código -1
+    # de NaN indexa el último elemento, así que lut[codes] sirve para cualquier lut
+    cat = pd.Categorical(raw)
+    names = [str(c) for c in cat.categories] + ["nan"]
+    return names, cat.codes
+
+
+def _build(df_events):
+    n = len(df_events)
+    idx = df_events.index
+    col = {k: _pick(df_events, opts) for k, opts in SOURCE_COLUMNS.items()}
+
+    def num(k, default=np.nan):
+        if col[k] is None:
+            return pd.Series(default, index=idx, dtype=float)
+        return _to_num(df_events[col[k]])
+
+    def ids(k):
+        if col[k] is None:
+            return pd.Series(pd.NA, index=idx, dtype="Int64")
+        return _to_num(df_events[col[k]]).astype("Int64")
+
+    raw_type = df_events[col["type"]] if col["type"] else pd.Series(np.nan, index=idx)
+    raw_outc = df_events[col["outc"]] if col["outc"] else pd.Series(np.nan, index=idx)
+
+    # type/outcome se normalizan por categoría, no por fila
+    type_names, type_codes = _by_category(raw_type)
+    outc_names, outc_codes = _by_category(raw_outc)
+    type_norm = np.array([norm_name(t) for t in type_names], dtype=object)
+    outc_low = np.array([o.lower() for o in outc_names], dtype=object)
+
+    d = pd.DataFrame({
+        "type":      raw_type,
+        "type_norm": type_norm[type_codes],
+        "type_id":   type_id_lut(type_names)[type_codes],
+        "outc":      outc_low[outc_codes],
+        "pid":       ids("pid"),
+        "tid":       ids("tid"),
+        "rel":       ids("rel"),
+        "eid":       ids("eid"),
+        "x":         num("x"),
+        "y":         num("y"),
+        "endX":      num("endX"),
+        "endY":      num("endY"),
+        "minute":    num("minute", 0),
+        "second":    num("second", 0),
+        "gmy":       num("gmy"),
+        "gmz":       num("gmz"),
+    }, index=idx)
+
+    # tiempo en segundos (para la heurística de receptores)
+    d["t"] = d["minute"].fillna(0)*60 + d["second"].fillna(0)
+    return d
+
+
+# --- Memo por partido -----------------------------------------------------------
+EVENTS_CACHE_SIZE = 16
+_EVENTS_CACHE = OrderedDict()
+
+
+def normalize_events(df_events, *, match_id=None):
+    """
+    Devuelve el EventsFrame de df_events. Si df_events ya es un EventsFrame
+    se devuelve tal cual. Con match_id (cualquier clave hashable que
+    identifique el partido y su versión) el resultado se memoiza y la
+    siguiente llamada con el mismo match_id no recalcula nada.
+    """
+    if isinstance(df_events, EventsFrame):
+        return df_events
+    if match_id is not None:
+        hit = _EVENTS_CACHE.get(match_id)
+        if hit is not None:
+            _EVENTS_CACHE.move_to_end(match_id)
+            return hit
+
+    with span("eventos.normalize", rows=len(df_events)):
+        ev = EventsFrame(_build(df_events), match_id=match_id, flags=decode_flags(df_events))
+
+    if match_id is not None:
+        _EVENTS_CACHE[match_id] = ev
+        while len(_EVENTS_CACHE) > EVENTS_CACHE_SIZE:
+            _EVENTS_CACHE.popitem(last=False)
+    return ev
+
+
+def get_cached_events(match_id):
+    """EventsFrame memoizado para match_id (o None)."""
+    return _EVENTS_CACHE.get(match_id)
+
+
+def clear_events_cache():
+    _EVENTS_CACHE.clear()
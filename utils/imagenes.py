@@ -0,0 +1,161 @@
+# utils/imagenes.py
+"""
+Caché de imágenes de las tarjetas (fotos de jugadores, escudos y banderas).
+
+Cada imagen se prepara una sola vez como en _place_img_uniform del notebook
+(RGBA, márgenes transparentes recortados, padding transparente) y además se
+reescala a la altura en píxeles a la que se va a dibujar. El resultado se
+guarda en dos niveles:
+
+- memoria: LRU por (ruta, mtime, tamaño, altura, padding);
+- disco: images/_cache/<hash del contenido>-<bytes>-h<alto>-p<pad>-v<n>.npy, que
+  comparten todos los procesos (p. ej. los workers de utils.dashboard_batch)
+  y sobrevive entre sesiones.
+
+    arr = image_array("images/logos/fcb.png", 40, dpi=150, pad_px=2)
+    OffsetImage(arr, zoom=40 / arr.shape[0])      # como antes, ya sin reescalar
+
+    python -m utils.imagenes --dpi 150            # precalienta images/players, logos y flags
+"""
+from functools import lru_cache
+from pathlib import Path
+import hashlib
+import os
+import sys
+import time
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+IMAGES_DIR = PROJECT_ROOT / "images"
+CACHE_DIR = IMAGES_DIR / "_cache"
+CACHE_VERSION = 1
+MEMORY_ITEMS = 512       # imágenes preparadas que se guardan en memoria (LRU)
+ALPHA_THRESHOLD = 1      # alfa <= esto cuenta como transparente al recortar
+
+# Carpeta -> alturas (px a 72 dpi, las de height_px) con las que se dibuja
+PRESET_HEIGHTS = {
+    "players": [90],         # foto de la tarjeta
+    "logos":   [40, 56],     # escudo de la tarjeta / logos de competición
+    "flags":   [30],         # bandera de la tarjeta
+}
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg"}
+
+
+# --- Preparación ----------------------------------------------------------------------
+def trim_transparency(arr, thr=ALPHA_THRESHOLD):
+    """Recorta los márgenes con alfa <= thr (la imagen entera si es toda transparente)."""
+    alpha = arr[..., 3] > thr
+    rows = np.flatnonzero(alpha.any(axis=1))
+    if len(rows) == 0:
+        return arr
+    cols = np.flatnonzero(alpha.any(axis=0))
+    return arr[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1]
+
+
+def target_height(height_px, dpi=None):
+    """Píxeles reales que ocupa una imagen dibujada con height_px (72 dpi) a ese dpi."""
+    return max(1, round(height_px * (dpi or 72) / 72))
+
+
+def prepare_image(path, height, *, pad_px=0, thr=ALPHA_THRESHOLD):
+    """
+    RGBA uint8 recortada, reescalada para que con el padding mida height
+    píxeles de alto (nunca se amplía) y con pad_px transparentes alrededor.
+    """
+    from PIL import Image
+
+    with Image.open(path) as im:
+        arr = np.asarray(im.convert("RGBA"))
+    arr = trim_transparency(arr, thr)
+    h, w = arr.shape[:2]
+    inner = max(1, height - 2 * pad_px)
+    if h > inner:
+        size = (max(1, round(w * inner / h)), inner)
+        arr = np.asarray(Image.fromarray(arr).resize(size, Image.LANCZOS))
+    if pad_px > 0:
+        arr = np.pad(arr, ((pad_px, pad_px), (pad_px, pad_px), (0, 0)))
+    return np.ascontiguousarray(arr)
+
+
+# --- Caché ----------------------------------------------------------------------------
+def _content_hash(path):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def cache_path(path, height, pad_px, *, cache_dir=CACHE_DIR):
+    size = os.stat(path).st_size
+    return Path(cache_dir) / f"{_content_hash(path)}-{size}-h{height}-p{pad_px}-v{CACHE_VERSION}.npy"
+
+
+@lru_cache(maxsize=MEMORY_ITEMS)
+def _cached(path, mtime_ns, size, height, pad_px, cache_dir):
+    # mtime/tamaño en la clave: si el fichero cambia, es otra entrada
+    disk = cache_path(path, height, pad_px, cache_dir=cache_dir)
+    try:
+        arr = np.load(disk, allow_pickle=False)
+    except (OSError, ValueError):
+        arr = prepare_image(path, height, pad_px=pad_px)
+        disk.parent.mkdir(parents=True, exist_ok=True)
+        tmp = disk.with_name(f"{disk.stem}.{os.getpid()}.tmp.npy")
+        np.save(tmp, arr)
+        os.replace(tmp, disk)
+    arr.flags.writeable = False   # compartida entre llamadas
+    return arr
+
+
+def image_array(path, height_px, *, dpi=None, pad_px=0, cache_dir=CACHE_DIR):
+    """
+    Imagen preparada para dibujarse con altura height_px (como OffsetImage
+    con zoom = height_px / arr.shape[0]). Con dpi, se reescala a los píxeles
+    reales de esa resolución. Lanza FileNotFoundError si no existe.
+    """
+    path = Path(path).resolve()
+    st = os.stat(path)
+    return _cached(str(path), st.st_mtime_ns, st.st_size, target_height(height_px, dpi),
+                   int(pad_px), str(cache_dir))
+
+
+def clear_memory():
+    _cached.cache_clear()
+
+
+def warm_cache(dpi=None, *, heights=PRESET_HEIGHTS, images_dir=IMAGES_DIR,
+               cache_dir=CACHE_DIR, pad_px=2):
+    """
+    Prepara todas las imágenes de images/<carpeta> con sus alturas de
+    PRESET_HEIGHTS (las fotos sin padding, escudos y banderas con pad_px).
+    Devuelve cuántas se generaron o ya estaban.
+    """
+    done = 0
+    for folder, hs in heights.items():
+        pad = 0 if folder == "players" else pad_px
+        for f in sorted(Path(images_dir, folder).glob("*")):
+            if f.suffix.lower() not in IMAGE_SUFFIXES:
+                continue
+            for h in hs:
+                image_array(f, h, dpi=dpi, pad_px=pad, cache_dir=cache_dir)
+                done += 1
+    return done
+
+
+def main(argv=None):
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Precalienta la caché de imágenes de las tarjetas.")
+    ap.add_argument("--dpi", type=int, action="append",
+                    help="dpi de salida (se puede repetir; por defecto 150)")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    n = sum(warm_cache(dpi) for dpi in (args.dpi or [150]))
+    print(f"{n} imágenes preparadas en {CACHE_DIR} · {time.perf_counter() - t0:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+# utils/indice_partidos.py
+"""
+Índice persistente jugador → partido(s).
+
+Evita abrir todos los *_lg_jugadores.csv cada vez que se busca un jugador:
+se construye una vez por carpeta de datos (data/matches), se guarda en
+<data_dir>/_cache/indice_jugadores.json y en cada refresco solo se vuelven a
+leer los ficheros nuevos o modificados (p. ej. al añadir jornada_N).
+"""
+from pathlib import Path
+import json
+import os
+import re
+
+import pandas as pd
+
+CACHE_DIRNAME = "_cache"
+INDEX_FILENAME = "indice_jugadores.json"
+INDEX_VERSION = 1
+
+_PLAYERS_SUFFIX = "_lg_jugadores.csv"
+_EVENTS_SUFFIX = "_lg_eventos.csv"
+
+
+# --- Descubrimiento de ficheros -----------------------------------------------
+def _jornada_num(path):
+    # "jornada_12" -> 12 (para ordenar 1, 2, ..., 10 y no 1, 10, 2)
+    m = re.search(r"(\d+)$", Path(path).name)
+    return int(m.group(1)) if m else -1
+
+
+def discover_match_files(data_dir):
+    """
+    Devuelve [(players_path, events_path), ...] de data_dir/jornada_*/,
+    ordenado por número de jornada y nombre de fichero.
+    """
+    data_dir = Path(data_dir)
+    pairs = []
+    for jdir in sorted(data_dir.glob("jornada_*"), key=_jornada_num):
+        if not jdir.is_dir():
+            continue
+        for p in sorted(jdir.glob(f"*{_PLAYERS_SUFFIX}")):
+            e = p.with_name(p.name[: -len(_PLAYERS_SUFFIX)] + _EVENTS_SUFFIX)
+            pairs.append((str(p), str(e)))
+    return pairs
+
+
+def match_key_from_path(path):
+    # ".../1J_ATH_SEV_lg_jugadores.csv" -> "1J_ATH_SEV"
+    name = Path(path).name
+    for suf in (_PLAYERS_SUFFIX, _EVENTS_SUFFIX):
+        if name.endswith(suf):
+            return name[: -len(suf)]
+    return Path(path).stem
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _read_player_ids(path):
+    # Solo la columna playerId. Import aquí: lectura_csv depende de este módulo
+    from .lectura_csv import sniff_sep
+
+    with open(path, "r", encoding="utf-8") as f:
+        sep = sniff_sep(f.readline())
+    df = pd.read_csv(path, sep=sep, encoding="utf-8",
+                     usecols=lambda c: c.strip() == "playerId")
+    if df.shape[1] == 0:
+        return None
+    ids = pd.to_numeric(df.iloc[:, 0], errors="coerce").dropna().astype("int64")
+    return sorted(set(ids.tolist()))
+
+
+# --- Índice --------------------------------------------------------------------
+class PlayerMatchIndex:
+    """
+    Índice playerId → [entradas de partido], con una entrada por partido:
+    {"match", "jornada", "players_file", "events_file"}.
+
+    - update(pairs): incremental, solo parsea ficheros nuevos o cambiados
+      (según mtime y tamaño); los que desaparecen se eliminan.
+    - lookup(player_id): una consulta a diccionario.
+    """
+
+    def __init__(self, base_dir=None):
+        self.base_dir = Path(base_dir) if base_dir is not None else None
+        self._files = {}     # players_file (clave) -> info
+        self._players = {}   # playerId -> [players_file, ...] en orden
+
+    # Las rutas se guardan relativas a base_dir para que el JSON sea portable
+    def _key(self, path):
+        if self.base_dir is None:
+            return str(path)
+        try:
+            return Path(os.path.relpath(path, self.base_dir)).as_posix()
+        except ValueError:
+            return str(path)
+
+    def _path(self, key):
+        if self.base_dir is None or os.path.isabs(key):
+            return key
+        return str(self.base_dir / key)
+
+    def update(self, pairs):
+        """
+        Sincroniza el índice con la lista [(players_path, events_path), ...].
+        Devuelve el número de ficheros que ha habido que (re)leer.
+        """
+        seen, order, parsed = set(), [], 0
+        for p_path, e_path in pairs:
+            key = self._key(p_path)
+            seen.add(key)
+            order.append(key)
+            try:
+                stamp = _stamp(p_path)
+            except OSError:
+                self._files.pop(key, None)
+                continue
+
+            info = self._files.get(key)
+            if info is not None and info["stamp"] == stamp:
+                info["events"] = self._key(e_path)
+                continue
+
+            try:
+                ids = _read_player_ids(p_path)
+            except Exception:
+                ids = None
+            parsed += 1
+            if ids is None:
+                self._files.pop(key, None)
+                continue
+            self._files[key] = {
+                "stamp":   stamp,
+                "events":  self._key(e_path),
+                "match":   match_key_from_path(p_path),
+                "jornada": Path(p_path).parent.name,
+                "players": ids,
+            }
+
+        for key in list(self._files):
+            if key not in seen:
+                del self._files[key]
+
+        # Reordena según la lista recibida y reconstruye playerId → ficheros
+        self._files = {k: self._files[k] for k in order if k in self._files}
+        self._rebuild()
+        return parsed
+
+    def _rebuild(self):
+        players = {}
+        for key, info in self._files.items():
+            for pid in info["players"]:
+                players.setdefault(int(pid), []).append(key)
+        self._players = players
+
+    def _entry(self, key):
+        info = self._files[key]
+        return {
+            "match":        info["match"],
+            "jornada":      info["jornada"],
+            "players_file": self._path(key),
+            "events_file":  self._path(info["events"]),
+        }
+
+    def lookup(self, player_id):
+        """Todas las entradas de partido del jugador (lista vacía si no está)."""
+        try:
+            pid = int(float(player_id))
+        except Exception:
+            return []
+        return [self._entry(k) for k in self._players.get(pid, [])]
+
+    def first(self, player_id):
+        """Primera entrada del jugador (en orden de jornada) o None."""
+        try:
+            pid = int(float(player_id))
+        except Exception:
+            return None
+        keys = self._players.get(pid)
+        return self._entry(keys[0]) if keys else None
+
+    def __contains__(self, player_id):
+        try:
+            return int(float(player_id)) in self._players
+        except Exception:
+            return False
+
+    def __len__(self):
+        return len(self._players)
+
+    # --- Persistencia ------------------------------------------------------------
+    def to_dict(self):
+        return {"version": INDEX_VERSION, "files": self._files}
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path, base_dir=None):
+        idx = cls(base_dir=base_dir)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            return idx
+        if raw.get("version") != INDEX_VERSION:
+            return idx  # formato antiguo: se reconstruye desde cero
+        idx._files = raw.get("files", {})
+        idx._rebuild()
+        return idx
+
+
+# --- Índice por carpeta de datos (persistente) ---------------------------------
+_DIR_INDEXES = {}
+
+
+def index_path_for(data_dir):
+    return Path(data_dir) / CACHE_DIRNAME / INDEX_FILENAME
+
+
+def build_player_index(data_dir, *, save=True):
+    """
+    Devuelve el índice de data_dir (p. ej. "../data/matches").
+    La primera vez lo carga del JSON (si existe); en cada llamada comprueba
+    jornadas/ficheros nuevos y solo lee esos. Se guarda si ha cambiado algo.
+    """
+    data_dir = Path(data_dir).resolve()
+    idx = _DIR_INDEXES.get(data_dir)
+    if idx is None:
+        idx = PlayerMatchIndex.load(index_path_for(data_dir), base_dir=data_dir)
+        _DIR_INDEXES[data_dir] = idx
+
+    n_before = len(idx._files)
+    parsed = idx.update(discover_match_files(data_dir))
+    changed = parsed or len(idx._files) != n_before
+    if save and (changed or not index_path_for(data_dir).exists()):
+        idx.save(index_path_for(data_dir))
+    return idx
+
+
+# --- Índice en memoria para listas explícitas de ficheros ----------------------
+_LIST_INDEXES = {}
+
+
+def index_for_files(players_files, events_files):
+    """
+    Índice (en memoria, sin JSON) para las listas del notebook
+    (PATH_PLAYERS_LOG / PATH_EVENTS_LOG). Se reutiliza entre llamadas y solo
+    relee los ficheros cuyo mtime/tamaño haya cambiado.
+    """
+    if len(players_files) != len(events_files):
+        raise ValueError("players_files y events_files deben tener la misma longitud y orden.")
+    key = (tuple(map(str, players_files)), tuple(map(str, events_files)))
+    idx = _LIST_INDEXES.get(key)
+    if idx is None:
+        idx = PlayerMatchIndex()
+        _LIST_INDEXES[key] = idx
+    idx.update(zip(*key))
+    return idx
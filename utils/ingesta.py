@@ -0,0 +1,220 @@
+# utils/ingesta.py
+"""
+Ingesta en paralelo de muchos partidos (lg_eventos): lectura del CSV y
+normalización (utils.eventos) repartidas en un pool acotado de procesos
+o hilos.
+
+    results = read_matches(events_files, workers=4)       # un resultado por partido
+    ev, results = load_season_events("data/matches")     # EventsFrame de toda la carpeta
+    arrays = build_event_arrays("data/matches", workers=4)   # almacén columnar (.npy)
+
+- Los resultados salen siempre en el orden de entrada, acabe antes el que
+  acabe; cada uno dice si fue bien y, si no, el error (mismo formato que
+  utils.dashboard_batch).
+- Con errors="raise" se relanza la excepción del primer partido que falló
+  (en el orden de entrada, como haría el bucle secuencial), con una nota
+  que dice qué partido era. Con errors="skip" los que fallan se dejan fuera
+  y quedan en los resultados.
+- workers=1 (o una sola CPU disponible) lo hace todo en este proceso.
+"""
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from . import trazas
+from .eventos import EVENTS_FRAME_COLUMNS, EventsFrame, FlagMatrix, normalize_events
+from .indice_partidos import discover_match_files, match_key_from_path
+from .lectura_csv import read_whoscored_csv
+
+# Columnas de texto del EventsFrame que se devuelven como category
+CATEGORICAL_COLUMNS = ["type", "type_norm", "outc"]
+
+
+def default_workers():
+    # CPUs que puede usar este proceso (no las de la máquina entera)
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _as_categorical(df):
+    for c in CATEGORICAL_COLUMNS:
+        if c in df.columns and not isinstance(df[c].dtype, pd.CategoricalDtype):
+            df[c] = df[c].astype("category")
+    return df
+
+
+# --- Un partido (se ejecuta en el worker) -----------------------------------------
+_IN_CHILD = False   # True en los procesos del pool (sus spans vuelven con el resultado)
+
+
+def _init_worker(trace=False):
+    global _IN_CHILD
+    _IN_CHILD = True
+    # Con fork el hijo hereda el buffer del padre: se vacía antes de trabajar
+    trazas.clear()
+    if trace:
+        trazas.enable()
+
+
+def _read_match(key, path, columns):
+    t0 = time.perf_counter()
+    res = {"match": key, "path": str(path), "ok": False, "error": None, "rows": 0,
+           "seconds": 0.0, "pid": os.getpid(), "events": None}
+    try:
+        with trazas.span("ingesta.partido", match=key) as s:
+            ev = normalize_events(read_whoscored_csv(path, columns))
+            # category antes de volver al proceso principal: menos que serializar
+            ev.df = _as_categorical(ev.df)
+            ev.match_id = key
+            s.set(rows=len(ev))
+        res.update(ok=True, rows=len(ev), events=ev)
+    except Exception as exc:
+        res["error"] = f"{type(exc).__name__}: {exc}"
+        res["exception"] = exc
+    finally:
+        res["seconds"] = time.perf_counter() - t0
+        if _IN_CHILD and trazas.enabled():
+            res["spans"] = trazas.drain()
+    return res
+
+
+# --- Varios partidos ----------------------------------------------------------------
+def read_matches(events_files, *, columns=EVENTS_FRAME_COLUMNS, workers=None,
+                 processes=True, errors="raise"):
+    """
+    Lee y normaliza varios lg_eventos en paralelo. Devuelve una lista de
+    resultados en el mismo orden que events_files:
+        {"match", "path", "ok", "error", "rows", "seconds", "pid", "events"}
+    con events = EventsFrame (None si falló).
+    - workers: tamaño del pool (por defecto, las CPUs disponibles).
+    - processes: pool de procesos (paraleliza también la parte pandas);
+      False = hilos (sin copiar resultados entre procesos; la lectura con
+      pyarrow suelta el GIL).
+    - errors: "raise" o "skip" (ver cabecera del módulo).
+    """
+    if errors not in ("raise", "skip"):
+        raise ValueError(f"errors debe ser 'raise' o 'skip', no {errors!r}")
+    items = [(match_key_from_path(p), str(p)) for p in events_files]
+    workers = max(1, min(workers or default_workers(), len(items)))
+
+    with trazas.span("ingesta.lote", rows=len(items), workers=workers):
+        if workers == 1:
+            results = [_read_match(k, p, columns) for k, p in items]
+        else:
+            tracing = trazas.enabled()
+            if processes:
+                pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                           initargs=(tracing,))
+            else:
+                pool = ThreadPoolExecutor(max_workers=workers)
+            with pool as ex:
+                # map devuelve en orden de entrada; chunksize reparte partidos por lotes
+                chunk = max(1, len(items) // (workers * 4)) if processes else 1
+                results = list(ex.map(_read_match, *zip(*items), [columns] * len(items),
+                                      chunksize=chunk))
+            if processes:
+                for r in results:
+                    trazas.add_spans(r.pop("spans", []))
+
+    if errors == "raise":
+        for r in results:
+            if not r["ok"]:
+                exc = r["exception"]
+                exc.add_note(f"Partido {r['match']} ({r['path']})")
+                raise exc
+    for r in results:
+        r.pop("exception", None)
+    return results
+
+
+def concat_categorical(frames):
+    """
+    Une EventsFrame (en orden) en uno solo con columna "match" y las columnas
+    de texto como category (categorías unidas, sin pasar por object).
+    """
+    frames = [f for f in frames if f is not None]
+    if not frames:
+        return EventsFrame(pd.DataFrame())
+    dfs = [_as_categorical(f.df) for f in frames]
+    for c in CATEGORICAL_COLUMNS:
+        if all(c in d.columns for d in dfs):
+            cats = pd.Index(pd.unique(np.concatenate([d[c].cat.categories.to_numpy(object)
+                                                      for d in dfs])))
+            dfs = [d.assign(**{c: d[c].cat.set_categories(cats)}) for d in dfs]
+    df = pd.concat(dfs, ignore_index=True)
+    keys = [f.match_id for f in frames]
+    df["match"] = pd.Categorical.from_codes(
+        np.repeat(np.arange(len(frames)), [len(d) for d in dfs]),
+        categories=pd.Index(keys).astype(str))
+    return EventsFrame(df, match_id=tuple(keys),
+                       flags=FlagMatrix.concat(f.flags for f in frames))
+
+
+def load_season_events(data_dir, *, columns=EVENTS_FRAME_COLUMNS, workers=None,
+                       processes=True, errors="raise"):
+    """
+    Todos los partidos de data_dir/jornada_*/ (orden de discover_match_files)
+    en un solo EventsFrame categórico. Devuelve (events, results).
+    """
+    files = [e for _, e in discover_match_files(data_dir) if Path(e).exists()]
+    results = read_matches(files, columns=columns, workers=workers,
+                           processes=processes, errors=errors)
+    with trazas.span("ingesta.concat", rows=sum(r["rows"] for r in results)):
+        events = concat_categorical(r.pop("events") for r in results)
+    return events, results
+
+
+def summarize(results, wall):
+    """Resumen de una ingesta (mismo estilo que dashboard_batch.summarize)."""
+    ok = [r for r in results if r["ok"]]
+    return {
+        "matches":  len(results),
+        "ok":       len(ok),
+        "failed":   len(results) - len(ok),
+        "rows":     sum(r["rows"] for r in ok),
+        "wall":     round(wall, 3),
+        "cpu":      round(sum(r["seconds"] for r in results), 3),
+        "processes": len({r["pid"] for r in results}),
+        "failures": [{"match": r["match"], "error": r["error"]}
+                     for r in results if not r["ok"]],
+    }
+
+
+def main(argv=None):
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Lee y normaliza en paralelo los partidos de una carpeta.")
+    ap.add_argument("data_dir", help="carpeta con jornada_*/")
+    ap.add_argument("--workers", type=int, default=None, help="procesos (por defecto, CPUs disponibles)")
+    ap.add_argument("--threads", action="store_true", help="hilos en vez de procesos")
+    ap.add_argument("--arrays", action="store_true",
+                    help="genera además el almacén columnar (utils.arrays_eventos)")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    if args.arrays:
+        from .arrays_eventos import build_event_arrays
+        arrays = build_event_arrays(args.data_dir, force=True, workers=args.workers,
+                                    processes=not args.threads)
+        print(f"{len(arrays.matches)} partidos · {len(arrays)} eventos · "
+              f"{time.perf_counter() - t0:.2f} s")
+        return 0
+    ev, results = load_season_events(args.data_dir, workers=args.workers,
+                                      processes=not args.threads, errors="skip")
+    s = summarize(results, time.perf_counter() - t0)
+    print(f"{s['ok']}/{s['matches']} partidos · {s['rows']} eventos · {s['wall']} s "
+          f"({s['cpu']} s de CPU, {s['processes']} procesos)")
+    for f in s["failures"]:
+        print(f"  ✗ {f['match']}: {f['error']}")
+    return 1 if s["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
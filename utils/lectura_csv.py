@@ -0,0 +1,139 @@
+# utils/lectura_csv.py
+"""
+Lectura de CSV WhoScored (lg_eventos, lg_jugadores, features) con proyección
+de columnas y esquema de tipos explícito.
+
+    read_whoscored_csv(path)                          # todas las columnas, tipadas
+    read_whoscored_csv(path, columns=["x", "y", ...]) # solo esas (si existen)
+
+- El separador (; o ,) se detecta con la primera línea del mismo fichero
+  abierto que luego se parsea (una sola apertura).
+- Las columnas conocidas salen ya con su tipo (ids Int64, coordenadas
+  float32, type/outcomeType como category, flags boolean...) y los qNone_*
+  numéricos en float32.
+- Con pyarrow instalado se usa su lector CSV (las columnas que no se piden
+  ni se convierten); si no, el motor C de pandas con usecols/dtype.
+"""
+import pandas as pd
+
+from .almacen_eventos import (
+    BOOL_COLUMNS, CATEGORY_COLUMNS, COORD_COLUMNS, ID_COLUMNS, MINUTE_COLUMNS,
+    PLAYER_CATEGORY_COLUMNS, PLAYER_ID_COLUMNS,
+)
+
+# --- Esquema (mismo que el almacén Parquet) -------------------------------------
+WHOSCORED_DTYPES = {
+    **{c: "Int64" for c in ID_COLUMNS + PLAYER_ID_COLUMNS},
+    **{c: "Int16" for c in MINUTE_COLUMNS},
+    **{c: "float32" for c in COORD_COLUMNS},
+    **{c: "category" for c in CATEGORY_COLUMNS + PLAYER_CATEGORY_COLUMNS},
+    **{c: "boolean" for c in BOOL_COLUMNS},
+}
+# Qualifiers numéricos (flags 1.0/NaN y valores pequeños). No van en el esquema
+# porque hay qNone_* de texto: se bajan a float32 si salen numéricos.
+QUALIFIER_DTYPE = "float32"
+
+
+def _pyarrow_available():
+    try:
+        import pyarrow.csv  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+PYARROW_ENGINE = _pyarrow_available()
+
+
+def sniff_sep(first_line):
+    # Mismo criterio de siempre: ; solo si no hay comas en la cabecera
+    return ";" if (";" in first_line and "," not in first_line) else ","
+
+
+# --- Motores ----------------------------------------------------------------------
+def _read_pyarrow(f, sep, raw_cols, dtype):
+    import pyarrow as pa
+    import pyarrow.csv as pv
+
+    # Los ids vienen como "400237.00": se parsean como float y se pasan a entero
+    parse_as = {
+        "Int64": pa.float64(), "Int16": pa.float64(), "float32": pa.float32(),
+        "category": pa.dictionary(pa.int32(), pa.string()), "boolean": pa.bool_(),
+    }
+    int_as = {"Int64": pa.int64(), "Int16": pa.int16()}
+    table = pv.read_csv(
+        f,
+        parse_options=pv.ParseOptions(delimiter=sep),
+        convert_options=pv.ConvertOptions(
+            include_columns=raw_cols,
+            column_types={c: parse_as[t] for c, t in dtype.items() if t in parse_as},
+            strings_can_be_null=True,    # "" -> NaN, como en pandas
+        ),
+    )
+    cols = table.columns
+    for i, field in enumerate(table.schema):
+        t = dtype.get(field.name)
+        if t in int_as:
+            try:
+                cols[i] = cols[i].cast(int_as[t])
+            except pa.ArrowInvalid:      # decimales de verdad: se queda en float
+                pass
+        elif t is None and field.name.strip().startswith("qNone_") and (
+                pa.types.is_integer(field.type) or pa.types.is_floating(field.type)
+                or pa.types.is_null(field.type)):
+            cols[i] = cols[i].cast(pa.float32())
+        elif pa.types.is_null(field.type):   # columna vacía: NaN (float), como en pandas
+            cols[i] = cols[i].cast(pa.float64())
+
+    df = pa.table(cols, names=table.column_names).to_pandas()
+    for c, t in dtype.items():
+        if t in ("Int64", "Int16", "boolean") and c in df.columns:
+            df[c] = df[c].astype(t)
+    return df
+
+
+def _read_pandas(f, sep, raw_cols, dtype):
+    df = pd.read_csv(f, sep=sep, encoding="utf-8", usecols=raw_cols,
+                     dtype=dtype or None, low_memory=False)
+    for c in df.columns:
+        if c not in dtype and c.strip().startswith("qNone_") and df[c].dtype == "float64":
+            df[c] = df[c].astype(QUALIFIER_DTYPE)
+    return df
+
+
+def read_whoscored_csv(path, columns=None, *, schema=None, engine=None):
+    """
+    Lee un CSV WhoScored.
+    - columns: columnas a cargar (las que no estén en el fichero se ignoran);
+      None = todas.
+    - schema: {columna: dtype}; por defecto WHOSCORED_DTYPES. Con schema={}
+      se lee sin tipos forzados (inferencia normal de pandas).
+    - engine: "pyarrow", "c" o None (pyarrow si está instalado).
+    Los nombres de columna se devuelven sin espacios alrededor.
+    """
+    schema = WHOSCORED_DTYPES if schema is None else schema
+    engine = engine or ("pyarrow" if PYARROW_ENGINE else "c")
+
+    with open(path, "rb") as f:
+        first = f.readline().decode("utf-8-sig")
+        f.seek(0)
+        sep = sniff_sep(first)
+        raw = [c.strip('"') for c in first.rstrip("\r\n").split(sep)]
+        header = {c.strip(): c for c in raw if c.strip()}
+
+        if columns is None:
+            wanted = list(header)
+        else:
+            keep = set(columns)
+            wanted = [c for c in header if c in keep]
+        raw_cols = [header[c] for c in wanted]
+
+        if not schema:
+            df = pd.read_csv(f, sep=sep, encoding="utf-8", usecols=raw_cols, engine=engine)
+        else:
+            dtype = {header[c]: schema[c] for c in wanted if c in schema}
+            read = _read_pyarrow if engine == "pyarrow" else _read_pandas
+            df = read(f, sep, raw_cols, dtype)
+
+    df.columns = [c.strip() for c in df.columns]
+    return df[wanted] if columns is not None else df
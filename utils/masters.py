@@ -0,0 +1,209 @@
+# utils/masters.py
+"""
+Registro de masters (equipos, jugadores, partidos) cargado una sola vez.
+
+Cada tabla se lee la primera vez que se usa y se indexa por su id
+(teamID / playerID / matchId) en un diccionario, así que cada consulta es
+O(1). Si el CSV cambia en disco (mtime o tamaño), se recarga solo.
+"""
+from pathlib import Path
+import os
+
+import pandas as pd
+
+from .lectura_csv import sniff_sep
+
+# Columnas de id aceptadas en cada master (primera que exista)
+TEAM_ID_COLUMNS = ["teamID", "teamId", "id", "team_id"]
+PLAYER_ID_COLUMNS = ["playerID", "playerId", "player_id", "id"]
+MATCH_ID_COLUMNS = ["matchId", "matchID", "match_id", "id"]
+TEAM_COLOR_COLUMNS = ["color_primario", "primary_color", "team_color_hex"]
+# master_partidos: clave del partido en los CSV ("1J_WOL_CIT") y su competición
+MATCH_KEY_COLUMNS = ["partido", "match_key"]
+COMPETITION_COLUMNS = ["competicion", "competition"]
+
+MASTER_FILES = {
+    "teams":   "master_equipos.csv",
+    "players": "master_jugadores.csv",
+    "matches": "master_partidos.csv",
+}
+
+
+def _read_master(path):
+    with open(path, "r", encoding="utf-8-sig") as f:
+        sep = sniff_sep(f.readline())
+    df = pd.read_csv(path, sep=sep, encoding="utf-8-sig")
+    df.columns = [c.strip() for c in df.columns]
+    return df
+
+
+def _as_int(v):
+    try:
+        return int(float(v))
+    except (TypeError, ValueError):
+        return None
+
+
+def _build_index(df, id_columns):
+    # (columna de id, {id: fila dict}); la primera fila gana si hay repetidos
+    id_col = next((c for c in id_columns if c in df.columns), None)
+    index = {}
+    if id_col is not None:
+        ids = pd.to_numeric(df[id_col], errors="coerce").astype("Int64")
+        for i, row in zip(ids, df.to_dict("records")):
+            if i is not pd.NA and int(i) not in index:
+                index[int(i)] = row
+    return id_col, index
+
+
+class MasterTable:
+    """
+    Un master en memoria: df completo + índice {id: fila (dict)}.
+    La primera fila gana si un id está repetido.
+    """
+
+    def __init__(self, path, id_columns):
+        self.path = Path(path)
+        self.id_columns = id_columns
+        self._stamp = None
+        self._df = None
+        self._index = {}
+        self.id_col = None
+
+    def _current_stamp(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _ensure(self):
+        stamp = self._current_stamp()
+        if stamp is not None and stamp == self._stamp:
+            return
+        self._stamp = stamp
+        if stamp is None:
+            self._df, self._index, self.id_col = pd.DataFrame(), {}, None
+            return
+        df = _read_master(self.path)
+        self.id_col, self._index = _build_index(df, self.id_columns)
+        self._df = df
+
+    @property
+    def df(self):
+        self._ensure()
+        return self._df
+
+    def get(self, key, default=None):
+        """Fila (dict) del id o default."""
+        self._ensure()
+        k = _as_int(key)
+        return self._index.get(k, default) if k is not None else default
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        self._ensure()
+        return len(self._index)
+
+
+class MasterRegistry:
+    """
+    Los tres masters de una carpeta (data/masters). Las tablas se cargan al
+    primer uso: si solo se piden colores no se lee master_jugadores.
+    """
+
+    def __init__(self, masters_dir):
+        self.masters_dir = Path(masters_dir)
+        self.teams = get_master_table(self.masters_dir / MASTER_FILES["teams"], TEAM_ID_COLUMNS)
+        self.players = get_master_table(self.masters_dir / MASTER_FILES["players"], PLAYER_ID_COLUMNS)
+        self.matches = get_master_table(self.masters_dir / MASTER_FILES["matches"], MATCH_ID_COLUMNS)
+
+    def team(self, team_id):
+        return self.teams.get(team_id)
+
+    def player(self, player_id):
+        return self.players.get(player_id)
+
+    def match(self, match_id):
+        return self.matches.get(match_id)
+
+    def team_color(self, team_id, default="#00E5FF"):
+        return team_color_from_row(self.team(team_id), default)
+
+
+def team_color_from_row(row, default="#00E5FF"):
+    """Color hex de una fila de master_equipos (o default si no es válido)."""
+    if row is None:
+        return default
+    for c in TEAM_COLOR_COLUMNS:
+        if c in row:
+            val = str(row[c]).strip()
+            return val if val.startswith("#") and len(val) in (4, 7) else default
+    return default
+
+
+# --- Registro global (por ruta) --------------------------------------------------
+_TABLES = {}
+_REGISTRIES = {}
+
+
+def get_master_table(path, id_columns):
+    """MasterTable compartida para path (se recarga sola si cambia el fichero)."""
+    key = (str(Path(path).resolve()), tuple(id_columns))
+    table = _TABLES.get(key)
+    if table is None:
+        table = _TABLES[key] = MasterTable(path, id_columns)
+    return table
+
+
+def get_registry(masters_dir):
+    """MasterRegistry compartido para masters_dir."""
+    key = str(Path(masters_dir).resolve())
+    reg = _REGISTRIES.get(key)
+    if reg is None:
+        reg = _REGISTRIES[key] = MasterRegistry(masters_dir)
+    return reg
+
+
+def match_competitions(masters_dir):
+    """
+    {clave de partido: competición} desde master_partidos (columnas
+    partido / competicion). Las filas sin alguna de las dos no cuentan.
+    """
+    df = get_registry(masters_dir).matches.df
+    key_col = next((c for c in MATCH_KEY_COLUMNS if c in df.columns), None)
+    comp_col = next((c for c in COMPETITION_COLUMNS if c in df.columns), None)
+    if key_col is None or comp_col is None:
+        return {}
+    out = {}
+    for k, c in zip(df[key_col], df[comp_col]):
+        if isinstance(k, str) and k.strip() and isinstance(c, str) and c.strip():
+            out.setdefault(k.strip(), c.strip())
+    return out
+
+
+def teams_table(master_teams_path):
+    """Atajo para master_equipos a partir de su ruta."""
+    return get_master_table(master_teams_path, TEAM_ID_COLUMNS)
+
+
+# --- Índice para DataFrames ya cargados (p. ej. en el notebook) -----------------
+_DF_INDEXES = {}
+DF_INDEX_CACHE_SIZE = 8
+
+
+def index_dataframe(df, id_columns):
+    """
+    {id: fila} de un master ya cargado. Se memoiza por identidad del
+    DataFrame (el mismo objeto no se vuelve a recorrer).
+    """
+    hit = _DF_INDEXES.get(id(df))
+    if hit is not None and hit[0] is df and hit[1] == len(df):
+        return hit[2]
+    _, index = _build_index(df, id_columns)
+    _DF_INDEXES[id(df)] = (df, len(df), index)
+    while len(_DF_INDEXES) > DF_INDEX_CACHE_SIZE:
+        _DF_INDEXES.pop(next(iter(_DF_INDEXES)))
+    return index
@@ -0,0 +1,288 @@
+# utils/metricas.py
+"""
+Tabla de métricas por (jugador, partido) para las tarjetas del dashboard.
+
+Se calcula una vez por partido, en bloque: del *_features_jugadores.csv salen
+minutos, pases, regates y tiros de WhoScored; del EventsFrame (utils.eventos)
+goles, tiros, centros, pases clave, asistencias y ocasiones claras con un solo
+groupby. La tabla se guarda en <data_dir>/_cache/metricas_jugador_partido.csv
+y en cada llamada solo se recalculan los partidos nuevos o modificados.
+
+Después, la tarjeta de cualquier grupo de jugadores y rango de jornadas es un
+groupby-sum sobre la tabla:
+
+    tabla = build_metrics_table("../data/matches")
+    perfiles = tabla.profiles([408449, 480249], jornadas=[1], min_minutes=45)
+"""
+from pathlib import Path
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .eventos import EVENTS_FRAME_COLUMNS, normalize_events
+from .indice_partidos import (
+    CACHE_DIRNAME, _jornada_num, _stamp, discover_match_files, match_key_from_path,
+)
+from .lectura_csv import read_whoscored_csv
+from .opta import type_codes, type_id
+from .similares import PLAYED_COLUMNS, played_mask
+
+TABLE_FILENAME = "metricas_jugador_partido.csv"
+STAMPS_FILENAME = "metricas_jugador_partido.json"
+TABLE_VERSION = 2
+
+_FEATURES_SUFFIX = "_features_jugadores.csv"
+
+# Tipos de tiro (typeId Opta), mismo criterio que la tarjeta del notebook
+GOAL_TYPE = type_id("Goal")
+SHOT_ANY = type_codes("SavedShot", "MissedShots", "ShotOnPost", "Goal")
+SHOT_OT = type_codes("SavedShot", "Goal", "ShotOnPost")   # 'al palo' cuenta como a puerta
+
+# Métricas de eventos: suma de flags (como _sum_flags del notebook)
+FLAG_METRICS = {
+    "centros":        ["qNone_Cross", "qNone_BlockedCross"],
+    "pases_clave_ev": ["qNone_KeyPass", "qNone_ShotAssist"],
+    "asist":          ["qNone_Assisted", "qNone_IntentionalAssist", "qNone_IntentionalGoalAssist"],
+    "bc_created":     ["qNone_BigChanceCreated"],
+    "bc_shooter":     ["qNone_BigChance"],
+}
+EVENT_METRICS = ["goles", "tiros_ev", "tiros_OT_ev"] + list(FLAG_METRICS)
+
+# Columnas de features (WhoScored) → nombre en la tabla
+FEATURE_COLUMNS = {
+    "minutes":             "minutos",
+    "s_passesTotal":       "pases_total",
+    "s_passesAccurate":    "pases_ok",
+    "s_shotsTotal":        "tiros_ft",
+    "s_shotsOnTarget":     "tiros_OT_ft",
+    "s_dribblesAttempted": "reg_int",
+    "s_dribblesWon":       "reg_ok",
+    "s_passesKey":         "pases_clave_ft",
+}
+
+# Métricas que se suman al agregar (las de tarjeta)
+SUM_COLUMNS = ["minutos", "pases_total", "pases_ok", "reg_int", "reg_ok",
+               "tiros", "tiros_OT", "pases_clave"] + EVENT_METRICS
+
+
+# --- Métricas de un partido ------------------------------------------------------
+def event_metrics(df_events):
+    """
+    Métricas de eventos por jugador (DataFrame indexado por playerId) a partir
+    de lg_eventos crudo o de un EventsFrame.
+    """
+    ev = normalize_events(df_events)
+    keep = ev.df["pid"].notna().to_numpy()
+    d, bits = ev.df[keep], ev.flags[keep]
+    t = d["type_id"].to_numpy()
+    cols = {
+        # Goles sin duplicar: flag isGoal o type == 'goal'
+        "goles":       bits.any("isGoal") | (t == GOAL_TYPE),
+        "tiros_ev":    np.isin(t, list(SHOT_ANY)),
+        "tiros_OT_ev": np.isin(t, list(SHOT_OT)),
+    }
+    for name, flags in FLAG_METRICS.items():
+        cols[name] = bits.count(*flags)
+    m = pd.DataFrame(cols, index=d.index).astype(np.int32)
+    m["playerId"] = d["pid"].astype("int64").to_numpy()
+    m["teamId"] = d["tid"]
+    out = m.groupby("playerId")[EVENT_METRICS].sum()
+    # teamId más frecuente del jugador en el partido
+    out["teamId_ev"] = m.dropna(subset=["teamId"]).groupby("playerId")["teamId"].agg(
+        lambda s: s.mode().iloc[0])
+    return out
+
+
+def _feature_metrics(df_features):
+    f = df_features.copy()
+    f.columns = [c.strip() for c in f.columns]
+    f["playerId"] = pd.to_numeric(f["playerId"], errors="coerce")
+    # Los suplentes que no salen traen minutes = duración del partido: fuera
+    f = f[played_mask(f)].dropna(subset=["playerId"]).drop_duplicates("playerId")
+    out = pd.DataFrame(index=pd.Index(f["playerId"].astype("int64"), name="playerId"))
+    for src, dst in FEATURE_COLUMNS.items():
+        out[dst] = pd.to_numeric(f[src], errors="coerce").to_numpy() if src in f.columns else np.nan
+    out["edad"] = pd.to_numeric(f["age"], errors="coerce").to_numpy() if "age" in f.columns else np.nan
+    out["teamId_ft"] = pd.to_numeric(f["teamId"], errors="coerce").to_numpy() if "teamId" in f.columns else np.nan
+    return out
+
+
+def match_metrics(df_events, df_features=None, *, match=None, jornada=None):
+    """
+    Filas (jugador, partido) de un partido: features + eventos. Donde falta
+    el dato de features se usa el de eventos (tiros, tiros a puerta, pases clave).
+    """
+    ev = event_metrics(df_events)
+    ft = _feature_metrics(df_features) if df_features is not None else pd.DataFrame(
+        columns=list(FEATURE_COLUMNS.values()) + ["edad", "teamId_ft"],
+        index=pd.Index([], dtype="int64", name="playerId"))
+    t = ft.join(ev, how="outer")
+    t[EVENT_METRICS] = t[EVENT_METRICS].fillna(0).astype(np.int32)
+
+    t["tiros"] = t["tiros_ft"].fillna(t["tiros_ev"])
+    t["tiros_OT"] = t["tiros_OT_ft"].fillna(t["tiros_OT_ev"])
+    t["pases_clave"] = t["pases_clave_ft"].fillna(t["pases_clave_ev"])
+    t["teamId"] = t["teamId_ft"].fillna(t["teamId_ev"]).astype("Int64")
+
+    t = t.reset_index()
+    t.insert(1, "match", match)
+    t.insert(2, "jornada", jornada)
+    cols = ["playerId", "match", "jornada", "teamId", "edad"] + SUM_COLUMNS
+    return t[cols]
+
+
+# --- Tabla de la carpeta de datos (incremental) ------------------------------------
+def _compact(df):
+    # Tipos pequeños: la tabla de una temporada entera ocupa poco
+    df = df.copy()
+    df["playerId"] = df["playerId"].astype("int64")
+    df["jornada"] = pd.to_numeric(df["jornada"], errors="coerce").astype("Int16")
+    df["teamId"] = pd.to_numeric(df["teamId"], errors="coerce").astype("Int64")
+    df["match"] = df["match"].astype("category")
+    for c in ["edad"] + SUM_COLUMNS:
+        df[c] = pd.to_numeric(df[c], errors="coerce").astype(np.float32)
+    return df
+
+
+class MetricsTable:
+    """
+    Tabla de métricas (jugador, partido). df tiene una fila por jugador y
+    partido: playerId, match, jornada, teamId, edad y las SUM_COLUMNS.
+    """
+
+    def __init__(self, df):
+        self.df = _compact(df) if len(df) else df
+        self._stamps = {}   # match -> [stamp eventos, stamp features]
+
+    def __len__(self):
+        return len(self.df)
+
+    def __repr__(self):
+        return f"MetricsTable(rows={len(self.df)}, players={self.df['playerId'].nunique()})"
+
+    def select(self, player_ids=None, *, jornadas=None, min_minutes=0):
+        """Filas de esos jugadores / jornadas con al menos min_minutes en el partido."""
+        d = self.df
+        m = np.ones(len(d), dtype=bool)
+        if player_ids is not None:
+            m &= d["playerId"].isin([int(float(p)) for p in player_ids]).to_numpy()
+        if jornadas is not None:
+            m &= d["jornada"].isin([int(j) for j in jornadas]).fillna(False).to_numpy(dtype=bool)
+        if min_minutes:
+            m &= (d["minutos"].fillna(0) >= min_minutes).to_numpy()
+        return d[m]
+
+    def profiles(self, player_ids=None, *, jornadas=None, min_minutes=0):
+        """
+        Métricas sumadas por jugador (índice playerId, en el orden de
+        player_ids si se pasa). Añade partidos, pases_pct y reg_pct.
+        Solo cuentan los partidos con al menos min_minutes.
+        """
+        d = self.select(player_ids, jornadas=jornadas, min_minutes=min_minutes)
+        g = d.groupby("playerId", sort=False)
+        out = g[SUM_COLUMNS].sum(min_count=1).astype(np.float64)
+        out["partidos"] = g.size()
+        out["edad"] = g["edad"].max()
+        out["teamId"] = g["teamId"].last()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out["pases_pct"] = (100 * out["pases_ok"] / out["pases_total"]).round(2)
+            out["reg_pct"] = (100 * out["reg_ok"] / out["reg_int"]).round(2)
+        if player_ids is not None:
+            out = out.reindex([int(float(p)) for p in player_ids])
+        return out
+
+
+def table_paths(data_dir):
+    cache = Path(data_dir) / CACHE_DIRNAME
+    return cache / TABLE_FILENAME, cache / STAMPS_FILENAME
+
+
+def _features_path(players_path):
+    p = Path(players_path)
+    return p.with_name(match_key_from_path(p) + _FEATURES_SUFFIX)
+
+
+def _match_stamp(events_path, features_path):
+    out = []
+    for p in (events_path, features_path):
+        try:
+            out.append(_stamp(p))
+        except OSError:
+            out.append(None)
+    return out
+
+
+def _read_features(path):
+    # Solo las columnas que usa _feature_metrics
+    return read_whoscored_csv(path, list(FEATURE_COLUMNS) + ["playerId", "age", "teamId"]
+                              + PLAYED_COLUMNS)
+
+
+_TABLES = {}
+
+
+def build_metrics_table(data_dir, *, save=True):
+    """
+    MetricsTable de data_dir (p. ej. "../data/matches"). Lee la tabla
+    guardada en _cache y solo recalcula los partidos cuyo lg_eventos o
+    features han cambiado (mtime/tamaño); los que desaparecen se quitan.
+    """
+    data_dir = Path(data_dir).resolve()
+    table_path, stamps_path = table_paths(data_dir)
+
+    cached = _TABLES.get(data_dir)
+    if cached is None:
+        df, stamps = pd.DataFrame(), {}
+        try:
+            with open(stamps_path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            if raw.get("version") == TABLE_VERSION:
+                stamps = raw.get("matches", {})
+                df = pd.read_csv(table_path)
+        except (OSError, ValueError):
+            df, stamps = pd.DataFrame(), {}
+    else:
+        df, stamps = cached.df, cached._stamps
+
+    pairs = discover_match_files(data_dir)
+    current, todo = {}, []
+    for p_path, e_path in pairs:
+        key = match_key_from_path(p_path)
+        ft_path = _features_path(p_path)
+        st = _match_stamp(e_path, ft_path)
+        current[key] = st
+        if stamps.get(key) != st and st[0] is not None:
+            todo.append((key, _jornada_num(Path(p_path).parent), e_path, ft_path))
+
+    gone = set(stamps) - set(current)
+    if not todo and not gone and cached is not None:
+        return cached
+
+    parts = []
+    for key, jornada, e_path, ft_path in todo:
+        dfe = read_whoscored_csv(e_path, EVENTS_FRAME_COLUMNS)  # solo lo que usa event_metrics
+        dff = _read_features(ft_path) if os.path.exists(ft_path) else None
+        parts.append(match_metrics(dfe, dff, match=key, jornada=jornada))
+
+    drop = {k for k, *_ in todo} | gone
+    keep = [df[~df["match"].astype(str).isin(drop)].astype({"match": str})] if len(df) else []
+    df = pd.concat(keep + parts, ignore_index=True) if keep + parts else pd.DataFrame()
+    # mismo orden que discover_match_files
+    order = {k: i for i, k in enumerate(current)}
+    if len(df):
+        df = df.sort_values("match", key=lambda s: s.astype(str).map(order), kind="stable")
+
+    table = MetricsTable(df.reset_index(drop=True))
+    table._stamps = {k: v for k, v in current.items() if v[0] is not None}
+    _TABLES[data_dir] = table
+
+    if save and (todo or gone or not table_path.exists()):
+        table_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = table_path.with_suffix(".tmp")
+        table.df.to_csv(tmp, index=False)
+        os.replace(tmp, table_path)
+        with open(stamps_path, "w", encoding="utf-8") as f:
+            json.dump({"version": TABLE_VERSION, "matches": table._stamps}, f)
+    return table
@@ -0,0 +1,145 @@
+# utils/opta.py
+"""
+Diccionario Opta de tipos de evento y qualifiers.
+
+Los xlsx de data/opta_names (Opta_typeId.xlsx, Opta_qualifiers.xlsx) se
+compilan una vez a utils/opta_codigos.py (dicts de Python) y en ejecución
+solo se importa ese módulo, sin abrir ningún xlsx:
+
+    python -m utils.opta          # regenera utils/opta_codigos.py (necesita openpyxl)
+
+type_ids() -> {nombre normalizado: typeId}. Los nombres se normalizan igual
+que 'type_norm' en utils.eventos (minúsculas, sin espacios/_/-), así que
+"Take On" (Opta) y "TakeOn" (WhoScored) son la misma clave. Los tipos que
+WhoScored llama distinto se resuelven con WHOSCORED_TYPE_ALIASES; con los
+qualifiers (columnas qNone_*) pasa lo mismo con WHOSCORED_QUALIFIER_ALIASES.
+"""
+from functools import lru_cache
+from pathlib import Path
+import re
+
+OPTA_DIR = Path(__file__).resolve().parents[1] / "data" / "opta_names"
+TYPES_XLSX = OPTA_DIR / "Opta_typeId.xlsx"
+QUALIFIERS_XLSX = OPTA_DIR / "Opta_qualifiers.xlsx"
+CODES_MODULE = Path(__file__).resolve().parent / "opta_codigos.py"
+
+# Nombre WhoScored (normalizado) -> typeId Opta, cuando no coincide el nombre
+WHOSCORED_TYPE_ALIASES = {
+    "missedshots":     13,   # Miss
+    "shotonpost":      14,   # Post
+    "savedshot":       15,   # Attempt Saved
+    "substitutionoff": 18,   # Player off
+    "substitutionon":  19,   # Player on
+    "formationset":    34,   # Team set up
+}
+
+# Columna qNone_* de WhoScored (sin prefijo, normalizada) -> qualifierId Opta
+WHOSCORED_QUALIFIER_ALIASES = {
+    "rightfoot":           20,    # Right footed
+    "leftfoot":            72,    # Left footed
+    "playercaughtoffside": 7,     # Players caught offside
+    "yellow":              31,    # Yellow Card
+    "red":                 33,    # Red Card
+    "goalmouthy":          102,   # Goalmouth Y Coordinate
+    "goalmouthz":          103,   # Goalmouth Z Coordinate
+    "blockedx":            146,   # Blocked X Coordinate
+    "blockedy":            147,   # Blocked Y Coordinate
+}
+
+# typeId 0: tipo sin código Opta (p. ej. OffsideGiven de WhoScored)
+NO_TYPE = 0
+
+
+def norm_name(name):
+    # Mismo criterio que eventos.norm_type, para un solo texto
+    return re.sub(r"[\s_\-]+", "", str(name).lower())
+
+
+# --- Compilación xlsx -> opta_codigos.py ------------------------------------------
+def _read_xlsx(path):
+    import pandas as pd
+    df = pd.read_excel(path, usecols=[0, 1])
+    df.columns = ["id", "name"]
+    df = df.dropna()
+    return {int(i): str(n).strip() for i, n in zip(df["id"], df["name"])}
+
+
+def compile_codes(types_xlsx=TYPES_XLSX, qualifiers_xlsx=QUALIFIERS_XLSX, out=CODES_MODULE):
+    """Lee los xlsx y escribe el módulo con TYPE_NAMES y QUALIFIER_NAMES."""
+    types = _read_xlsx(types_xlsx)
+    qualifiers = _read_xlsx(qualifiers_xlsx)
+    lines = [
+        "# utils/opta_codigos.py",
+        "# Generado por utils/opta.py (python -m utils.opta) a partir de",
+        f"# data/opta_names/{Path(types_xlsx).name} y {Path(qualifiers_xlsx).name}. No editar a mano.",
+        "",
+        "TYPE_NAMES = {",
+        *[f"    {i}: {n!r}," for i, n in sorted(types.items())],
+        "}",
+        "",
+        "QUALIFIER_NAMES = {",
+        *[f"    {i}: {n!r}," for i, n in sorted(qualifiers.items())],
+        "}",
+        "",
+    ]
+    out = Path(out)
+    tmp = out.with_suffix(".tmp")
+    tmp.write_text("\n".join(lines), encoding="utf-8")
+    tmp.replace(out)
+    type_ids.cache_clear()
+    qualifier_ids.cache_clear()
+    return out
+
+
+# --- Búsquedas -----------------------------------------------------------------------
+@lru_cache(maxsize=None)
+def type_ids():
+    """{nombre normalizado: typeId} (nombres Opta + alias WhoScored)."""
+    from .opta_codigos import TYPE_NAMES
+    out = {norm_name(n): i for i, n in TYPE_NAMES.items()}
+    out.update(WHOSCORED_TYPE_ALIASES)
+    return out
+
+
+@lru_cache(maxsize=None)
+def qualifier_ids():
+    """{nombre normalizado: qualifierId} (nombres Opta + alias de columnas qNone_*)."""
+    from .opta_codigos import QUALIFIER_NAMES
+    out = {norm_name(n): i for i, n in QUALIFIER_NAMES.items()}
+    out.update(WHOSCORED_QUALIFIER_ALIASES)
+    return out
+
+
+def type_id(name):
+    """typeId Opta de un nombre de tipo (Opta o WhoScored), o None."""
+    return type_ids().get(norm_name(name))
+
+
+def type_codes(*names):
+    """frozenset de typeIds para filtrar con isin (falla si algún nombre no existe)."""
+    out = set()
+    for n in names:
+        i = type_id(n)
+        if i is None:
+            raise KeyError(f"Tipo Opta desconocido: {n}")
+        out.add(i)
+    return frozenset(out)
+
+
+def qualifier_id(name):
+    """qualifierId Opta de un qualifier ("Key pass", "qNone_RightFoot"...), o None."""
+    name = str(name)
+    if name.startswith("qNone_"):
+        name = name[len("qNone_"):]
+    return qualifier_ids().get(norm_name(name))
+
+
+def type_id_lut(categories):
+    """typeIds (int16, NO_TYPE si no se conoce) para una lista de nombres de tipo."""
+    import numpy as np
+    ids = type_ids()
+    return np.array([ids.get(norm_name(c), NO_TYPE) for c in categories], dtype=np.int16)
+
+
+if __name__ == "__main__":
+    print(f"Escrito {compile_codes()}")
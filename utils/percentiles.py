@@ -0,0 +1,321 @@
+# utils/percentiles.py
+"""
+Percentiles de las métricas de tarjeta por (competición, grupo de posición,
+métrica, ventana), para que las barras de la tarjeta digan "mejor que el X %
+de los extremos de LaLiga" en vez del porcentaje de acierto en bruto.
+
+Se calcula sobre la tabla de métricas (utils.metricas) y se guarda en
+<data_dir>/_cache/percentiles.npz: por cada clave, los valores de la
+población ordenados (float32, todos seguidos en un solo array con sus
+offsets) y, por jugador, su competición, su grupo y sus valores en cada
+ventana. Solo se rehace si cambia algún partido de la carpeta o
+master_partidos, de donde sale la competición de cada partido (un partido
+sin competición es un error: no se mezclan ligas).
+
+    tabla = build_percentile_table("data/matches")
+    tabla.card(408449)                            # {"pases_pct": 63.0, "reg_pct": 88.5, ...}
+    tabla.percentile_of(82.0, "laliga", "extremos", "pases_pct")
+
+    # Las mismas jornadas que los números de la tarjeta
+    w = window_name([1, 2])                       # "jornadas_1_2"
+    tabla = build_percentile_table("data/matches", windows={w: [1, 2]})
+    tabla.card(408449, w)
+
+Cada consulta es un np.searchsorted sobre el array de su clave (O(log n)):
+la tarjeta no vuelve a leer ningún CSV.
+"""
+from pathlib import Path
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .almacen_eventos import competition_for_match, match_competition_map
+from .indice_partidos import CACHE_DIRNAME
+from .lectura_csv import read_whoscored_csv
+from .metricas import build_metrics_table
+from .similares import features_files, main_positions, position_group
+
+PCT_FILENAME = "percentiles.npz"
+PCT_VERSION = 3
+MIN_MINUTES = 90    # minutos en la ventana para entrar en la población
+
+# Métrica -> (numerador, denominador, escala): pct = 100·ok/intentos, por 90 = 90·n/minutos
+METRICS = {
+    "pases_pct":      ("pases_ok", "pases_total", 100),
+    "tiros_OT_pct":   ("tiros_OT", "tiros", 100),
+    "reg_pct":        ("reg_ok", "reg_int", 100),
+    "goles_90":       ("goles", "minutos", 90),
+    "tiros_90":       ("tiros", "minutos", 90),
+    "pases_clave_90": ("pases_clave", "minutos", 90),
+    "centros_90":     ("centros", "minutos", 90),
+    "asist_90":       ("asist", "minutos", 90),
+}
+# Intentos mínimos para que un porcentaje entre en la población (2 de 2 no es un 100 %)
+MIN_ATTEMPTS = {"pases_pct": 20, "tiros_OT_pct": 3, "reg_pct": 3}
+
+# Ventana -> None (temporada entera), N (últimas N jornadas de la carpeta)
+# o lista de jornadas; build_percentile_table(windows=...) añade más
+WINDOWS = {"temporada": None, "ultimas_5": 5}
+DEFAULT_WINDOW = "temporada"
+
+OTHER_GROUP = "otros"   # jugadores sin grupo de posición (solo "Sub", códigos raros...)
+
+
+# --- Valores por jugador -------------------------------------------------------------
+def window_name(jornadas=None):
+    """Nombre de la ventana de esas jornadas ("temporada" si es None)."""
+    if jornadas is None:
+        return DEFAULT_WINDOW
+    return "jornadas_" + "_".join(str(int(j)) for j in sorted(jornadas))
+
+
+def _window_jornadas(jornadas, spec):
+    if spec is None:
+        return None
+    if isinstance(spec, int):
+        js = sorted({int(j) for j in jornadas if pd.notna(j)})
+        return js[-spec:]
+    return sorted(int(j) for j in spec)
+
+
+def metric_values(profiles):
+    """
+    Métricas de METRICS (columnas) desde MetricsTable.profiles; NaN si el
+    denominador es 0 o falta.
+    """
+    out = pd.DataFrame(index=profiles.index)
+    for name, (num, den, scale) in METRICS.items():
+        n = profiles[num].to_numpy(dtype=np.float64)
+        d = profiles[den].to_numpy(dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[name] = np.where(d > 0, scale * n / d, np.nan)
+    return out
+
+
+def _in_population(profiles, min_minutes):
+    """Máscara (jugadores × métricas): quién cuenta para la población de cada métrica."""
+    ok = (profiles["minutos"].fillna(0) >= min_minutes).to_numpy()
+    m = np.repeat(ok[:, None], len(METRICS), axis=1)
+    for j, name in enumerate(METRICS):
+        den = METRICS[name][1]
+        if name in MIN_ATTEMPTS:
+            m[:, j] &= (profiles[den].fillna(0) >= MIN_ATTEMPTS[name]).to_numpy()
+    return m
+
+
+def _player_groups(data_dir, player_ids):
+    files = features_files(data_dir)
+    rows = [read_whoscored_csv(f, ["playerId", "position", "minutes"]) for f in files]
+    rows = [r.dropna(subset=["playerId"]) for r in rows if len(r)]
+    main = main_positions(pd.concat(rows, ignore_index=True)) if rows else pd.Series(dtype=object)
+    pos = main.reindex(player_ids)
+    return np.array([position_group(p) or OTHER_GROUP for p in pos], dtype=object)
+
+
+def _player_competitions(df, competitions):
+    # Competición de cada jugador: la de más minutos (por si cambia de liga a mitad)
+    comp = df["match"].astype(str).map(lambda k: competition_for_match(k, competitions))
+    missing = sorted(set(df["match"].astype(str)[comp.isna()]))
+    if missing:
+        raise ValueError(f"Partidos sin competición en master_partidos (columnas partido/"
+                         f"competicion): {', '.join(missing)}")
+    mins = df.assign(competicion=comp.to_numpy()) \
+        .groupby(["playerId", "competicion"], observed=True)["minutos"].sum().reset_index()
+    return mins.sort_values(["playerId", "minutos"], ascending=[True, False], kind="stable") \
+        .drop_duplicates("playerId").set_index("playerId")["competicion"]
+
+
+# --- Tabla -------------------------------------------------------------------------
+class PercentileTable:
+    """
+    Poblaciones ordenadas por clave (competición, grupo, métrica, ventana):
+    values[offsets[i]:offsets[i + 1]] es la de keys[i]. Por jugador:
+    player_ids (n,) ordenados, competitions / groups (n,) y
+    player_values (ventanas, n, métricas) float32.
+    """
+
+    def __init__(self, keys, offsets, values, player_ids, competitions, groups,
+                 player_values, metrics=tuple(METRICS), windows=tuple(WINDOWS)):
+        self.keys = [tuple(k) for k in keys]
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.values = np.asarray(values, dtype=np.float32)
+        self.player_ids = np.asarray(player_ids, dtype=np.int64)
+        self.competitions = np.asarray(competitions, dtype=object)
+        self.groups = np.asarray(groups, dtype=object)
+        self.player_values = np.asarray(player_values, dtype=np.float32)
+        self.metrics = list(metrics)
+        self.windows = list(windows)
+        self._key = {k: i for i, k in enumerate(self.keys)}
+        self._stamps = None
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __repr__(self):
+        return (f"PercentileTable(keys={len(self.keys)}, players={len(self.player_ids)}, "
+                f"values={len(self.values)})")
+
+    @classmethod
+    def from_metrics(cls, table, groups_of, competitions, *, min_minutes=MIN_MINUTES,
+                     windows=WINDOWS):
+        """
+        Desde una MetricsTable. groups_of(player_ids) -> grupo de cada jugador
+        (array); competitions: {match_key: competición} de todos los partidos
+        (ValueError si falta alguno); windows: {nombre: ventana} (ver WINDOWS).
+        """
+        df = table.df
+        player_ids = np.sort(df["playerId"].unique().astype(np.int64))
+        comp = _player_competitions(df, competitions).reindex(player_ids).to_numpy(dtype=object)
+        groups = np.asarray(groups_of(player_ids), dtype=object)
+
+        pv = np.full((len(windows), len(player_ids), len(METRICS)), np.nan, dtype=np.float32)
+        pools = {}
+        for w, (window, spec) in enumerate(windows.items()):
+            prof = table.profiles(jornadas=_window_jornadas(df["jornada"], spec))
+            prof = prof.reindex(player_ids)
+            vals = metric_values(prof).to_numpy(dtype=np.float64)
+            pv[w] = vals
+            inpop = _in_population(prof, min_minutes) & ~np.isnan(vals)
+            for j, metric in enumerate(METRICS):
+                col = inpop[:, j]
+                for c, g in {(c, g) for c, g in zip(comp[col], groups[col])}:
+                    sel = col & (comp == c) & (groups == g)
+                    pools[(c, g, metric, window)] = np.sort(vals[sel, j])
+
+        keys = sorted(pools)
+        sizes = [len(pools[k]) for k in keys]
+        offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+        values = np.concatenate([pools[k] for k in keys]) if keys else np.empty(0)
+        return cls(keys, offsets, values, player_ids, comp, groups, pv, windows=list(windows))
+
+    # --- consultas ---------------------------------------------------------------
+    def population(self, competition, group, metric, window=DEFAULT_WINDOW):
+        """Valores ordenados de la población de esa clave (array vacío si no hay)."""
+        i = self._key.get((competition, group, metric, window))
+        if i is None:
+            return self.values[:0]
+        return self.values[self.offsets[i]:self.offsets[i + 1]]
+
+    def percentile_of(self, value, competition, group, metric, window=DEFAULT_WINDOW):
+        """
+        Percentil (0-100) de value (escalar o array) en la población: % de
+        valores por debajo, contando los empates a medias. NaN si no hay
+        población o value es NaN.
+        """
+        pop = self.population(competition, group, metric, window)
+        v = np.asarray(value, dtype=np.float32)
+        if len(pop) == 0:
+            out = np.full(v.shape, np.nan)
+        else:
+            lo = np.searchsorted(pop, v, side="left")
+            hi = np.searchsorted(pop, v, side="right")
+            out = np.where(np.isnan(v), np.nan, 100.0 * (lo + hi) / (2 * len(pop)))
+        return float(out) if out.ndim == 0 else out
+
+    def player(self, player_id):
+        """(competición, grupo) del jugador, o None si no está en la tabla."""
+        i = self._row(player_id)
+        return None if i is None else (self.competitions[i], self.groups[i])
+
+    def _row(self, player_id):
+        pid = int(float(player_id))
+        i = int(np.searchsorted(self.player_ids, pid))
+        return i if i < len(self.player_ids) and self.player_ids[i] == pid else None
+
+    def player_metrics(self, player_id, window=DEFAULT_WINDOW):
+        """{métrica: valor} del jugador en la ventana (NaN si no aplica)."""
+        i = self._row(player_id)
+        w = self.windows.index(window)
+        vals = self.player_values[w, i] if i is not None else np.full(len(self.metrics), np.nan)
+        return {m: float(v) for m, v in zip(self.metrics, vals)}
+
+    def card(self, player_id, window=DEFAULT_WINDOW, metrics=None):
+        """
+        {métrica: percentil} del jugador frente a los de su competición y
+        grupo de posición en la ventana (NaN si no jugó o no hay población).
+        """
+        i = self._row(player_id)
+        w = self.windows.index(window)
+        out = {}
+        for m in metrics or self.metrics:
+            if i is None:
+                out[m] = np.nan
+                continue
+            v = self.player_values[w, i, self.metrics.index(m)]
+            out[m] = self.percentile_of(v, self.competitions[i], self.groups[i], m, window)
+        return out
+
+    # --- disco ----------------------------------------------------------------------
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.stem + ".tmp.npz")
+        np.savez(tmp, offsets=self.offsets, values=self.values, player_ids=self.player_ids,
+                 competitions=self.competitions.astype(str), groups=self.groups.astype(str),
+                 player_values=self.player_values,
+                 meta=np.array(json.dumps({"version": PCT_VERSION, "stamps": self._stamps,
+                                           "keys": self.keys, "metrics": self.metrics,
+                                           "windows": self.windows})))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as z:
+            meta = json.loads(str(z["meta"]))
+            if meta.get("version") != PCT_VERSION:
+                raise ValueError("Versión de tabla distinta")
+            t = cls(meta["keys"], z["offsets"], z["values"], z["player_ids"],
+                    z["competitions"], z["groups"], z["player_values"],
+                    metrics=meta["metrics"], windows=meta["windows"])
+        t._stamps = meta.get("stamps")
+        return t
+
+
+def table_path(data_dir):
+    return Path(data_dir) / CACHE_DIRNAME / PCT_FILENAME
+
+
+_PCT_TABLES = {}
+
+
+def build_percentile_table(data_dir, *, min_minutes=MIN_MINUTES, competitions=None,
+                           masters_dir=None, windows=None, save=True):
+    """
+    PercentileTable de data_dir. Se reutiliza la de memoria o la de
+    _cache/percentiles.npz si no han cambiado la tabla de métricas (mismos
+    partidos con el mismo mtime/tamaño) ni las competiciones.
+    - competitions: {match_key: competición} por encima de master_partidos
+      (masters_dir, por defecto data_dir/../masters). ValueError si algún
+      partido se queda sin competición.
+    - windows: ventanas extra además de WINDOWS, p. ej. {window_name(js): js}.
+    """
+    data_dir = Path(data_dir).resolve()
+    metrics = build_metrics_table(data_dir, save=save)
+    comps = match_competition_map(data_dir, competitions, masters_dir)
+    windows = {**WINDOWS, **(windows or {})}
+    stamps = json.loads(json.dumps({"min_minutes": min_minutes, "metrics": list(METRICS),
+                                    "windows": windows, "matches": metrics._stamps,
+                                    "competitions": {k: comps.get(k) for k in metrics._stamps}}))
+
+    cached = _PCT_TABLES.get(data_dir)
+    if cached is not None and cached._stamps == stamps:
+        return cached
+    path = table_path(data_dir)
+    if path.exists():
+        try:
+            t = PercentileTable.load(path)
+            if t._stamps == stamps:
+                _PCT_TABLES[data_dir] = t
+                return t
+        except (OSError, ValueError, KeyError):
+            pass
+
+    t = PercentileTable.from_metrics(metrics, lambda ids: _player_groups(data_dir, ids), comps,
+                                     min_minutes=min_minutes, windows=windows)
+    t._stamps = stamps
+    _PCT_TABLES[data_dir] = t
+    if save:
+        t.save(path)
+    return t
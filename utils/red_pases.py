@@ -0,0 +1,513 @@
+# utils/red_pases.py
+"""
+Modelo de la red de pases de un equipo en un partido, separado del dibujo.
+
+build_pass_network() hace todo el cálculo (equipo, receptores, aristas y
+posiciones medias) sobre el EventsFrame de utils.eventos y devuelve un
+PassNetwork con nodos y aristas como arrays NumPy. El mismo objeto se puede pintar varias veces con
+distinto jugador destacado (ver visualizaciones_ext.draw_pass_network) y se
+puede guardar/cargar en .npz.
+
+PassNetworkAccumulator acumula la red de un equipo partido a partido
+(temporada o ventana de N jornadas) con memoria acotada.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .eventos import normalize_events
+from .opta import type_ids
+from .trazas import span, traced
+
+# typeIds Opta de pase: todos los tipos cuyo nombre contiene "pass" (Pass,
+# Offside Pass...), el mismo criterio que antes se hacía con el texto
+PASS_TYPES = frozenset(i for name, i in type_ids().items() if "pass" in name)
+
+# --- Receptor de pases sin relatedPlayerId (heurística en bloque) --------------
+def _infer_receivers(passes, same_team, *, tol_time=10.0, tol_dist=12.0):
+    """
+    Deduce el receptor de los pases con receiver vacío, todos a la vez.
+    same_team: eventos del equipo ya ordenados por "t" (índice 0..n-1).
+    Reglas (las mismas que el bucle original, pase a pase):
+      - candidatos: eventos con t0 < t <= t0 + tol_time de otro jugador
+      - se elige el primero cuyo (x, y) esté a <= tol_dist del final del pase
+      - si ninguno está cerca, el primero de la ventana temporal
+    Devuelve una Series (índice de passes) solo con los pases resueltos.
+    """
+    miss = passes[passes["receiver"].isna() & passes["endX"].notna() & passes["endY"].notna()]
+    if miss.empty or same_team.empty:
+        return pd.Series(dtype="Int64")
+
+    # Ventana temporal de cada pase como rango [lo, hi) sobre same_team
+    T  = same_team["t"].to_numpy(dtype=float)
+    t0 = miss["t"].to_numpy(dtype=float)
+    lo = np.searchsorted(T, t0, side="right")
+    hi = np.searchsorted(T, t0 + tol_time, side="right")
+    n  = np.maximum(hi - lo, 0)
+    if n.sum() == 0:
+        return pd.Series(dtype="Int64")
+
+    # Pares (pase, candidato) aplanados; dentro de cada pase en orden temporal
+    grp = np.repeat(np.arange(len(miss)), n)
+    first = np.repeat(np.cumsum(n) - n, n)
+    pos = np.repeat(lo, n) + (np.arange(grp.size) - first)
+
+    cand_pid = same_team["pid"].astype("Int64")
+    cand_ok  = cand_pid.notna().to_numpy()[pos]
+    cand_val = cand_pid.fillna(-1).to_numpy(dtype=np.int64)[pos]
+    pass_pid = miss["pid"].astype("Int64")
+    pass_ok  = pass_pid.notna().to_numpy()[grp]
+    pass_val = pass_pid.fillna(-1).to_numpy(dtype=np.int64)[grp]
+    valid = cand_ok & pass_ok & (cand_val != pass_val)
+
+    xe = miss["endX"].to_numpy(dtype=float)[grp]
+    ye = miss["endY"].to_numpy(dtype=float)[grp]
+    cx = same_team["x"].to_numpy(dtype=float)[pos]
+    cy = same_team["y"].to_numpy(dtype=float)[pos]
+    near = valid & (np.hypot(cx - xe, cy - ye) <= tol_dist)
+
+    # Primer candidato por pase: np.unique devuelve la primera aparición
+    g_any, i_any = np.unique(grp[valid], return_index=True)
+    g_near, i_near = np.unique(grp[near], return_index=True)
+    pick = np.full(len(miss), -1, dtype=np.int64)
+    pick[g_any] = cand_val[valid][i_any]      # fallback: primero de la ventana
+    pick[g_near] = cand_val[near][i_near]     # preferente: primero cercano
+
+    solved = pick >= 0
+    return pd.Series(pick[solved], index=miss.index[solved], dtype="Int64")
+
+
+# --- Modelo --------------------------------------------------------------------
+@dataclass
+class PassNetwork:
+    """
+    Red de pases (no dirigida) de un equipo.
+    Nodos (ordenados por playerId): ids, posición mediana (x, y), pases
+    recibidos, titular, nombre y dorsal ("" si no hay).
+    Aristas: (a, b, count) con a < b.
+    """
+    team_id: int
+    node_ids: np.ndarray
+    node_x: np.ndarray
+    node_y: np.ndarray
+    node_received: np.ndarray
+    node_starter: np.ndarray
+    node_names: np.ndarray
+    node_shirts: np.ndarray
+    edge_a: np.ndarray
+    edge_b: np.ndarray
+    edge_count: np.ndarray
+
+    @property
+    def n_nodes(self):
+        return len(self.node_ids)
+
+    @property
+    def n_edges(self):
+        return len(self.edge_a)
+
+    def edge_mask(self, *, min_edge_count=1, player_id=None):
+        """Máscara de aristas con count >= min_edge_count (y del jugador si se pasa)."""
+        m = self.edge_count >= min_edge_count
+        if player_id is not None:
+            m &= (self.edge_a == player_id) | (self.edge_b == player_id)
+        return m
+
+    # --- Serialización -----------------------------------------------------------
+    def to_npz(self, path):
+        np.savez_compressed(
+            path,
+            team_id=np.int64(self.team_id),
+            **{f: getattr(self, f) for f in _ARRAY_FIELDS},
+        )
+
+    @classmethod
+    def from_npz(cls, path):
+        with np.load(path, allow_pickle=False) as z:
+            return cls(team_id=int(z["team_id"]), **{f: z[f] for f in _ARRAY_FIELDS})
+
+
+_ARRAY_FIELDS = (
+    "node_ids", "node_x", "node_y", "node_received", "node_starter",
+    "node_names", "node_shirts", "edge_a", "edge_b", "edge_count",
+)
+
+
+# --- Construcción --------------------------------------------------------------
+def _to_num(s):
+    return pd.to_numeric(s, errors="coerce")
+
+
+def _resolve_team(d, df_players, player_id):
+    # 1) moda del teamId del jugador en eventos; 2) lg_jugadores; 3) moda global
+    team_id = None
+    if player_id is not None:
+        cand = d.loc[d["pid"] == player_id, "tid"].dropna()
+        if not cand.empty:
+            team_id = int(cand.mode().iloc[0])
+        elif df_players is not None and "teamId" in df_players.columns and "playerId" in df_players.columns:
+            c2 = _to_num(df_players.loc[_to_num(df_players["playerId"]) == player_id, "teamId"]).dropna()
+            if not c2.empty:
+                team_id = int(c2.iloc[0])
+    if team_id is None:
+        all_t = d["tid"].dropna()
+        team_id = int(all_t.mode().iloc[0]) if not all_t.empty else None
+    return team_id
+
+
+def _team_passes(d, team_id, *, tol_time=10.0, tol_dist=12.0):
+    """
+    Pases exitosos del equipo con la columna "receiver" (Int64) ya resuelta
+    (relatedPlayerId o heurística). None si no hay pases.
+    """
+    # --- Filtro: solo pases exitosos del equipo --------------------------------
+    with span("red_pases.filtro") as s:
+        type_pass = np.isin(d["type_id"].to_numpy(), list(PASS_TYPES))
+        out_ok = d["outc"].isin(
+            {"successful", "success", "succesful", "successfull"}  # tolerante a typos
+        )
+        passes = d[type_pass & out_ok & (d["tid"] == team_id)].copy()
+        s.set(rows=len(passes))
+    if passes.empty:
+        return None
+
+    # --- Receptor: usar relatedPlayerId + pequeña heurística -------------------
+    with span("red_pases.receptores", rows=len(passes)):
+        passes["receiver"] = passes["rel"]
+
+        # "t" (segundos) ya viene en el EventsFrame
+        same_team = d.loc[d["tid"] == team_id, ["pid", "x", "y", "t"]]
+        same_team = same_team.sort_values("t").reset_index(drop=True)
+
+        inferred = _infer_receivers(passes, same_team, tol_time=tol_time, tol_dist=tol_dist)
+        passes.loc[inferred.index, "receiver"] = inferred
+
+        passes = passes.dropna(subset=["receiver"]).copy()
+        passes["receiver"] = passes["receiver"].astype("Int64")
+    return passes
+
+
+def _undirected_edges(passes):
+    # (a, b, count) con a < b: se suman los pases en los dos sentidos
+    with span("red_pases.aristas", rows=len(passes)) as s:
+        edges = passes.groupby(["pid","receiver"]).size().reset_index(name="count")
+        edges["a"] = edges[["pid","receiver"]].min(axis=1)
+        edges["b"] = edges[["pid","receiver"]].max(axis=1)
+        edges_u = edges.groupby(["a","b"])["count"].sum().reset_index()
+        s.set(edges=len(edges_u))
+    return edges_u
+
+
+def _positions(passes):
+    # Puntos de cada jugador: inicio de sus pases + final de los que recibe
+    pos_start = passes[["pid","x","y"]].rename(columns={"pid":"playerId","x":"px","y":"py"})
+    pos_end   = passes[["receiver","endX","endY"]].rename(columns={"receiver":"playerId","endX":"px","endY":"py"})
+    return pd.concat([pos_start, pos_end], ignore_index=True).dropna(subset=["playerId","px","py"])
+
+
+def _player_info(df_players):
+    # {playerId: nombre}, {playerId: dorsal}, {playerId: titular} de lg_jugadores
+    name_map, shirt_map, starter_map = {}, {}, {}
+    if df_players is not None and not df_players.empty:
+        dfp = df_players.copy()
+        dfp["playerId"] = _to_num(dfp["playerId"]).astype("Int64")
+        if "name" in dfp.columns:
+            name_map = dfp.set_index("playerId")["name"].to_dict()
+        if "shirtNo" in dfp.columns:
+            shirt_map = dfp.set_index("playerId")["shirtNo"].to_dict()
+        if "isFirstEleven" in dfp.columns:
+            starter_map = dfp.set_index("playerId")["isFirstEleven"].to_dict()
+    return name_map, shirt_map, starter_map
+
+
+def _labels(ids, name_map, shirt_map):
+    names, shirts = [], []
+    for p in ids:
+        p = int(p)
+        names.append(str(name_map.get(p, str(p))))
+        sh = shirt_map.get(p, None)
+        missing = sh is None or (isinstance(sh, float) and np.isnan(sh))
+        shirts.append("" if missing else str(sh))
+    return names, shirts
+
+
+@traced(rows="df_events")
+def build_pass_network(df_events, df_players=None, *, player_id=None, team_id=None,
+                       tol_time=10.0, tol_dist=12.0):
+    """
+    Calcula la red de pases del equipo (team_id o, si no se pasa, el del
+    jugador player_id). Devuelve PassNetwork o None si no hay pases.
+    - df_events: lg_eventos crudo o EventsFrame ya normalizado.
+    - tol_time / tol_dist: ventana (s) y radio (0-100) para deducir receptores.
+    """
+    if df_events is None or len(df_events) == 0:
+        return None
+
+    d = normalize_events(df_events).df
+
+    if team_id is None:
+        pid = None
+        if player_id is not None:
+            try:
+                pid = int(float(player_id))
+            except Exception:
+                return None
+        team_id = _resolve_team(d, df_players, pid)
+    if team_id is None:
+        return None
+
+    passes = _team_passes(d, team_id, tol_time=tol_time, tol_dist=tol_dist)
+    if passes is None:
+        return None
+
+    # --- Aristas (pares no dirigidos) -----------------------------------------
+    edges_u = _undirected_edges(passes)
+
+    # --- Posiciones medias: inicio pasador + fin receptor ----------------------
+    pos_all = _positions(passes)
+    avg_pos = pos_all.groupby("playerId").agg(x=("px","median"), y=("py","median")).reset_index()
+
+    # Conteo de pases recibidos → tamaño del nodo
+    recv = passes["receiver"].value_counts().rename_axis("playerId").reset_index(name="received")
+    avg_pos = avg_pos.merge(recv, on="playerId", how="left").fillna({"received":0})
+
+    # --- Info de jugadores: nombre, dorsal, titular ----------------------------
+    name_map, shirt_map, starter_map = _player_info(df_players)
+
+    ids = avg_pos["playerId"].astype("int64").to_numpy()
+    names, shirts = _labels(ids, name_map, shirt_map)
+
+    return PassNetwork(
+        team_id=int(team_id),
+        node_ids=ids,
+        node_x=avg_pos["x"].to_numpy(dtype=float),
+        node_y=avg_pos["y"].to_numpy(dtype=float),
+        node_received=avg_pos["received"].to_numpy(dtype=np.int64),
+        # mismo criterio de siempre: bool(valor) y titular si no consta
+        node_starter=np.array([bool(starter_map.get(int(p), True)) for p in ids], dtype=bool),
+        node_names=np.array(names, dtype=str),
+        node_shirts=np.array(shirts, dtype=str),
+        edge_a=edges_u["a"].astype("int64").to_numpy(),
+        edge_b=edges_u["b"].astype("int64").to_numpy(),
+        edge_count=edges_u["count"].astype("int64").to_numpy(),
+    )
+
+
+# --- Acumulado de temporada (streaming, memoria acotada) -----------------------
+class PassNetworkAccumulator:
+    """
+    Red de pases de un equipo acumulada partido a partido.
+
+    No guarda eventos: por jugador lleva un histograma de sus posiciones en x
+    y otro en y (bins de bin_size sobre el campo Opta 0-100), los pases
+    recibidos, partidos jugados y titularidades; por pareja, el número de
+    pases. La mediana de cada eje se saca del histograma (error <= bin_size/2),
+    así que añadir un partido cuesta lo que ese partido y la memoria no
+    depende del número de partidos.
+
+    Con window=N solo cuentan los N últimos partidos añadidos (ventana móvil):
+    se guarda la aportación de esos N y al entrar uno se resta el más antiguo.
+    """
+
+    def __init__(self, team_id, *, window=None, bin_size=0.5, tol_time=10.0, tol_dist=12.0):
+        self.team_id = int(team_id)
+        self.window = window
+        self.bin_size = float(bin_size)
+        self.n_bins = int(np.ceil(100.0 / self.bin_size))
+        self.tol_time = tol_time
+        self.tol_dist = tol_dist
+        self.seen = []                  # todos los match_id añadidos, en orden
+        self._window = OrderedDict()    # match_id -> aportación (solo con window)
+        self._row = {}                  # playerId -> fila de los arrays
+        self._hx = np.zeros((0, self.n_bins), dtype=np.int64)
+        self._hy = np.zeros((0, self.n_bins), dtype=np.int64)
+        self._received = np.zeros(0, dtype=np.int64)
+        self._apps = np.zeros(0, dtype=np.int64)
+        self._starts = np.zeros(0, dtype=np.int64)
+        self._edges = {}                # (a, b) -> pases
+        self._names = {}
+        self._shirts = {}
+
+    def __len__(self):
+        # partidos que cuentan ahora mismo
+        return len(self._window) if self.window else len(self.seen)
+
+    def __repr__(self):
+        return (f"PassNetworkAccumulator(team_id={self.team_id}, matches={len(self)}, "
+                f"players={len(self._row)}, edges={len(self._edges)})")
+
+    @property
+    def match_ids(self):
+        return list(self._window) if self.window else list(self.seen)
+
+    def copy(self):
+        """Copia independiente (se puede seguir añadiendo partidos a las dos)."""
+        new = object.__new__(type(self))
+        new.__dict__.update(self.__dict__)
+        # las aportaciones de la ventana no se modifican: basta copiar el dict
+        new.seen, new._window = list(self.seen), OrderedDict(self._window)
+        new._row, new._edges = dict(self._row), dict(self._edges)
+        new._names, new._shirts = dict(self._names), dict(self._shirts)
+        for name in ("_hx", "_hy", "_received", "_apps", "_starts"):
+            setattr(new, name, getattr(self, name).copy())
+        return new
+
+    def _rows_for(self, pids):
+        new = [p for p in pids if p not in self._row]
+        if new:
+            for p in new:
+                self._row[p] = len(self._row)
+            k = len(new)
+            self._hx = np.vstack([self._hx, np.zeros((k, self.n_bins), dtype=np.int64)])
+            self._hy = np.vstack([self._hy, np.zeros((k, self.n_bins), dtype=np.int64)])
+            for name in ("_received", "_apps", "_starts"):
+                setattr(self, name, np.concatenate([getattr(self, name), np.zeros(k, dtype=np.int64)]))
+        return np.array([self._row[p] for p in pids], dtype=np.int64)
+
+    def _bin(self, v):
+        return np.clip((v / self.bin_size).astype(np.int64), 0, self.n_bins - 1)
+
+    def _contribution(self, d, df_players):
+        # Aportación de un partido: arrays pequeños (jugadores × bins, aristas)
+        passes = _team_passes(d, self.team_id, tol_time=self.tol_time, tol_dist=self.tol_dist)
+        if passes is None:
+            return None
+        pos = _positions(passes)
+        pids, inv = np.unique(pos["playerId"].astype("int64").to_numpy(), return_inverse=True)
+        hx = np.zeros((len(pids), self.n_bins), dtype=np.int64)
+        hy = np.zeros((len(pids), self.n_bins), dtype=np.int64)
+        np.add.at(hx, (inv, self._bin(pos["px"].to_numpy(dtype=float))), 1)
+        np.add.at(hy, (inv, self._bin(pos["py"].to_numpy(dtype=float))), 1)
+
+        recv = passes["receiver"].value_counts()
+        received = np.array([int(recv.get(p, 0)) for p in pids], dtype=np.int64)
+
+        name_map, shirt_map, starter_map = _player_info(df_players)
+        names, shirts = _labels(pids, name_map, shirt_map)
+        starter = np.array([bool(starter_map.get(int(p), True)) for p in pids], dtype=np.int64)
+
+        edges_u = _undirected_edges(passes)
+        return {
+            "pids": pids, "hx": hx, "hy": hy, "received": received, "starter": starter,
+            "names": dict(zip(pids.tolist(), names)), "shirts": dict(zip(pids.tolist(), shirts)),
+            "edges": dict(zip(zip(edges_u["a"].astype("int64").tolist(),
+                                  edges_u["b"].astype("int64").tolist()),
+                              edges_u["count"].astype("int64").tolist())),
+        }
+
+    def _apply(self, c, sign):
+        rows = self._rows_for(c["pids"].tolist())
+        self._hx[rows] += sign * c["hx"]
+        self._hy[rows] += sign * c["hy"]
+        self._received[rows] += sign * c["received"]
+        self._apps[rows] += sign
+        self._starts[rows] += sign * c["starter"]
+        for k, n in c["edges"].items():
+            v = self._edges.get(k, 0) + sign * n
+            if v > 0:
+                self._edges[k] = v
+            else:
+                self._edges.pop(k, None)
+        if sign > 0:
+            # nombre/dorsal: el del partido más reciente
+            self._names.update(c["names"])
+            self._shirts.update(c["shirts"])
+
+    def add_match(self, df_events, df_players=None, *, match_id=None):
+        """
+        Añade un partido (lg_eventos crudo o EventsFrame). Devuelve False si
+        match_id ya estaba; un partido sin pases del equipo cuenta igual
+        (ocupa su sitio en la ventana) pero no aporta nada.
+        """
+        if match_id is None:
+            match_id = getattr(df_events, "match_id", None)
+            if match_id is None:
+                match_id = len(self.seen)
+        if match_id in self.seen:
+            return False
+
+        c = None
+        if df_events is not None and len(df_events):
+            with span("red_pases.acumular", rows=len(df_events)):
+                c = self._contribution(normalize_events(df_events).df, df_players)
+        if c is not None:
+            self._apply(c, +1)
+        self.seen.append(match_id)
+
+        if self.window:
+            self._window[match_id] = c
+            while len(self._window) > self.window:
+                _, old = self._window.popitem(last=False)
+                if old is not None:
+                    self._apply(old, -1)
+        return True
+
+    def _medians(self, h):
+        # Mediana por fila a partir del histograma: media de los dos elementos
+        # centrales (como pandas), cada uno en el centro de su bin
+        total = h.sum(axis=1)
+        cum = np.cumsum(h, axis=1)
+        lo = (cum <= ((total - 1) // 2)[:, None]).sum(axis=1)
+        hi = (cum <= (total // 2)[:, None]).sum(axis=1)
+        return (lo + hi + 1) * self.bin_size / 2.0
+
+    def network(self, *, min_matches=1):
+        """
+        PassNetwork con lo acumulado (se dibuja igual que el de un partido).
+        min_matches: solo jugadores con al menos esos partidos en la red.
+        Titular = titular en al menos la mitad de sus partidos.
+        """
+        if not self._row:
+            return None
+        ids = np.fromiter(self._row, dtype=np.int64, count=len(self._row))
+        rows = np.fromiter(self._row.values(), dtype=np.int64, count=len(self._row))
+        keep = (self._hx[rows].sum(axis=1) > 0) & (self._apps[rows] >= min_matches)
+        ids, rows = ids[keep], rows[keep]
+        if not len(ids):
+            return None
+        order = np.argsort(ids)
+        ids, rows = ids[order], rows[order]
+
+        if self._edges:
+            ab = np.array(sorted(self._edges), dtype=np.int64)
+            ea, eb = ab[:, 0], ab[:, 1]
+            ec = np.array([self._edges[k] for k in sorted(self._edges)], dtype=np.int64)
+        else:
+            ea = eb = ec = np.zeros(0, dtype=np.int64)
+
+        return PassNetwork(
+            team_id=self.team_id,
+            node_ids=ids,
+            node_x=self._medians(self._hx[rows]),
+            node_y=self._medians(self._hy[rows]),
+            node_received=self._received[rows].copy(),
+            node_starter=self._starts[rows] * 2 >= self._apps[rows],
+            node_names=np.array([self._names.get(int(p), str(p)) for p in ids], dtype=str),
+            node_shirts=np.array([self._shirts.get(int(p), "") for p in ids], dtype=str),
+            edge_a=ea, edge_b=eb, edge_count=ec,
+        )
+
+
+# --- Caché en memoria (por partido y equipo) -----------------------------------
+NETWORK_CACHE_SIZE = 64
+_NETWORK_CACHE = OrderedDict()
+
+
+def get_cached_network(key):
+    net = _NETWORK_CACHE.get(key)
+    if net is not None:
+        _NETWORK_CACHE.move_to_end(key)
+    return net
+
+
+def put_cached_network(key, network):
+    _NETWORK_CACHE[key] = network
+    _NETWORK_CACHE.move_to_end(key)
+    while len(_NETWORK_CACHE) > NETWORK_CACHE_SIZE:
+        _NETWORK_CACHE.popitem(last=False)
+
+
+def clear_network_cache():
+    _NETWORK_CACHE.clear()
@@ -0,0 +1,347 @@
+# utils/similares.py
+"""
+Búsqueda de jugadores comparables (k vecinos más cercanos) sobre los s_* de
+los *_features_jugadores.csv.
+
+Por jugador se juntan todos sus partidos de la carpeta de datos: los s_* de
+conteo se pasan a "por 90 minutos" (suma / minutos · 90) y los de porcentaje
+(s_passSuccess...) se promedian ponderados por minutos. La matriz se
+estandariza (z-score por feature sobre los jugadores con min_minutes) y se
+guarda en <data_dir>/_cache/similares.npz; solo se rehace si cambia algún
+features CSV.
+
+    idx = build_similarity_index("data/matches")
+    idx.query(408449, k=5)                 # DataFrame con los 5 más parecidos
+    idx.player_list(408449, k=2)           # [408449, id1, id2] para el dashboard
+
+Las consultas son productos de matrices con NumPy (distancia euclídea vía
+|a|² + |b|² - 2·a·b con las normas precalculadas): miles de jugadores se
+resuelven en milisegundos. En el manifiesto de utils.dashboard_batch,
+"players": {"similar_to": 408449, "k": 2} se expande con player_list.
+"""
+from pathlib import Path
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .indice_partidos import CACHE_DIRNAME, _stamp, discover_match_files, match_key_from_path
+from .lectura_csv import read_whoscored_csv
+
+INDEX_FILENAME = "similares.npz"
+INDEX_VERSION = 2
+MIN_MINUTES = 90
+
+_FEATURES_SUFFIX = "_features_jugadores.csv"
+
+# s_* de conteo (se pasan a por 90) y de porcentaje (media ponderada por minutos)
+COUNT_FEATURES = [
+    "s_totalSaves", "s_parriedDanger", "s_claimsHigh", "s_touches", "s_passesTotal",
+    "s_passesAccurate", "s_clearances", "s_passesKey", "s_cornersTotal", "s_throwInsTotal",
+    "s_throwInsAccurate", "s_tacklesTotal", "s_tackleUnsuccesful", "s_dribbledPast",
+    "s_dribblesWon", "s_dribblesAttempted", "s_dribblesLost", "s_dispossessed",
+    "s_shotsTotal", "s_shotsBlocked", "s_interceptions", "s_aerialsTotal", "s_aerialsWon",
+    "s_offensiveAerials", "s_foulsCommited", "s_tackleSuccessful", "s_shotsOffTarget",
+    "s_defensiveAerials", "s_cornersAccurate", "s_shotsOnPost", "s_shotsOnTarget",
+    "s_offsidesCaught", "s_errors",
+]
+RATE_FEATURES = [
+    "s_possession", "s_ratings", "s_passSuccess", "s_dribbleSuccess", "s_tackleSuccess",
+    "s_aerialSuccess", "s_throwInAccuracy",
+]
+FEATURES = COUNT_FEATURES + RATE_FEATURES
+
+# Grupos de posición (códigos WhoScored de la columna position)
+POSITION_GROUPS = {
+    "porteros":     {"GK"},
+    "centrales":    {"DC"},
+    "laterales":    {"DR", "DL", "DMR", "DML", "WBR", "WBL"},
+    "mediocentros": {"DMC", "MC"},
+    "interiores":   {"MR", "ML", "AMC"},
+    "extremos":     {"AMR", "AML", "FWR", "FWL"},
+    "delanteros":   {"FW"},
+}
+_GROUP_OF = {code: g for g, codes in POSITION_GROUPS.items() for code in codes}
+NO_POSITION = "Sub"   # WhoScored pone "Sub" a los que salen del banquillo
+
+# Columnas con las que se sabe si el jugador llegó a jugar. Los suplentes que
+# no salen vienen con minutes = duración del partido y todos los s_* vacíos.
+PLAYED_COLUMNS = ["isFirstEleven", "subbedInExpandedMinute"]
+
+
+def position_group(position):
+    """Grupo de un código de posición (None si no está en POSITION_GROUPS)."""
+    return _GROUP_OF.get(str(position))
+
+
+def played_mask(df):
+    """
+    True en las filas de features de jugadores que jugaron: titulares
+    (isFirstEleven) o que entraron (subbedInExpandedMinute). Si el CSV no trae
+    esas columnas, los que tienen s_touches.
+    """
+    if any(c in df.columns for c in PLAYED_COLUMNS):
+        m = np.zeros(len(df), dtype=bool)
+        if "isFirstEleven" in df.columns:
+            m |= (pd.to_numeric(df["isFirstEleven"], errors="coerce").fillna(0) > 0).to_numpy()
+        if "subbedInExpandedMinute" in df.columns:
+            m |= pd.to_numeric(df["subbedInExpandedMinute"], errors="coerce").notna().to_numpy()
+        return m
+    if "s_touches" in df.columns:
+        return pd.to_numeric(df["s_touches"], errors="coerce").notna().to_numpy()
+    return np.ones(len(df), dtype=bool)
+
+
+# --- Agregado por jugador ------------------------------------------------------------
+def _read_features(path):
+    df = read_whoscored_csv(path, ["playerId", "position", "minutes"] + PLAYED_COLUMNS + FEATURES)
+    df["playerId"] = pd.to_numeric(df["playerId"], errors="coerce")
+    df = df[played_mask(df)]     # fuera los suplentes que no salieron
+    df = df.dropna(subset=["playerId"]).drop_duplicates("playerId")
+    for c in FEATURES:
+        if c not in df.columns:
+            df[c] = np.nan
+    return df
+
+
+def player_features(features_files):
+    """
+    Features por jugador (índice playerId) de varios partidos en los que
+    jugó (played_mask): minutos, partidos, position (la más jugada sin contar
+    "Sub") y FEATURES por 90.
+    """
+    rows = [_read_features(p) for p in features_files]
+    rows = [r for r in rows if len(r)]
+    if not rows:
+        return pd.DataFrame(columns=["minutos", "partidos", "position"] + FEATURES)
+    df = pd.concat(rows, ignore_index=True)
+    df["playerId"] = df["playerId"].astype("int64")
+    mins = pd.to_numeric(df["minutes"], errors="coerce").fillna(0).clip(lower=0)
+    df["minutes"] = mins
+
+    counts = df[COUNT_FEATURES].apply(pd.to_numeric, errors="coerce").astype(np.float64)
+    rates = df[RATE_FEATURES].apply(pd.to_numeric, errors="coerce").astype(np.float64)
+    # Porcentajes: media ponderada solo donde hay dato
+    has_rate = rates.notna().to_numpy() * mins.to_numpy()[:, None]
+    block = pd.concat([
+        df[["playerId", "minutes"]],
+        counts.fillna(0),
+        pd.DataFrame(np.nan_to_num(rates.to_numpy()) * has_rate, columns=RATE_FEATURES),
+        pd.DataFrame(has_rate, columns=[f"_w_{c}" for c in RATE_FEATURES]),
+    ], axis=1)
+    g = block.groupby("playerId", sort=True)
+    tot = g.sum()
+
+    out = pd.DataFrame(index=tot.index)
+    out["minutos"] = tot["minutes"]
+    out["partidos"] = g.size()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        per90 = tot[COUNT_FEATURES].to_numpy() / tot["minutes"].to_numpy()[:, None] * 90
+        w = tot[[f"_w_{c}" for c in RATE_FEATURES]].to_numpy()
+        mean_rate = tot[RATE_FEATURES].to_numpy() / w
+    out[COUNT_FEATURES] = np.where(np.isfinite(per90), per90, np.nan)
+    out[RATE_FEATURES] = np.where(np.isfinite(mean_rate), mean_rate, np.nan)
+
+    out["position"] = main_positions(df).reindex(out.index).fillna(NO_POSITION)
+    return out[["minutos", "partidos", "position"] + FEATURES]
+
+
+def main_positions(df):
+    """
+    Posición principal por jugador (Serie indexada por playerId) de filas
+    playerId/position/minutes de varios partidos: la de más minutos sin
+    contar "Sub" (los que solo tienen "Sub" no salen).
+    """
+    pos = pd.DataFrame({"playerId": df["playerId"].astype("int64"),
+                        "position": df["position"].astype(str),
+                        "minutes": pd.to_numeric(df["minutes"], errors="coerce").fillna(0)})
+    named = pos[pos["position"] != NO_POSITION]
+    return named.groupby(["playerId", "position"])["minutes"].sum().reset_index() \
+        .sort_values(["playerId", "minutes"], ascending=[True, False], kind="stable") \
+        .drop_duplicates("playerId").set_index("playerId")["position"]
+
+
+# --- Índice --------------------------------------------------------------------------
+class SimilarityIndex:
+    """
+    Matriz estandarizada de jugadores (todos los que tienen minutos) para
+    consultas k-NN.
+    player_ids (n,), positions (n,), minutes (n,), X (n, f) float32 en
+    z-score (NaN → 0, la media) y norms = |X|² por fila.
+    """
+
+    def __init__(self, player_ids, positions, minutes, X, mean, std, features=FEATURES):
+        self.player_ids = np.asarray(player_ids, dtype=np.int64)
+        self.positions = np.asarray(positions, dtype=object)
+        self.minutes = np.asarray(minutes, dtype=np.float64)
+        self.X = np.ascontiguousarray(X, dtype=np.float32)
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.std = np.asarray(std, dtype=np.float64)
+        self.features = list(features)
+        self.norms = np.einsum("ij,ij->i", self.X, self.X)
+        self._row = {int(p): i for i, p in enumerate(self.player_ids)}
+        self.groups = np.array([position_group(p) for p in self.positions], dtype=object)
+        self._stamps = None
+
+    def __len__(self):
+        return len(self.player_ids)
+
+    def __contains__(self, player_id):
+        try:
+            return int(float(player_id)) in self._row
+        except (TypeError, ValueError):
+            return False
+
+    def __repr__(self):
+        return f"SimilarityIndex(players={len(self)}, features={len(self.features)})"
+
+    @classmethod
+    def from_features(cls, table, *, min_minutes=MIN_MINUTES):
+        """
+        Índice desde player_features: entran todos los jugadores con minutos,
+        pero la media y la desviación salen solo de los que tienen min_minutes
+        (los de pocos minutos tienen por 90 muy ruidosos).
+        """
+        t = table[table["minutos"] > 0]
+        raw = t[FEATURES].to_numpy(dtype=np.float64)
+        fit = raw[(t["minutos"] >= min_minutes).to_numpy()]
+        if len(fit) == 0:
+            fit = raw
+        # media / desviación ignorando NaN (features que un feed no trae → 0 y 1)
+        ok = ~np.isnan(fit)
+        n = ok.sum(axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = np.where(n > 0, np.where(ok, fit, 0).sum(axis=0) / n, 0.0)
+            var = np.where(n > 0, np.where(ok, (fit - mean) ** 2, 0).sum(axis=0) / n, 1.0)
+        std = np.sqrt(var)
+        std = np.where(np.isfinite(std) & (std > 0), std, 1.0)
+        X = np.nan_to_num((raw - mean) / std)
+        return cls(t.index.to_numpy(), t["position"].to_numpy(), t["minutos"].to_numpy(),
+                   X, mean, std)
+
+    # --- consultas ---------------------------------------------------------------
+    def _candidates(self, row, position, min_minutes):
+        m = self.minutes >= min_minutes
+        if position == "same":
+            g = self.groups[row]
+            m &= (self.groups == g) if g is not None else (self.positions == self.positions[row])
+        elif position in POSITION_GROUPS:
+            m &= self.groups == position
+        elif position is not None:
+            codes = {position} if isinstance(position, str) else set(position)
+            m &= np.isin(self.positions, list(codes))
+        m[row] = False
+        return m
+
+    def distances(self, player_id):
+        """Distancia euclídea (en z-score) de player_id a todos los jugadores del índice."""
+        i = self._row[int(float(player_id))]
+        d2 = self.norms + self.norms[i] - 2.0 * (self.X @ self.X[i])
+        return np.sqrt(np.maximum(d2, 0.0))
+
+    def query(self, player_id, k=5, *, position="same", min_minutes=MIN_MINUTES):
+        """
+        Los k jugadores más parecidos a player_id (más cercano primero):
+        DataFrame con playerId, distance, similarity (1 / (1 + distance)),
+        position y minutos. position: "same" (su mismo grupo), un grupo de
+        POSITION_GROUPS, un código o lista de códigos, o None (todos).
+        Solo se proponen jugadores con al menos min_minutes en total.
+        """
+        pid = int(float(player_id))
+        if pid not in self._row:
+            raise KeyError(f"Jugador sin minutos en el índice: {pid}")
+        row = self._row[pid]
+        cand = np.flatnonzero(self._candidates(row, position, min_minutes))
+        if len(cand) == 0 or k <= 0:
+            return pd.DataFrame(columns=["playerId", "distance", "similarity", "position", "minutos"])
+        dist = self.distances(pid)[cand]
+        k = min(int(k), len(cand))
+        top = np.argpartition(dist, k - 1)[:k]
+        top = top[np.lexsort((self.player_ids[cand][top], dist[top]))]
+        sel = cand[top]
+        return pd.DataFrame({
+            "playerId":   self.player_ids[sel],
+            "distance":   dist[top],
+            "similarity": 1.0 / (1.0 + dist[top]),
+            "position":   self.positions[sel],
+            "minutos":    self.minutes[sel],
+        })
+
+    def player_list(self, player_id, k=2, **kwargs):
+        """[player_id, parecido 1, ..., parecido k]: la lista de jugadores del dashboard."""
+        return [int(float(player_id))] + self.query(player_id, k, **kwargs)["playerId"].tolist()
+
+    # --- disco ----------------------------------------------------------------------
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.stem + ".tmp.npz")
+        np.savez(tmp, player_ids=self.player_ids, positions=self.positions.astype(str),
+                 minutes=self.minutes, X=self.X, mean=self.mean, std=self.std,
+                 features=np.array(self.features),
+                 meta=np.array(json.dumps({"version": INDEX_VERSION, "stamps": self._stamps})))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as z:
+            meta = json.loads(str(z["meta"]))
+            if meta.get("version") != INDEX_VERSION:
+                raise ValueError("Versión de índice distinta")
+            idx = cls(z["player_ids"], z["positions"], z["minutes"], z["X"],
+                      z["mean"], z["std"], features=[str(f) for f in z["features"]])
+        idx._stamps = meta.get("stamps")
+        return idx
+
+
+def index_path(data_dir):
+    return Path(data_dir) / CACHE_DIRNAME / INDEX_FILENAME
+
+
+def features_files(data_dir):
+    out = []
+    for p_path, _ in discover_match_files(data_dir):
+        f = Path(p_path).with_name(match_key_from_path(p_path) + _FEATURES_SUFFIX)
+        if f.exists():
+            out.append(f)
+    return out
+
+
+_INDEXES = {}
+
+
+def build_similarity_index(data_dir, *, min_minutes=MIN_MINUTES, save=True):
+    """
+    SimilarityIndex de data_dir. Se reutiliza el de memoria o el de
+    _cache/similares.npz si ningún features CSV ha cambiado (mtime/tamaño).
+    """
+    data_dir = Path(data_dir).resolve()
+    files = features_files(data_dir)
+    stamps = {"min_minutes": min_minutes,
+              "files": [[f.name, *_stamp(f)] for f in files]}
+
+    cached = _INDEXES.get(data_dir)
+    if cached is not None and cached._stamps == stamps:
+        return cached
+    path = index_path(data_dir)
+    if path.exists():
+        try:
+            idx = SimilarityIndex.load(path)
+            if idx._stamps == stamps:
+                _INDEXES[data_dir] = idx
+                return idx
+        except (OSError, ValueError, KeyError):
+            pass
+
+    idx = SimilarityIndex.from_features(player_features(files), min_minutes=min_minutes)
+    idx._stamps = stamps
+    _INDEXES[data_dir] = idx
+    if save:
+        idx.save(path)
+    return idx
+
+
+def similar_players(player_id, data_dir, k=2, **kwargs):
+    """Atajo: lista [player_id, ...k parecidos] lista para el dashboard."""
+    return build_similarity_index(data_dir).player_list(player_id, k, **kwargs)
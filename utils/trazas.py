@@ -0,0 +1,267 @@
+# utils/trazas.py
+"""
+Trazas opcionales (spans con duración) para perfilar los dashboards.
+
+Desactivadas por defecto: cada función instrumentada solo comprueba un
+booleano. Se activan de dos formas:
+
+    COMPARATIVA_TRAZAS=1                 activa y no exporta
+    COMPARATIVA_TRAZAS=salida.json       activa y al salir escribe la traza Chrome
+
+    with tracing("salida.json"):         activa solo dentro del bloque
+        ...
+
+Cada span guarda nombre, inicio, duración, proceso/hilo y, si se conocen,
+filas (rows) y Artists añadidos al eje (artists). La traza Chrome se abre en
+chrome://tracing o https://ui.perfetto.dev.
+"""
+from contextlib import contextmanager
+from pathlib import Path
+import atexit
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+
+ENV_VAR = "COMPARATIVA_TRAZAS"
+
+
+class _State:
+    __slots__ = ("on", "spans")
+
+    def __init__(self):
+        self.on = False
+        self.spans = []
+
+
+_STATE = _State()
+_LOCAL = threading.local()   # profundidad de anidamiento por hilo
+
+
+def enabled():
+    return _STATE.on
+
+
+def enable(on=True):
+    """Activa/desactiva la recogida de spans (no borra los ya recogidos)."""
+    _STATE.on = bool(on)
+
+
+def clear():
+    _STATE.spans = []
+
+
+def drain():
+    """Devuelve los spans recogidos y vacía el buffer (p. ej. para enviarlos desde un worker)."""
+    spans, _STATE.spans = _STATE.spans, []
+    return spans
+
+
+def add_spans(spans):
+    """Añade spans recogidos en otro proceso (render en lote)."""
+    _STATE.spans.extend(spans)
+
+
+def spans():
+    return list(_STATE.spans)
+
+
+# --- Spans -----------------------------------------------------------------------
+class _Span:
+    __slots__ = ("name", "args", "_t0", "_depth")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def set(self, **args):
+        """Añade datos al span (rows=..., artists=..., lo que sea serializable)."""
+        self.args.update(args)
+
+    def __enter__(self):
+        depth = getattr(_LOCAL, "depth", 0)
+        _LOCAL.depth = depth + 1
+        self._depth = depth
+        self._t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        t1 = time.perf_counter_ns()
+        _LOCAL.depth = self._depth
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        _STATE.spans.append({
+            "name":  self.name,
+            "ts_us": self._t0 / 1000.0,
+            "dur_us": (t1 - self._t0) / 1000.0,
+            "pid":   os.getpid(),
+            "tid":   threading.get_ident(),
+            "depth": self._depth,
+            "args":  self.args,
+        })
+        return False
+
+
+class _NoSpan:
+    # Lo que devuelve span() con las trazas apagadas: no mide nada
+    __slots__ = ()
+
+    def set(self, **args):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name, /, **args):
+    """
+    Context manager con un span con nombre:
+
+        with span("red_pases.receptores", rows=len(passes)) as s:
+            ...
+            s.set(edges=n)
+    """
+    if not _STATE.on:
+        return _NO_SPAN
+    return _Span(name, args)
+
+
+def _count_rows(obj):
+    if obj is None:
+        return None
+    if isinstance(obj, tuple):      # (df_eventos, df_jugadores)
+        obj = obj[0] if obj else None
+    try:
+        return len(obj)
+    except TypeError:
+        return None
+
+
+def traced(name=None, *, rows=None, ax="ax"):
+    """
+    Decorador: cada llamada es un span (nombre por defecto: módulo.función).
+    - rows: nombre del argumento cuyo len() se guarda como filas, o "return"
+      para contar las del resultado.
+    - ax: argumento con el eje de matplotlib; se guarda cuántos Artists ha
+      añadido la llamada.
+    Con las trazas apagadas solo cuesta comprobar un booleano.
+    """
+    def deco(fn):
+        label = name or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__name__}"
+        params = list(inspect.signature(fn).parameters)
+        ax_pos = params.index(ax) if ax in params else None
+        rows_pos = params.index(rows) if rows in params else None
+
+        def _arg(pos, key, args, kwargs):
+            if pos is None:
+                return None
+            return args[pos] if pos < len(args) else kwargs.get(key)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _STATE.on:
+                return fn(*args, **kwargs)
+            the_ax = _arg(ax_pos, ax, args, kwargs)
+            n0 = len(the_ax.get_children()) if hasattr(the_ax, "get_children") else None
+            with _Span(label, {}) as s:
+                out = fn(*args, **kwargs)
+                if rows == "return":
+                    s.args["rows"] = _count_rows(out)
+                elif rows_pos is not None:
+                    s.args["rows"] = _count_rows(_arg(rows_pos, rows, args, kwargs))
+                if n0 is not None:
+                    s.args["artists"] = len(the_ax.get_children()) - n0
+            return out
+        return wrapper
+    return deco
+
+
+# --- Exportación -------------------------------------------------------------------
+def summary(spans_=None):
+    """{nombre: {count, total_ms, mean_ms, max_ms, rows, artists}} ordenado por tiempo total."""
+    agg = {}
+    for s in (spans_ if spans_ is not None else _STATE.spans):
+        a = agg.setdefault(s["name"], {"count": 0, "total_ms": 0.0, "max_ms": 0.0,
+                                       "rows": 0, "artists": 0})
+        ms = s["dur_us"] / 1000.0
+        a["count"] += 1
+        a["total_ms"] += ms
+        a["max_ms"] = max(a["max_ms"], ms)
+        a["rows"] += s["args"].get("rows") or 0
+        a["artists"] += s["args"].get("artists") or 0
+    for a in agg.values():
+        a["mean_ms"] = a["total_ms"] / a["count"]
+        for k in ("total_ms", "max_ms", "mean_ms"):
+            a[k] = round(a[k], 3)
+    return dict(sorted(agg.items(), key=lambda kv: -kv[1]["total_ms"]))
+
+
+def to_chrome_trace(spans_=None):
+    events = [
+        {
+            "name": s["name"], "cat": s["name"].split(".", 1)[0], "ph": "X",
+            "ts": s["ts_us"], "dur": s["dur_us"],
+            "pid": s["pid"], "tid": s["tid"],
+            "args": {k: v for k, v in s["args"].items() if v is not None},
+        }
+        for s in (spans_ if spans_ is not None else _STATE.spans)
+    ]
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def export(path, spans_=None):
+    """
+    Escribe los spans en path. Si el nombre acaba en .trace.json (o .json)
+    se escribe la traza Chrome; con .spans.json, la lista de spans + resumen.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = spans_ if spans_ is not None else _STATE.spans
+    if path.name.endswith(".spans.json"):
+        doc = {"spans": data, "summary": summary(data)}
+    else:
+        doc = to_chrome_trace(data)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(doc, f, ensure_ascii=False)
+    os.replace(tmp, path)
+    return path
+
+
+@contextmanager
+def tracing(path=None):
+    """
+    Activa las trazas dentro del bloque; al salir restaura el estado anterior
+    y, si se pasa path, exporta los spans del bloque.
+    """
+    prev, start = _STATE.on, len(_STATE.spans)
+    _STATE.on = True
+    try:
+        yield _STATE
+    finally:
+        _STATE.on = prev
+        if path is not None:
+            export(path, _STATE.spans[start:])
+
+
+# --- Activación por variable de entorno --------------------------------------------
+def _from_env():
+    val = os.environ.get(ENV_VAR, "").strip()
+    if not val or val.lower() in ("0", "false", "no", "off"):
+        return
+    _STATE.on = True
+    if val.lower() not in ("1", "true", "yes", "on"):
+        # Solo exporta el proceso que importó el módulo (no los hijos por fork)
+        pid = os.getpid()
+        atexit.register(lambda: os.getpid() == pid and _STATE.spans and export(val))
+
+
+_from_env()
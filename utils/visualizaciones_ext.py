@@ -1,34 +1,157 @@
 # utils/visualizaciones.py
+from collections import OrderedDict
+from functools import lru_cache
+import os
+
+from matplotlib.artist import Artist
+from matplotlib.collections import LineCollection, PathCollection
+from matplotlib.colors import LinearSegmentedColormap, to_rgba
+from matplotlib.path import Path
+from matplotlib.transforms import IdentityTransform
 from mplsoccer import Pitch
 import numpy as np
 import pandas as pd
 
+from .eventos import EVENTS_FRAME_COLUMNS, concat_events, get_cached_events, normalize_events
+from .indice_partidos import _jornada_num, index_for_files
+from .lectura_csv import read_whoscored_csv
+from .masters import (
+    TEAM_ID_COLUMNS, _as_int, index_dataframe, team_color_from_row, teams_table,
+)
+from .opta import type_codes, type_id
+from .red_pases import (
+    PassNetworkAccumulator, build_pass_network, get_cached_network, put_cached_network,
+)
+from .trazas import span, traced
+
+# --- Caché de Pitch y fondos de campo pre-renderizados -------------------------
+_PITCHES = {}
+
+@traced()
+def get_pitch(**style):
+    """
+    Pitch de mplsoccer compartido por estilo (mismos parámetros → mismo objeto).
+    Pitch no guarda estado del eje, así que se puede reutilizar en todos los paneles.
+    """
+    style.setdefault("pitch_type", "opta")
+    key = tuple(sorted(style.items()))
+    pitch = _PITCHES.get(key)
+    if pitch is None:
+        pitch = _PITCHES[key] = Pitch(**style)
+    return pitch
+
+PITCH_RASTER_CACHE_SIZE = 32
+_PITCH_LAYOUTS = {}
+_PITCH_RASTERS = OrderedDict()
+
+def _offscreen_pitch(pitch, w_in, h_in, dpi):
+    # Dibuja el campo en una figura fuera de pantalla que ocupa todo el lienzo
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(w_in, h_in), dpi=dpi)
+    FigureCanvasAgg(fig)
+    ax = fig.add_axes([0, 0, 1, 1])
+    pitch.draw(ax=ax)
+    tidy_axes(ax, with_frame=False)
+    return fig, ax
+
+def _pitch_layout(key, pitch):
+    # Límites y aspecto que deja pitch.draw (no dependen del tamaño)
+    lay = _PITCH_LAYOUTS.get(key)
+    if lay is None:
+        _, ax = _offscreen_pitch(pitch, 1, 1, 72)
+        lay = _PITCH_LAYOUTS[key] = (ax.get_xlim(), ax.get_ylim(), ax.get_aspect(),
+                                     ax.get_facecolor())
+    return lay
+
+def _pitch_raster(key, pitch, w_px, h_px, dpi):
+    rkey = (key, w_px, h_px, dpi)
+    arr = _PITCH_RASTERS.get(rkey)
+    if arr is not None:
+        _PITCH_RASTERS.move_to_end(rkey)
+        return arr
+    xlim, ylim, _, _ = _pitch_layout(key, pitch)
+    fig, ax = _offscreen_pitch(pitch, w_px / dpi, h_px / dpi, dpi)
+    ax.set_aspect("auto")
+    ax.set_xlim(xlim); ax.set_ylim(ylim)
+    fig.canvas.draw()
+    # Agg dibuja las imágenes de abajo arriba: se guarda ya volteada
+    arr = np.ascontiguousarray(np.asarray(fig.canvas.buffer_rgba())[::-1])
+    _PITCH_RASTERS[rkey] = arr
+    while len(_PITCH_RASTERS) > PITCH_RASTER_CACHE_SIZE:
+        _PITCH_RASTERS.popitem(last=False)
+    return arr
+
+class _PitchBackground(Artist):
+    """
+    Fondo de campo pre-renderizado. En cada draw copia tal cual (sin
+    remuestrear) la imagen del tamaño en píxeles y dpi reales del eje; la
+    imagen se renderiza una vez por estilo/tamaño/dpi y se cachea.
+    """
+    def __init__(self, pitch, key):
+        super().__init__()
+        self._pitch, self._key = pitch, key
+        self.set_zorder(0)
+
+    def draw(self, renderer):
+        if not self.get_visible():
+            return
+        bb = self.axes.bbox
+        w_px, h_px = int(round(bb.width)), int(round(bb.height))
+        if w_px < 1 or h_px < 1:
+            return
+        arr = _pitch_raster(self._key, self._pitch, w_px, h_px, self.figure.dpi)
+        gc = renderer.new_gc()
+        renderer.draw_image(gc, int(round(bb.x0)), int(round(bb.y0)), arr)
+        gc.restore()
+        self.stale = False
+
+def _draw_pitch_raster(ax, pitch, key):
+    """Pone el campo como un único artista (_PitchBackground) detrás de los datos."""
+    xlim, ylim, aspect, face = _pitch_layout(key, pitch)
+    ax.set_facecolor(face)
+    ax.set_xlim(xlim); ax.set_ylim(ylim)
+    ax.set_aspect(aspect, adjustable="box")
+    ax.add_artist(_PitchBackground(pitch, key))
+
 # Función llamada terreno de juego
+@traced()
 def draw_opta_pitch(
     ax=None,
     pitch_color="#1A1730",   # fondo del campo (oscuro/morado)
     line_color="#00E5FF",    # líneas claras (cian suave)
     linewidth=0.9,
     corner_arcs=True,
+    raster=False,
 ):
     """
     Dibuja un campo tipo Opta en el eje dado y devuelve (pitch, ax).
     Pensado para eventos WhoScored (x,y en 0-100).
+    - El Pitch se reutiliza entre llamadas con el mismo estilo (get_pitch).
+    - raster=True: el campo (fondo + líneas) se pinta como una imagen
+      pre-renderizada y cacheada por estilo, tamaño y dpi (ideal para lotes;
+      para PDF/SVG mejor el campo vectorial).
     """
-    pitch = Pitch(
+    style = dict(
         pitch_type="opta",
         pitch_color=pitch_color,
         line_color=line_color,
         linewidth=linewidth,
         corner_arcs=corner_arcs,
     )
+    pitch = get_pitch(**style)
     if ax is None:
         fig, ax = pitch.draw()
         return pitch, ax
-    pitch.draw(ax=ax)
+    if raster:
+        _draw_pitch_raster(ax, pitch, tuple(sorted(style.items())))
+    else:
+        pitch.draw(ax=ax)
     return pitch, ax
 
 # --- Utilidades comunes para paneles ------------------------------------------
+@traced()
 def tidy_axes(ax, with_frame=True, spine_color="#3A3F4B", lw=1):
     """Oculta ticks y controla la visibilidad/estilo del marco."""
     ax.set_xticks([]); ax.set_yticks([])
@@ -37,22 +160,29 @@ def tidy_axes(ax, with_frame=True, spine_color="#3A3F4B", lw=1):
         sp.set_color(spine_color)
         sp.set_linewidth(lw)
 
+@traced()
 def draw_pitch_panel(
     ax, 
     title=None, 
     pitch_color="#1A1730", 
     line_color="#00E5FF", 
     linewidth=0.9, 
-    title_color="#9AA0A6"
+    title_color="#9AA0A6",
+    raster=False
 ):
-    """Dibuja el campo estilo Opta, añade un título opcional y limpia ejes."""
-    draw_opta_pitch(ax=ax, pitch_color=pitch_color, line_color=line_color, linewidth=linewidth)
+    """
+    Dibuja el campo estilo Opta, añade un título opcional y limpia ejes.
+    raster: ver draw_opta_pitch (fondo pre-renderizado).
+    """
+    draw_opta_pitch(ax=ax, pitch_color=pitch_color, line_color=line_color, linewidth=linewidth,
+                    raster=raster)
     if title:
         ax.set_title(title, fontsize=12, fontweight="bold", color=title_color, pad=6)
     tidy_axes(ax, with_frame=False)
 
 # ---------------------------------------------------------------- #
 # Función para red de pases
+@traced(rows="df_events")
 def plot_pass_network_for_player(
     ax,
     df_events,
@@ -69,7 +199,8 @@ def plot_pass_network_for_player(
     node_scale=260,
     draw_titles=False,
     highlight_label=None,
-    highlight_text_color=None
+    highlight_text_color=None,
+    network=None
 ):
     """
     Pinta la red de pases del equipo del jugador indicado, sobre un campo Opta (0-100).
@@ -77,158 +208,68 @@ def plot_pass_network_for_player(
     - Etiquetas: nombre para el jugador destacado, dorsal para el resto (si disponible).
     - df_events: WhoScored lg_eventos del partido.
     - df_players: WhoScored lg_jugadores del mismo partido (opcional pero recomendado).
+    - network: PassNetwork ya calculado (utils.red_pases); si se pasa no se
+      recalcula nada y df_events/df_players se ignoran.
+    Devuelve el PassNetwork usado (para reutilizarlo con otro jugador destacado).
     """
-
-    if df_events is None or len(df_events) == 0 or player_id is None:
+    if player_id is None:
         return  # nada que hacer
 
-    # --- Helpers internos ------------------------------------------------------
-    def _pick(df, opts):
-        for c in opts:
-            if c in df.columns:
-                return c
-        return None
-
-    def _to_num(s):
-        return pd.to_numeric(s, errors="coerce")
-
-    def _short_name(n):
-        if not isinstance(n, str): 
-            return ""
-        parts = n.strip().split()
-        return parts[-1] if parts else n
+    if network is None:
+        if df_events is None or len(df_events) == 0:
+            return
+        network = build_pass_network(df_events, df_players, player_id=player_id, team_id=team_id)
+        if network is None:
+            return
 
-    # --- Normalización de columnas de eventos ---------------------------------
-    cols = {
-        "type":   _pick(df_events, ["type","type_display_name"]),
-        "outc":   _pick(df_events, ["outcomeType","outcome_type_display_name"]),
-        "pid":    _pick(df_events, ["playerId","player_id"]),
-        "tid":    _pick(df_events, ["teamId","team_id"]),
-        "rel":    _pick(df_events, ["relatedPlayerId","related_player_id"]),
-        "x":      _pick(df_events, ["x","startX","start_x"]),
-        "y":      _pick(df_events, ["y","startY","start_y"]),
-        "endX":   _pick(df_events, ["endX","end_x"]),
-        "endY":   _pick(df_events, ["endY","end_y"]),
-        "minute": _pick(df_events, ["expandedMinute","minute"]),
-        "second": _pick(df_events, ["second"]),
-    }
-
-    d = pd.DataFrame({
-        "type":   df_events[cols["type"]]   if cols["type"]   else np.nan,
-        "outc":   df_events[cols["outc"]]   if cols["outc"]   else np.nan,
-        "pid":    df_events[cols["pid"]]    if cols["pid"]    else np.nan,
-        "tid":    df_events[cols["tid"]]    if cols["tid"]    else np.nan,
-        "rel":    df_events[cols["rel"]]    if cols["rel"]    else np.nan,
-        "x":      _to_num(df_events[cols["x"]])      if cols["x"]    else np.nan,
-        "y":      _to_num(df_events[cols["y"]])      if cols["y"]    else np.nan,
-        "endX":   _to_num(df_events[cols["endX"]])   if cols["endX"] else np.nan,
-        "endY":   _to_num(df_events[cols["endY"]])   if cols["endY"] else np.nan,
-        "minute": _to_num(df_events[cols["minute"]]) if cols["minute"] else 0,
-        "second": _to_num(df_events[cols["second"]]) if cols["second"] else 0,
-    }).copy()
-
-    # IDs canónicos (enteros "limpios")
-    d["pid"] = _to_num(d["pid"]).astype("Int64")
-    d["rel"] = _to_num(d["rel"]).astype("Int64")
-    d["tid"] = _to_num(d["tid"]).astype("Int64")
+    draw_pass_network(
+        ax, network,
+        player_id=player_id,
+        team_color=team_color,
+        show_all=show_all,
+        min_edge_count=min_edge_count,
+        emphasised_alpha=emphasised_alpha,
+        deemphasised_alpha=deemphasised_alpha,
+        node_base=node_base,
+        node_scale=node_scale,
+        draw_titles=draw_titles,
+        highlight_label=highlight_label,
+        highlight_text_color=highlight_text_color,
+    )
+    return network
 
+# --- Dibujo de un PassNetwork ya calculado ------------------------------------
+@traced()
+def draw_pass_network(
+    ax,
+    network,
+    *,
+    player_id,
+    team_color="#00E5FF",
+    show_all=True,
+    min_edge_count=1,
+    emphasised_alpha=0.95,
+    deemphasised_alpha=0.18,
+    node_base=90,
+    node_scale=260,
+    draw_titles=False,
+    highlight_label=None,
+    highlight_text_color=None
+):
+    """
+    Dibuja un PassNetwork destacando a player_id. Solo pinta: el mismo objeto
+    sirve para destacar a varios jugadores del mismo equipo y partido.
+    """
     try:
         pid = int(float(player_id))
     except Exception:
         return
 
-    # --- Determinar team_id si no se pasa -------------------------------------
-    if team_id is None:
-        cand = d.loc[d["pid"] == pid, "tid"].dropna()
-        if not cand.empty:
-            team_id = int(cand.mode().iloc[0])
-        elif df_players is not None and "teamId" in df_players.columns and "playerId" in df_players.columns:
-            c2 = _to_num(df_players.loc[_to_num(df_players["playerId"]) == pid, "teamId"]).dropna()
-            if not c2.empty:
-                team_id = int(c2.iloc[0])
-    if team_id is None:
-        all_t = d["tid"].dropna()
-        team_id = int(all_t.mode().iloc[0]) if not all_t.empty else None
-    if team_id is None:
-        return
-
-    # --- Filtro: solo pases exitosos del equipo --------------------------------
-    type_pass = d["type"].astype(str).str.lower().str.contains("pass", na=False)
-    out_ok = d["outc"].astype(str).str.lower().isin(
-        {"successful", "success", "succesful", "successfull"}  # tolerante a typos
-    )
-    passes = d[type_pass & out_ok & (d["tid"] == team_id)].copy()
-    if passes.empty:
-        return
-
-    # --- Receptor: usar relatedPlayerId + pequeña heurística -------------------
-    passes["receiver"] = passes["rel"]
-
-    # tiempo en segundos para heurística
-    passes["t"] = passes["minute"].fillna(0)*60 + passes["second"].fillna(0)
-
-    same_team = d[d["tid"] == team_id].copy()
-    same_team["t"] = same_team["minute"].fillna(0)*60 + same_team["second"].fillna(0)
-    same_team = same_team.sort_values("t").reset_index(drop=True)
-
-    tol_time = 10.0   # seg.
-    tol_dist = 12.0   # unidades en escala 0-100
-
-    miss_idx = passes[passes["receiver"].isna()].index
-    for idx in miss_idx:
-        row = passes.loc[idx]
-        t0 = row["t"]; xe, ye = row["endX"], row["endY"]
-        if pd.isna(xe) or pd.isna(ye):
-            continue
-        cand = same_team[(same_team["t"] > t0) & (same_team["t"] <= t0 + tol_time)]
-        cand = cand[cand["pid"] != row["pid"]]
-        if cand.empty:
-            continue
-        dd = np.hypot(cand["x"] - xe, cand["y"] - ye)
-        good = dd[dd <= tol_dist]
-        if not good.empty:
-            pick = good.index[0]
-            passes.at[idx, "receiver"] = same_team.loc[pick, "pid"]
-        else:
-            # fallback: primero de la ventana temporal
-            passes.at[idx, "receiver"] = cand.iloc[0]["pid"]
-
-    passes = passes.dropna(subset=["receiver"]).copy()
-    passes["receiver"] = passes["receiver"].astype("Int64")
-
-    # --- Aristas (pares no dirigidos) -----------------------------------------
-    edges = passes.groupby(["pid","receiver"]).size().reset_index(name="count")
-    edges["a"] = edges[["pid","receiver"]].min(axis=1)
-    edges["b"] = edges[["pid","receiver"]].max(axis=1)
-    edges_u = edges.groupby(["a","b"])["count"].sum().reset_index()
-    edges_u = edges_u[edges_u["count"] >= min_edge_count]
-
-    if not show_all:
-        # conserva solo aristas que involucren al jugador objetivo
-        edges_u = edges_u[(edges_u["a"] == pid) | (edges_u["b"] == pid)]
-
-    # --- Posiciones medias: inicio pasador + fin receptor ----------------------
-    pos_start = passes[["pid","x","y"]].rename(columns={"pid":"playerId","x":"px","y":"py"})
-    pos_end   = passes[["receiver","endX","endY"]].rename(columns={"receiver":"playerId","endX":"px","endY":"py"})
-    pos_all   = pd.concat([pos_start, pos_end], ignore_index=True).dropna(subset=["playerId","px","py"])
-
-    avg_pos = pos_all.groupby("playerId").agg(x=("px","median"), y=("py","median")).reset_index()
-
-    # Conteo de pases recibidos → tamaño del nodo
-    recv = passes["receiver"].value_counts().rename_axis("playerId").reset_index(name="received")
-    avg_pos = avg_pos.merge(recv, on="playerId", how="left").fillna({"received":0})
-
-    # --- Info de jugadores: nombre, dorsal, titular ----------------------------
-    name_map, shirt_map, starter_map = {}, {}, {}
-    if df_players is not None and not df_players.empty:
-        dfp = df_players.copy()
-        dfp["playerId"] = _to_num(dfp["playerId"]).astype("Int64")
-        if "name" in dfp.columns:
-            name_map = dfp.set_index("playerId")["name"].to_dict()
-        if "shirtNo" in dfp.columns:
-            shirt_map = dfp.set_index("playerId")["shirtNo"].to_dict()
-        if "isFirstEleven" in dfp.columns:
-            starter_map = dfp.set_index("playerId")["isFirstEleven"].to_dict()
+    def _short_name(n):
+        if not isinstance(n, str): 
+            return ""
+        parts = n.strip().split()
+        return parts[-1] if parts else n
 
     # --- Dibujo ----------------------------------------------------------------    
     try:
@@ -240,57 +281,66 @@ def plot_pass_network_for_player(
     base_edge_color = (1, 1, 1, deemphasised_alpha)
     highlight_color = team_color or "#00E5FF"
 
-    pos_map = avg_pos.set_index("playerId")[["x","y"]].to_dict("index")
-    max_count = max(1, int(edges_u["count"].max())) if not edges_u.empty else 1
-
-    # Aristas
-    for _, e in edges_u.iterrows():
-        a, b, c = int(e["a"]), int(e["b"]), int(e["count"])
-        if a not in pos_map or b not in pos_map:
+    keep = network.edge_mask(min_edge_count=min_edge_count,
+                             player_id=None if show_all else pid)
+    ea, eb, ec = network.edge_a[keep], network.edge_b[keep], network.edge_count[keep]
+
+    max_count = max(1, int(ec.max())) if len(ec) else 1
+
+    # Aristas: un único LineCollection (grosor/color/alfa por segmento)
+    ids = network.node_ids
+    ia = np.searchsorted(ids, ea); ia_ok = ia < len(ids)
+    ib = np.searchsorted(ids, eb); ib_ok = ib < len(ids)
+    has_pos = ia_ok & ib_ok
+    has_pos[has_pos] &= (ids[ia[has_pos]] == ea[has_pos]) & (ids[ib[has_pos]] == eb[has_pos])
+    ea, eb, ec, ia, ib = ea[has_pos], eb[has_pos], ec[has_pos], ia[has_pos], ib[has_pos]
+
+    if len(ea):
+        segs = np.stack([
+            np.column_stack([network.node_x[ia], network.node_y[ia]]),
+            np.column_stack([network.node_x[ib], network.node_y[ib]]),
+        ], axis=1)
+        lws = 1.0 + 7.0 * (ec / max_count)
+        involves = (ea == pid) | (eb == pid)
+        rgba_hi   = to_rgba(highlight_color, emphasised_alpha)
+        rgba_base = to_rgba(base_edge_color, deemphasised_alpha)
+        cols = np.where(involves[:, None], rgba_hi, rgba_base)
+        ax.add_collection(LineCollection(
+            segs, linewidths=lws, colors=cols, capstyle="round",
+            zorder=1, clip_on=True,
+        ))
+
+    # Nodos: una colección para titulares (o) y otra para suplentes (s)
+    n = network.n_nodes
+    max_recv = max(1, int(network.node_received.max())) if n else 1
+    # NUEVO: tamaño = base + escala * (recibidos/max)^0.8  (suaviza diferencias)
+    sizes = node_base + node_scale * (network.node_received / max_recv) ** 0.8
+    is_me = network.node_ids == pid
+    edge_cols = np.where(is_me[:, None], to_rgba(highlight_color), (1,1,1,0.75))
+    lw_nodes = np.where(is_me, 2.4, 1.6)
+    face_col = (0,0,0,0)  # hueco
+
+    for marker, sel in (("o", network.node_starter), ("s", ~network.node_starter)):
+        if not sel.any():
             continue
-        xa, ya = pos_map[a]["x"], pos_map[a]["y"]
-        xb, yb = pos_map[b]["x"], pos_map[b]["y"]
-        lw = 1.0 + 7.0 * (c / max_count)
-        involves = (a == pid) or (b == pid)
-        col = highlight_color if involves else base_edge_color
-        alp = emphasised_alpha if involves else deemphasised_alpha
-        ax.plot([xa, xb], [ya, yb], linewidth=lw, color=col, alpha=alp,
-                solid_capstyle="round", zorder=1, clip_on=True)
-
-    # Nodos
-    max_recv = max(1, int(avg_pos["received"].max())) if not avg_pos.empty else 1
-    for _, r in avg_pos.iterrows():
-        p = int(r["playerId"]); x, y = r["x"], r["y"]
-        received = int(r["received"])
-
-        # NUEVO: tamaño = base + escala * (recibidos/max)^0.8  (suaviza diferencias)
-        frac = (received / max_recv) ** 0.8
-        size = node_base + node_scale * frac
-
-        is_starter = bool(starter_map.get(p, True))
-        marker = "o" if is_starter else "s"
-        edge_col = highlight_color if p == pid else (1,1,1,0.75)
-        face_col = (0,0,0,0)  # hueco
-        lw_node = 2.4 if p == pid else 1.6
-
-        ax.scatter([x], [y], s=size, marker=marker,
-                facecolors=face_col, edgecolors=edge_col,
-                linewidths=lw_node, zorder=2, clip_on=True)  # <- clip_off
-
-        # Etiquetas: nombre para el jugador destacado; dorsal para el resto
-        if p == pid:
+        ax.scatter(network.node_x[sel], network.node_y[sel], s=sizes[sel], marker=marker,
+                   facecolors=face_col, edgecolors=edge_cols[sel],
+                   linewidths=lw_nodes[sel], zorder=2, clip_on=True)
+
+    # Etiquetas: nombre para el jugador destacado; dorsal para el resto
+    for i in range(n):
+        x, y = network.node_x[i], network.node_y[i]
+        full = str(network.node_names[i])
+        if is_me[i]:
             # Si hay un nick explícito (nick_name), se usa, si no, el nombre que haya
-            full = name_map.get(p, str(p))
             label = highlight_label if (highlight_label is not None) else (
-                str(full).split()[0] if isinstance(full, str) else str(full)  # nombre de pila como fallback
+                full.split()[0] if full.split() else full  # nombre de pila como fallback
             )
             # Color del texto del destacado: gris claro, si no el color de equipo
             tcol  = highlight_text_color if (highlight_text_color is not None) else highlight_color
             fz    = 14
         else:
-            label = shirt_map.get(p, None)
-            if label is None or (isinstance(label, float) and np.isnan(label)):
-                label = _short_name(name_map.get(p, str(p)))
+            label = str(network.node_shirts[i]) or _short_name(full)
             tcol = (1,1,1,0.9)
             fz   = 10
 
@@ -298,127 +348,286 @@ def plot_pass_network_for_player(
         ax.text(x, y, str(label), ha="center", va="center",
                 fontsize=fz, fontweight="bold", color=tcol, zorder=3, clip_on=False)  # <- clip_off
 
-        if draw_titles:
-            ax.set_title("Red de pases · equipo del jugador", fontsize=11, color=highlight_color)
+    if draw_titles and n:
+        ax.set_title("Red de pases · equipo del jugador", fontsize=11, color=highlight_color)
 
 # Ayuda para hacerlo genérico
 
 # --- Lector flexible (auto ; o ,) ---------------------------------------------
-def _auto_csv_vis(path):
-
-    with open(path, "r", encoding="utf-8") as f:
-        first = f.readline()
-    sep = ";" if (";" in first and "," not in first) else ","
-    df = pd.read_csv(path, sep=sep, encoding="utf-8")
-    df.columns = [c.strip() for c in df.columns]
+def _auto_csv_vis(path, columns=None):
+    # Sin columns: fichero completo, tipos inferidos por pandas (como siempre).
+    # Con columns: solo esas y ya tipadas con el esquema de utils.lectura_csv.
+    with span("visualizaciones_ext.csv", path=os.path.basename(str(path))) as s:
+        if columns is None:
+            df = read_whoscored_csv(path, schema={}, engine="c")
+        else:
+            df = read_whoscored_csv(path, columns)
+        s.set(rows=len(df), cols=df.shape[1])
     return df
 
+# typeIds Opta sueltos del mapa de acciones (los conjuntos van con type_codes)
+GOAL_TYPE = type_id("Goal")
+TAKE_ON_TYPE = type_id("TakeOn")
+
 # --- Buscar el partido de un jugador y devolver (eventos, jugadores) ----------
-def get_match_data_for_player(player_id, players_files, events_files):
+@traced()
+def find_match_for_player(player_id, players_files=None, events_files=None, *, index=None):
     """
-    Recorre la lista de *_lg_jugadores.csv y encuentra en cuál está player_id.
-    Devuelve (df_eventos, df_jugadores) del partido correspondiente.
+    Devuelve la entrada del índice ({"match", "jornada", "players_file",
+    "events_file"}) del primer partido de player_id, o None.
+    - Con players_files/events_files (listas del notebook) usa un índice en
+      memoria que solo relee los *_lg_jugadores.csv nuevos o modificados.
+    - Con index (ver utils.indice_partidos.build_player_index) la búsqueda es
+      directa sobre el índice persistente de la carpeta de datos.
     """
-    pid = int(float(player_id))
-
-    # Aseguramos que listas tienen misma longitud
-    if len(players_files) != len(events_files):
-        raise ValueError("players_files y events_files deben tener la misma longitud y orden.")
-
-    for p_path, e_path in zip(players_files, events_files):
-        try:
-            dfp = _auto_csv_vis(p_path)
-        except Exception:
-            continue
-        if "playerId" not in dfp.columns:
-            continue
-        # normaliza a int
-        pid_series = pd.to_numeric(dfp["playerId"], errors="coerce").astype("Int64")
-        if int(pid) in set(pid_series.dropna().astype(int)):
-            dfe = _auto_csv_vis(e_path)
-            return dfe, dfp
+    if index is None:
+        if players_files is None or events_files is None:
+            raise ValueError("Hay que pasar players_files/events_files o un index.")
+        # Aseguramos que listas tienen misma longitud (lo valida el índice)
+        index = index_for_files(players_files, events_files)
+    return index.first(player_id)
+
+def _load_match_players(entry, store=None):
+    if store is not None and entry["match"] in store:
+        return store.load_players(entry["match"])
+    return _auto_csv_vis(entry["players_file"])
+
+def _load_match_events(entry, store=None, columns=None):
+    # store: EventStore (Parquet) o EventArrays (devuelve ya el EventsFrame)
+    if store is not None and entry["match"] in store:
+        with span("visualizaciones_ext.almacen", match=entry["match"]) as s:
+            df = store.load_events(entry["match"], columns=columns)
+            s.set(rows=len(df))
+        return df
+    return _auto_csv_vis(entry["events_file"], columns)
+
+def _events_stamp(entry, store=None):
+    # Identifica la versión de los eventos del partido (para cachés por partido).
+    # Con EventArrays el fichero (_arrays.json) es común a todos los partidos:
+    # por eso la clave lleva también el partido.
+    if store is not None and entry["match"] in store:
+        path = store.events_path(entry["match"])
+    else:
+        path = entry["events_file"]
+    try:
+        st = os.stat(path)
+        return (str(path), entry["match"], st.st_mtime_ns, st.st_size)
+    except OSError:
+        return (str(path), entry["match"], None, None)
+
+def _match_events_frame(entry, store=None):
+    # EventsFrame del partido, normalizado una sola vez (memo por versión del fichero)
+    stamp = _events_stamp(entry, store)
+    cached = get_cached_events(stamp)
+    if cached is not None:
+        return cached
+    dfe = _load_match_events(entry, store, EVENTS_FRAME_COLUMNS)
+    return normalize_events(dfe, match_id=stamp)
+
+@traced(rows="return")
+def get_match_data_for_player(player_id, players_files=None, events_files=None, *,
+                              index=None, store=None, columns=None):
+    """
+    Encuentra el partido de player_id y devuelve (df_eventos, df_jugadores).
+    - Búsqueda por índice (ver find_match_for_player).
+    - Con store (utils.almacen_eventos.EventStore) lee el partido del almacén
+      Parquet; si no, del CSV. columns limita las columnas de eventos que se
+      cargan (en ambos casos).
+    Si el jugador está en varios partidos devuelve el primero.
+    """
+    entry = find_match_for_player(player_id, players_files, events_files, index=index)
+    if entry is None:
+        # Si no lo encuentra:
+        return None, None
 
-    # Si no lo encuentra:
-    return None, None
+    dfp = _load_match_players(entry, store)
+    dfe = _load_match_events(entry, store, columns)
+    return dfe, dfp
 
 # --- Resolver color del equipo desde master_equipos ---------------------------
+@traced()
 def resolve_team_color(team_id, master_teams_df=None, master_teams_path=None, default="#00E5FF"):
     """
     Devuelve el color (hex) del team_id buscando en master_equipos.
-    Puedes pasar el DF ya cargado o la ruta al CSV.
-    """
-    if master_teams_df is None:
-        if master_teams_path is None:
-            return default
-        try:
-            mt = _auto_csv_vis(master_teams_path)
-        except Exception:
-            return default
+    Puedes pasar el DF ya cargado o la ruta al CSV. Con la ruta se usa el
+    registro de masters (utils.masters): el CSV se lee una vez y solo se
+    recarga si cambia en disco; la búsqueda es un acceso a diccionario.
+    """
+    if master_teams_df is not None:
+        row = index_dataframe(master_teams_df, TEAM_ID_COLUMNS).get(_as_int(team_id))
+    elif master_teams_path is not None:
+        row = teams_table(master_teams_path).get(team_id)
     else:
-        mt = master_teams_df
-
-    # Detecta columnas candidatas
-    def _pick(df, opts):
-        for c in opts:
-            if c in df.columns:
-                return c
-        return None
-
-    col_id  = _pick(mt, ["teamId","id","team_id"])
-    col_hex = _pick(mt, ["color_primario","primary_color","team_color_hex"])
-
-    if col_id is None or col_hex is None:
         return default
+    return team_color_from_row(row, default)
 
+# --- Versión comodín: todo automático con rutas -------------------------------
+def _player_team(dfp, player_id):
+    # teamId del jugador en lg_jugadores (None si no aparece)
     try:
-        tid = int(float(team_id))
+        pid = int(float(player_id))
+        row = dfp[pd.to_numeric(dfp["playerId"], errors="coerce").astype("Int64") == pid]
+        return int(float(row.iloc[0]["teamId"])) if not row.empty else None
     except Exception:
-        return default
+        return None
 
-    row = mt[pd.to_numeric(mt[col_id], errors="coerce").astype("Int64") == tid]
-    if row.empty:
-        return default
-    val = str(row.iloc[0][col_hex]).strip()
-    return val if val.startswith("#") and len(val) in (4,7) else default
 
-# --- Versión comodín: todo automático con rutas -------------------------------
+@traced()
 def plot_pass_network_for_player_auto(
     ax,
     player_id,
-    players_files,
-    events_files,
+    players_files=None,
+    events_files=None,
     master_teams_path=None,
     team_color=None,
+    index=None,
+    store=None,
     **kwargs
 ):
     """
     Helper para no preparar nada en el notebook.
-    - Busca el partido del jugador en players_files/events_files.
+    - Busca el partido del jugador en players_files/events_files (o en index).
+    - Con store lee los eventos del almacén Parquet (EVENTS_FRAME_COLUMNS,
+      normalizados una vez por partido y compartidos con el resto de gráficos).
     - Si no pasas team_color, lo intenta resolver desde master_teams_path.
+    - La red (PassNetwork) se calcula una vez por partido y equipo y se
+      reutiliza para el resto de jugadores destacados de ese equipo.
     - Llama a plot_pass_network_for_player con lo encontrado.
     """
-    dfe, dfp = get_match_data_for_player(player_id, players_files, events_files)
-    if dfe is None or dfp is None:
+    entry = find_match_for_player(player_id, players_files, events_files, index=index)
+    if entry is None:
         return
+    dfp = _load_match_players(entry, store)
+
+    # teamId desde dfp (para el color y para la caché de redes)
+    team_id = _player_team(dfp, player_id)
 
     # Si no pasan color: resolver por teamId del propio jugador
     if team_color is None:
-        # teamId desde dfp
-        try:
-            pid = int(float(player_id))
-            row = dfp[pd.to_numeric(dfp["playerId"], errors="coerce").astype("Int64") == pid]
-            team_id = int(float(row.iloc[0]["teamId"])) if not row.empty else None
-        except Exception:
-            team_id = None
         team_color = resolve_team_color(team_id, master_teams_path=master_teams_path, default="#00E5FF")
 
+    # Red del equipo: una vez por partido y equipo (la reutilizan sus jugadores)
+    forced_team = kwargs.pop("team_id", None)
+    # Misma clave para buscar y para guardar (el teamId que pide esta llamada)
+    key = (_events_stamp(entry, store), forced_team if forced_team is not None else team_id)
+    network = get_cached_network(key)
+    if network is None:
+        events = _match_events_frame(entry, store)
+        network = build_pass_network(events, dfp, player_id=player_id, team_id=forced_team)
+        if network is None:
+            return
+        put_cached_network(key, network)
+
     # Dibuja (usa el pitch ya dibujado por tu draw_pitch_panel)
-    plot_pass_network_for_player(
+    return plot_pass_network_for_player(
         ax=ax,
-        df_events=dfe,
+        df_events=None,
         df_players=dfp,
         player_id=player_id,
         team_color=team_color,
+        network=network,
+        **kwargs
+    )
+
+# --- Red de pases acumulada (temporada / últimas N jornadas) -------------------
+def _player_entries(player_id, players_files, events_files, index, jornadas=None):
+    # Partidos del jugador según el índice (solo las jornadas pedidas)
+    if index is None:
+        if players_files is None or events_files is None:
+            raise ValueError("Hay que pasar players_files/events_files o un index.")
+        index = index_for_files(players_files, events_files)
+    entries = index.lookup(player_id)
+    if jornadas is not None:
+        wanted = {int(j) for j in jornadas}
+        entries = [e for e in entries if _jornada_num(e["jornada"]) in wanted]
+    return entries
+
+
+SEASON_CACHE_SIZE = 16
+_SEASON_ACCUMULATORS = OrderedDict()
+
+
+@traced()
+def season_pass_network(player_id, players_files=None, events_files=None, *, index=None,
+                        store=None, team_id=None, jornadas=None, window=None, min_matches=1):
+    """
+    PassNetwork del equipo de player_id acumulado en todos sus partidos
+    (o solo en las jornadas indicadas; window=N → últimos N partidos).
+    Los partidos se leen de uno en uno (utils.red_pases.PassNetworkAccumulator)
+    y se guarda un acumulador por lista de partidos: al añadir una jornada
+    nueva solo se procesa ese partido. Si un CSV cambia en disco se recalcula
+    desde cero.
+    """
+    entries = _player_entries(player_id, players_files, events_files, index, jornadas)
+    if not entries:
+        return None
+
+    if team_id is None:
+        team_id = _player_team(_load_match_players(entries[0], store), player_id)
+        if team_id is None:
+            return None
+
+    # Un acumulador por lista exacta de partidos (jornadas y partidos del
+    # jugador), así alternar 1-3 / 1-5 o dos jugadores del mismo equipo no
+    # rehace nada. Si no está, se parte de una copia del más largo que sea
+    # prefijo (p. ej. jornadas 1-37 → 1-38) y solo se añaden los que faltan.
+    base = (int(team_id), window, id(store) if store is not None else None)
+    stamps = [_events_stamp(e, store) for e in entries]
+    key = base + (tuple(stamps),)
+    acc = _SEASON_ACCUMULATORS.get(key)
+    if acc is None:
+        prefixes = [a for k, a in _SEASON_ACCUMULATORS.items()
+                    if k[:3] == base and a.seen == stamps[:len(a.seen)]]
+        acc = max(prefixes, key=lambda a: len(a.seen)).copy() if prefixes \
+            else PassNetworkAccumulator(team_id, window=window)
+    _SEASON_ACCUMULATORS[key] = acc
+    _SEASON_ACCUMULATORS.move_to_end(key)
+    while len(_SEASON_ACCUMULATORS) > SEASON_CACHE_SIZE:
+        _SEASON_ACCUMULATORS.popitem(last=False)
+
+    # Solo los partidos que aún no están en el acumulador
+    for entry, stamp in zip(entries[len(acc.seen):], stamps[len(acc.seen):]):
+        acc.add_match(_match_events_frame(entry, store), _load_match_players(entry, store),
+                      match_id=stamp)
+    return acc.network(min_matches=min_matches)
+
+
+@traced()
+def plot_season_pass_network_for_player_auto(
+    ax,
+    player_id,
+    players_files=None,
+    events_files=None,
+    master_teams_path=None,
+    team_color=None,
+    index=None,
+    store=None,
+    jornadas=None,
+    window=None,
+    min_matches=1,
+    **kwargs
+):
+    """
+    Como plot_pass_network_for_player_auto pero con la red acumulada de
+    varias jornadas (ver season_pass_network). Conviene subir min_edge_count
+    (p. ej. 2-3 pases por partido) para que no salgan todas las parejas.
+    """
+    network = season_pass_network(
+        player_id, players_files, events_files, index=index, store=store,
+        team_id=kwargs.pop("team_id", None), jornadas=jornadas, window=window,
+        min_matches=min_matches,
+    )
+    if network is None:
+        return
+    if team_color is None:
+        team_color = resolve_team_color(network.team_id, master_teams_path=master_teams_path,
+                                        default="#00E5FF")
+    return plot_pass_network_for_player(
+        ax=ax,
+        df_events=None,
+        player_id=player_id,
+        team_color=team_color,
+        network=network,
         **kwargs
     )
 
@@ -445,15 +654,18 @@ EVENT_COLORS = {
 }
 
 # Función para dibujar la leyenda de extremos
+@traced()
 def draw_winger_legend(
     ax,
     *,
     x=7, y0=25, dy=6, fz=10, L=10,
     sym_s=42, sym_lw=1.8, head=14,
     lw_goal=2.6, lw_ot=1.6, lw_off=1.6, lw_ast=2.2, lw_kp=1.6, lw_cross=1.2,
-    use_glow=True  # ← NUEVO: para sincronizar con el panel
+    use_glow=True,  # ← NUEVO: para sincronizar con el panel
+    modes=None,     # {capa: modo} usado en el panel (las de densidad van con franja)
 ):
     col = lambda k: EVENT_COLORS[k]["edge"]
+    modes = modes or {}
 
     x0, x1 = x, x + L
     xmid   = x0 + L/2
@@ -485,9 +697,25 @@ def draw_winger_legend(
                             shrinkA=0, shrinkB=0),
             zorder=z+0.1)
 
+    # --- franja de color (capas dibujadas como densidad) ----------------------
+    def _densidad(label, key):
+        nonlocal y
+        if modes.get(key) not in DENSITY_MODES:
+            return False
+        c = col(key)
+        ax.plot([x0, xmid, x1], [y, y, y], lw=7, color=c, alpha=0.35,
+                solid_capstyle="butt", zorder=11)
+        ax.plot([xmid, x1], [y, y], lw=7, color=c, alpha=0.85,
+                solid_capstyle="butt", zorder=11.1)
+        ax.text(tx, y, f"{label} (densidad)", va="center", ha="left", fontsize=fz)
+        y += dy
+        return True
+
     # --- flecha “normal” (para tiros/gol) ------------------------------------
     def _flecha(label, key, lw, m=head):
         nonlocal y
+        if _densidad(label, key):
+            return
         c = col(key)
         if use_glow:
             _glow_arrow(x0, y, x1, y, c, lw_core=lw, lw_glow=lw+4)
@@ -502,6 +730,8 @@ def draw_winger_legend(
     # --- “cometa” (cola + punto final) para asist/kp/centros ------------------
     def _flecha_comet(label, key, lw):
         nonlocal y
+        if _densidad(label, key):
+            return
         c = col(key)
         if use_glow:
             _glow_line(x0, y, x1, y, c, lw_core=lw, lw_glow=lw+4)
@@ -525,20 +755,24 @@ def draw_winger_legend(
     _flecha_comet("Centros",    "cross",    lw_cross)
 
     # --- REGATES --------------------------------------------------------------
-    ax.scatter([xmid], [y], s=sym_s, facecolors="none",
-               edgecolors=col("dribble_ok"), linewidths=sym_lw, zorder=12)
-    ax.text(tx, y, "Regate ganado", va="center", ha="left", fontsize=fz); y += dy
+    if not _densidad("Regate ganado", "dribble_ok"):
+        ax.scatter([xmid], [y], s=sym_s, facecolors="none",
+                   edgecolors=col("dribble_ok"), linewidths=sym_lw, zorder=12)
+        ax.text(tx, y, "Regate ganado", va="center", ha="left", fontsize=fz); y += dy
 
-    ax.text(xmid, y, "×", ha="center", va="center",
-            fontsize=fz+1, color=col("dribble_ng"), zorder=12)
-    ax.text(tx, y, "Regate perdido", va="center", ha="left", fontsize=fz); y += dy
+    if not _densidad("Regate perdido", "dribble_ng"):
+        ax.text(xmid, y, "×", ha="center", va="center",
+                fontsize=fz+1, color=col("dribble_ng"), zorder=12)
+        ax.text(tx, y, "Regate perdido", va="center", ha="left", fontsize=fz); y += dy
 
     # --- RECUPERACIONES -------------------------------------------------------
-    ax.scatter([xmid], [y], s=sym_s, marker="D", facecolors="none",
-               edgecolors=col("recover"), linewidths=sym_lw, zorder=12)
-    ax.text(tx, y, "Recuperaciones", va="center", ha="left", fontsize=fz)
+    if not _densidad("Recuperaciones", "recover"):
+        ax.scatter([xmid], [y], s=sym_s, marker="D", facecolors="none",
+                   edgecolors=col("recover"), linewidths=sym_lw, zorder=12)
+        ax.text(tx, y, "Recuperaciones", va="center", ha="left", fontsize=fz)
 
 # Función para mejorar tiros y goles
+@traced()
 def glow_arrow(ax, xy0, xy1, color, lw_core=1.6, lw_glow=6.0, alpha_glow=0.18, z=3):
     """
     Dibuja una flecha con efecto glow: una capa gruesa semitransparente y otra nítida encima.
@@ -557,7 +791,215 @@ def glow_arrow(ax, xy0, xy1, color, lw_core=1.6, lw_glow=6.0, alpha_glow=0.18, z
                         shrinkA=0, shrinkB=0),
         zorder=z+0.1)
 
+# --- Flechas en bloque (tiros, goles, pases sin cometa) ------------------------
+def _arrow_layer(ax, x0, y0, x1, y1, *, color, lw, alpha=None, head=14, z=3):
+    """
+    Capa de flechas estilo "->": todos los trazos en un LineCollection y todas
+    las puntas en un único PathCollection (puntas en puntos, como
+    mutation_scale de FancyArrowPatch: largo 0.4·head, semiancho 0.2·head).
+    """
+    if len(x0) == 0:
+        return
+    ax.apply_aspect()  # la orientación de la punta depende del aspecto final
+    to_px = ax.transData
+    p0 = to_px.transform(np.column_stack([x0, y0]))
+    p1 = to_px.transform(np.column_stack([x1, y1]))
+    v = p1 - p0
+    dist = np.hypot(v[:, 0], v[:, 1])
+    ok = dist > 0
+    u = np.zeros_like(v)
+    u[ok] = v[ok] / dist[ok, None]
+
+    # Igual que FancyArrowPatch: la punta retrocede medio trazo / sin(ángulo)
+    L, W = 0.4 * head, 0.2 * head
+    pad_pt = 0.5 * lw / (W / np.hypot(L, W))
+    px_per_pt = ax.figure.dpi / 72.0
+    shrink = np.minimum(pad_pt * px_per_pt, dist)
+    p1s = p1 - u * shrink[:, None]
+    end = to_px.inverted().transform(p1s)
+
+    rgba = to_rgba(color, alpha)
+    segs = np.stack([np.column_stack([x0, y0]), end], axis=1)
+    ax.add_collection(LineCollection(
+        segs, linewidths=lw, colors=[rgba], capstyle="round", joinstyle="round",
+        zorder=z,
+    ))
+
+    if not ok.any():
+        return
+    # Puntas: chevron en puntos, centrado en el extremo (offset en datos)
+    uu = u[ok]
+    nn = np.column_stack([-uu[:, 1], uu[:, 0]])
+    tip = -uu * pad_pt
+    arm1 = tip - uu * L + nn * W
+    arm2 = tip - uu * L - nn * W
+    codes = [Path.MOVETO, Path.LINETO, Path.LINETO]
+    paths = [Path(np.array([a1, t, a2]), codes) for a1, t, a2 in zip(arm1, tip, arm2)]
+    ax.add_collection(PathCollection(
+        paths, sizes=np.ones(len(paths)),
+        offsets=np.column_stack([np.asarray(x1)[ok], np.asarray(y1)[ok]]),
+        offset_transform=ax.transData, transform=IdentityTransform(),
+        facecolors="none", edgecolors=[rgba], linewidths=lw,
+        capstyle="round", joinstyle="round", zorder=z,
+    ))
+
+@traced(rows="x0")
+def glow_arrows(ax, x0, y0, x1, y1, color, *, lw_core=1.6, lw_glow=6.0, alpha_glow=0.18,
+                z=3, head_glow=18, head_core=14, use_glow=True):
+    """
+    Versión en bloque de glow_arrow para arrays de orígenes/destinos:
+    capa glow (gruesa, semitransparente) + capa nítida, cada una con sus
+    trazos y sus puntas como colecciones. Con use_glow=False solo la nítida.
+    """
+    x0, y0, x1, y1 = (np.asarray(a, dtype=float) for a in (x0, y0, x1, y1))
+    if use_glow:
+        _arrow_layer(ax, x0, y0, x1, y1, color=color, lw=lw_glow, alpha=alpha_glow,
+                     head=head_glow, z=z)
+    _arrow_layer(ax, x0, y0, x1, y1, color=color, lw=lw_core, head=head_core, z=z+0.1)
+
+# --- Extremo de la flecha de un tiro (en bloque) -------------------------------
+def _shot_endpoints(df):
+    """
+    Devuelve (ex, ey) arrays para dibujar las flechas de tiros.
+    Prioridad (por fila):
+    1) endX/endY válidos (0..100)
+    2) (100, goalMouthY) si existe goalMouthY
+    3) endX/endY fuera de rango, recortados a 0..100
+    4) fallback: flecha recta hacia la portería manteniendo la misma y
+    """
+    y  = df["y"].to_numpy(dtype=float)
+    ex = df["endX"].to_numpy(dtype=float) if "endX" in df.columns else np.full(len(df), np.nan)
+    ey = df["endY"].to_numpy(dtype=float) if "endY" in df.columns else np.full(len(df), np.nan)
+    gy = df["gmy"].to_numpy(dtype=float) if "gmy" in df.columns else np.full(len(df), np.nan)
+
+    has_end = ~np.isnan(ex) & ~np.isnan(ey)
+    in_range = has_end & (ex >= 0) & (ex <= 100) & (ey >= 0) & (ey <= 100)
+    has_gm = ~np.isnan(gy)
+
+    out_x = np.where(in_range, ex,
+            np.where(has_gm, 100.0,
+            np.where(has_end, np.clip(ex, 0.0, 100.0), 100.0)))
+    out_y = np.where(in_range, ey,
+            np.where(has_gm, gy,
+            np.where(has_end, np.clip(ey, 0.0, 100.0), y)))
+    return out_x, out_y
+
+# --- Capas densas en bloque (temporada): celdas en vez de eventos sueltos --------
+# Por encima de DENSE_LAYER_THRESHOLD eventos una capa se dibuja agrupada en
+# celdas del campo rival (x 50..100): el nº de Artists ya no crece con los partidos
+DENSE_LAYER_THRESHOLD = 40
+DENSE_BINS = (6, 6)    # celdas en x (campo rival) y en y
+
+
+def _bin_cells(x, y, bins=DENSE_BINS):
+    # Celda (ix, iy) de cada punto del campo rival, como un único entero
+    nx, ny = bins
+    ix = np.clip(((x - 50.0) / 50.0 * nx).astype(int), 0, nx - 1)
+    iy = np.clip((y / 100.0 * ny).astype(int), 0, ny - 1)
+    return ix * ny + iy
+
+
+def _binned_flows(ax, df, color, *, bins=DENSE_BINS, lw=1.3, alpha=0.55, z=3):
+    """
+    Pases agrupados por celda de origen: un trazo del origen medio al destino
+    medio de cada celda, con grosor y punto final según el nº de pases
+    (mismo estilo cola + punto que los pases sueltos).
+    """
+    d2 = df.dropna(subset=["x", "y", "endX", "endY"])
+    if d2.empty:
+        return
+    x, y = d2["x"].to_numpy(dtype=float), d2["y"].to_numpy(dtype=float)
+    ex, ey = d2["endX"].to_numpy(dtype=float), d2["endY"].to_numpy(dtype=float)
+    cell = _bin_cells(x, y, bins)
+    cells, inv, n = np.unique(cell, return_inverse=True, return_counts=True)
+    mean = lambda v: np.bincount(inv, weights=v) / n
+    x0, y0, x1, y1 = mean(x), mean(y), mean(ex), mean(ey)
+    share = n / n.max()
+    ax.add_collection(LineCollection(
+        np.stack([np.column_stack([x0, y0]), np.column_stack([x1, y1])], axis=1),
+        linewidths=lw * (1 + 3 * share), colors=[to_rgba(color, alpha)],
+        capstyle="round", zorder=z,
+    ))
+    ax.scatter(x1, y1, s=28 * (1 + 3 * share), edgecolor=color, facecolor="#0C0D0E",
+               linewidths=1.0, zorder=z + 1)
+
+
+def _binned_points(ax, df, color, *, bins=DENSE_BINS, marker="o", s=30, lw=1.2, z=4):
+    """Puntos agrupados por celda: un marcador por celda (posición media), tamaño según el nº."""
+    d2 = df.dropna(subset=["x", "y"])
+    if d2.empty:
+        return
+    x, y = d2["x"].to_numpy(dtype=float), d2["y"].to_numpy(dtype=float)
+    cells, inv, n = np.unique(_bin_cells(x, y, bins), return_inverse=True, return_counts=True)
+    # "x" no tiene relleno: se colorea entero; el resto, solo el borde
+    paint = {"color": color} if marker == "x" else {"facecolors": "none", "edgecolors": color}
+    ax.scatter(np.bincount(inv, weights=x) / n, np.bincount(inv, weights=y) / n,
+               s=s * (1 + 3 * n / n.max()), marker=marker, linewidths=lw, zorder=z, **paint)
+
+# --- Modos de densidad por capa (hexbin / hist2d / kde) --------------------------
+# Modo de dibujo de cada capa de plot_winger_actions_for_player:
+#   "events" evento a evento · "cells" celdas con el mismo marcador (ver arriba)
+#   "hexbin" / "hist2d" / "kde" mapa de densidad del origen de las acciones
+LAYER_MODES = ("events", "cells", "hexbin", "hist2d", "kde")
+DENSITY_MODES = ("hexbin", "hist2d", "kde")
+SHOT_LAYERS = ("goal", "shot_ot", "shot_off", "shot_post")   # sin modo "cells"
+DENSITY_EXTENT = (50.0, 100.0, 0.0, 100.0)   # campo rival en coordenadas Opta
+HIST2D_BINS = (10, 10)
+HEXBIN_GRIDSIZE = (10, 8)
+KDE_BANDWIDTH = 4.0    # desviación del núcleo gaussiano (unidades Opta)
+KDE_STEP = 1.0         # tamaño de la rejilla fina de la KDE
+
+
+@lru_cache(maxsize=None)
+def _density_cmap(color, alpha=0.85):
+    # De transparente al color de la capa (EVENT_COLORS): cada capa conserva su color
+    return LinearSegmentedColormap.from_list(
+        f"densidad_{color}", [to_rgba(color, 0.0), to_rgba(color, alpha)])
+
+
+def _kde_grid(x, y, *, bandwidth=KDE_BANDWIDTH, step=KDE_STEP, extent=DENSITY_EXTENT):
+    """
+    KDE gaussiana en rejilla: histograma fino con NumPy y suavizado separable
+    (una convolución por eje). Devuelve (centros x, centros y, z en 0..1).
+    """
+    x0, x1, y0, y1 = extent
+    ex = np.arange(x0, x1 + step / 2, step)
+    ey = np.arange(y0, y1 + step / 2, step)
+    h, _, _ = np.histogram2d(x, y, bins=(ex, ey))
+    r = max(1, int(np.ceil(3 * bandwidth / step)))
+    k = np.exp(-0.5 * (np.arange(-r, r + 1) * step / bandwidth) ** 2)
+    k /= k.sum()
+    h = np.apply_along_axis(np.convolve, 0, h, k, mode="same")
+    h = np.apply_along_axis(np.convolve, 1, h, k, mode="same")
+    top = h.max()
+    return (ex[:-1] + ex[1:]) / 2, (ey[:-1] + ey[1:]) / 2, h / top if top > 0 else h
+
+
+def _density_layer(ax, x, y, color, mode, *, z=2.5):
+    """Densidad de los puntos (x, y) en el campo rival con el color de la capa."""
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    ok = ~np.isnan(x) & ~np.isnan(y)
+    x, y = x[ok], y[ok]
+    if len(x) == 0:
+        return
+    cmap = _density_cmap(color)
+    x0, x1, y0, y1 = DENSITY_EXTENT
+    if mode == "hist2d":
+        h, ex, ey = np.histogram2d(x, y, bins=HIST2D_BINS, range=[[x0, x1], [y0, y1]])
+        ax.pcolormesh(ex, ey, np.ma.masked_equal(h.T, 0), cmap=cmap, vmin=0, vmax=h.max(),
+                      shading="flat", zorder=z)
+    elif mode == "hexbin":
+        ax.hexbin(x, y, gridsize=HEXBIN_GRIDSIZE, extent=DENSITY_EXTENT, mincnt=1,
+                  cmap=cmap, vmin=0, linewidths=0, zorder=z)
+    elif mode == "kde":
+        gx, gy, h = _kde_grid(x, y)
+        ax.contourf(gx, gy, h.T, levels=np.linspace(0.1, 1.0, 7), cmap=cmap,
+                    vmin=0, vmax=1, zorder=z)
+    else:
+        raise ValueError(f"Modo de densidad desconocido: {mode!r} (usa uno de {DENSITY_MODES})")
+
 # Función colocación de eventos en campo
+@traced(rows="df_events")
 def plot_winger_actions_for_player(
     ax,
     df_events,
@@ -565,52 +1007,39 @@ def plot_winger_actions_for_player(
     player_id,
     df_players=None,   # opcional para deducir teamId si hace falta
     show_legend=True,
-    use_glow=True    
+    use_glow=True,
+    density_threshold=DENSE_LAYER_THRESHOLD,
+    layer_modes=None,
+    dense_mode="cells",
 ):
     """
     Pinta acciones clave (goles, tiros, asistencias/pases clave, centros, regates,
     recuperaciones) del JUGADOR en CAMPO RIVAL, con paleta unificada.
     Requiere campo Opta (0..100) ya dibujado.
+    - df_events: lg_eventos crudo o EventsFrame (utils.eventos.normalize_events);
+      puede ser de varios partidos (ver season_player_events).
+    - layer_modes: {capa de EVENT_COLORS: modo} para fijar el modo de una capa
+      ("events", "cells", "hexbin", "hist2d" o "kde"; ver LAYER_MODES). Los
+      tiros y el gol admiten "events" y los modos de densidad.
+    - density_threshold / dense_mode: las capas sin modo fijado y con más
+      eventos que density_threshold se dibujan con dense_mode (por defecto
+      "cells", solo pases y puntos). None = siempre evento a evento.
+    La leyenda marca con una franja de color las capas dibujadas como densidad.
     """
+    layer_modes = dict(layer_modes or {})
+    for key, mode in list(layer_modes.items()) + [("dense_mode", dense_mode)]:
+        if key != "dense_mode" and key not in EVENT_COLORS:
+            raise ValueError(f"Capa desconocida: {key!r} (usa una de {list(EVENT_COLORS)})")
+        if mode not in LAYER_MODES:
+            raise ValueError(f"Modo desconocido para {key}: {mode!r} (usa uno de {LAYER_MODES})")
+        if key in SHOT_LAYERS and mode == "cells":
+            raise ValueError(f"El modo 'cells' no aplica a {key} (usa hexbin, hist2d o kde)")
     if df_events is None or len(df_events) == 0:
         return
 
-    # ---- helpers
-    def to_num(s): return pd.to_numeric(s, errors="coerce")
-
-    def norm_type(s):
-        return (s.astype(str).str.lower()
-                .str.replace(r"[\s_\-]+", "", regex=True))
-
-    def truthy(col):
-        if col not in df_events.columns: 
-            return pd.Series([0]*len(df_events))
-        x = df_events[col]
-        if x.dtype == bool: 
-            return x.astype(int)
-        return to_num(x).fillna(0).astype(int)  # maneja "1.00", "0", "", etc.
-
-    # ---- normaliza columnas básicas
-    d = pd.DataFrame({
-        "type":   norm_type(df_events.get("type", pd.Series(dtype=object))),
-        "pid":    to_num(df_events.get("playerId", np.nan)).astype("Int64"),
-        "tid":    to_num(df_events.get("teamId",  np.nan)).astype("Int64"),
-        "x":      to_num(df_events.get("x",   np.nan)),
-        "y":      to_num(df_events.get("y",   np.nan)),
-        "ex":     to_num(df_events.get("endX",np.nan)),
-        "ey":     to_num(df_events.get("endY",np.nan)),
-        "outc":   df_events.get("outcomeType", "").astype(str).str.lower(),
-        "isgoal": truthy("isGoal"),
-    }).copy()
-
-    # columnas de portería: Opta suele dar goalMouthY/Z (0..100)
-    d["gmy"] = to_num(df_events.get("goalMouthY", df_events.get("qNone_GoalMouthY", np.nan)))
-    d["gmz"] = to_num(df_events.get("goalMouthZ", df_events.get("qNone_GoalMouthZ", np.nan)))  # por si sirve para más adelante
-
-    d["eid"] =   to_num(df_events.get("id", np.nan)).astype("Int64")
-
-    for c in ("x","y","ex","ey"):
-        d[c] = pd.to_numeric(d[c], errors="coerce")
+    # ---- columnas canónicas (utils.eventos): type_norm, outc... y flags en bits
+    ev = normalize_events(df_events)
+    d, flags = ev.df, ev.flags
 
     pid = int(float(player_id))
 
@@ -625,32 +1054,36 @@ def plot_winger_actions_for_player(
             team_id = int(float(row.iloc[0]["teamId"]))
 
     # ---- subset del jugador en campo rival
-    me = d[(d["pid"] == pid) & (d["x"] > 50)].copy()  # campo rival
+    in_me = ((d["pid"] == pid) & (d["x"] > 50)).to_numpy(dtype=bool, na_value=False)
+    me = d[in_me]  # campo rival
+    fme = flags[in_me]
 
-    # ---- filtros por tipo
-    G_GOAL      = me[(me["type"] == "goal") & (me["isgoal"] > 0)]
+    # ---- filtros por tipo (typeId Opta, ver utils.opta)
+    tid_me = me["type_id"].to_numpy()
+    G_GOAL      = me[(tid_me == GOAL_TYPE) & fme.any("isGoal")]
 
-    SH_OT_TYPES = {"savedshot", "attemptsaved", "goal", "shotonpost"}  # ← incluye post
-    SH_OFF_TYPES = {"missedshots"}
+    SH_OT_TYPES = type_codes("SavedShot", "Goal", "ShotOnPost")  # ← incluye post
+    SH_OFF_TYPES = type_codes("MissedShots")
 
-    SH_OT  = me[me["type"].isin(SH_OT_TYPES)]
-    SH_OFF = me[me["type"].isin(SH_OFF_TYPES)]
+    SH_OT  = me[np.isin(tid_me, list(SH_OT_TYPES))]
+    SH_OFF = me[np.isin(tid_me, list(SH_OFF_TYPES))]
 
     # regates
-    DRIBBLE_OK = me[(me["type"] == "takeon") & (me["outc"].str.startswith("succ"))]
-    DRIBBLE_NG = me[(me["type"] == "takeon") & (~me["outc"].str.startswith("succ"))]
+    succ = me["outc"].str.startswith("succ").to_numpy(dtype=bool, na_value=False)
+    DRIBBLE_OK = me[(tid_me == TAKE_ON_TYPE) & succ]
+    DRIBBLE_NG = me[(tid_me == TAKE_ON_TYPE) & ~succ]
 
     # centros: TODOS los centros (da igual bloqueado/no)
-    CROSS_ANY = me[(truthy("qNone_Cross") > 0)]
+    CROSS_ANY = me[fme.any("qNone_Cross")]
 
-    # pases clave / asistencias
-    KEY_PASS = me[(truthy("qNone_KeyPass") > 0) | (truthy("qNone_ShotAssist") > 0)]
-    ASSIST   = me[(truthy("qNone_Assisted") > 0) | (truthy("qNone_IntentionalAssist") > 0)
-                  | (truthy("qNone_IntentionalGoalAssist") > 0)]
+    # pases clave / asistencias (OR de bits)
+    KEY_PASS = me[fme.any("qNone_KeyPass", "qNone_ShotAssist")]
+    ASSIST   = me[fme.any("qNone_Assisted", "qNone_IntentionalAssist",
+                          "qNone_IntentionalGoalAssist")]
 
     # recuperaciones defensivas en campo rival
-    REC_TYPES = {"ballrecovery", "interception", "tackle"}
-    RECOVER   = me[me["type"].isin(REC_TYPES) & (me["outc"].str.startswith("succ"))]
+    REC_TYPES = type_codes("BallRecovery", "Interception", "Tackle")
+    RECOVER   = me[np.isin(tid_me, list(REC_TYPES)) & succ]
 
     # --- PRIORIDADES / DESOLAPES -----------------------------------------------
     # 1) GOL manda sobre cualquier TIRO
@@ -672,39 +1105,57 @@ def plot_winger_actions_for_player(
 
     # ---- DIBUJO --------------------------------------------------------------
     def draw_arrows(df, lw=1.0, ls="-", col="#E6EDF3"):
-        for _, r in df.dropna(subset=["x","y","ex","ey"]).iterrows():
-            ax.annotate("", xy=(float(r["ex"]), float(r["ey"])),
+        for _, r in df.dropna(subset=["x","y","endX","endY"]).iterrows():
+            ax.annotate("", xy=(float(r["endX"]), float(r["endY"])),
                         xytext=(float(r["x"]),  float(r["y"])),
                         arrowprops=dict(arrowstyle="->", lw=lw, linestyle=ls, color=col),
                         zorder=3)
 
     # --- NUEVO estilo con comet --------------------------------------
-    from mplsoccer import Pitch
-    _pitch = Pitch(pitch_type="opta")  # solo para usar .lines() y .scatter()
+    _pitch = get_pitch(pitch_type="opta")  # solo para usar .lines() y .scatter()
+
+    # Modo de cada capa: el fijado en layer_modes o, si la capa es densa, dense_mode
+    used_modes = {}
+
+    def mode_for(col_key, df, *, auto=True):
+        mode = layer_modes.get(col_key)
+        if mode is None:
+            dense = auto and density_threshold is not None and len(df) > density_threshold
+            mode = dense_mode if dense else "events"
+        used_modes[col_key] = mode
+        return mode
+
+    def draw_density(df, col_key, mode):
+        _density_layer(ax, df["x"], df["y"], EVENT_COLORS[col_key]["edge"], mode)
 
     def draw_pass_set(df, *, col_key, lw=1.2, comet=False, alpha=0.7, end_mark=False):
         if df is None or df.empty:
             return
-        d2 = df.dropna(subset=["x","y","ex","ey"])
+        d2 = df.dropna(subset=["x","y","endX","endY"])
         if d2.empty:
             return
         col = EVENT_COLORS[col_key]["edge"]
+        mode = mode_for(col_key, d2)
+        if mode == "cells":
+            _binned_flows(ax, d2, col, lw=lw, alpha=alpha)
+            return
+        if mode in DENSITY_MODES:
+            draw_density(d2, col_key, mode)
+            return
 
         if comet:
             _pitch.lines(
-                d2["x"], d2["y"], d2["ex"], d2["ey"],
+                d2["x"], d2["y"], d2["endX"], d2["endY"],
                 lw=lw, comet=True, color=col, alpha=alpha, ax=ax, zorder=3
             )
         else:
-            for _, r in d2.iterrows():
-                ax.annotate("", xy=(float(r["ex"]), float(r["ey"])),
-                            xytext=(float(r["x"]), float(r["y"])),
-                            arrowprops=dict(arrowstyle="->", lw=lw, color=col),
-                            zorder=3)
+            # flechas simples en bloque (head 10 = tamaño por defecto de annotate)
+            glow_arrows(ax, d2["x"], d2["y"], d2["endX"], d2["endY"], col,
+                        lw_core=lw, head_core=10, z=2.9, use_glow=False)
 
         if end_mark:
             _pitch.scatter(
-                d2["ex"], d2["ey"],
+                d2["endX"], d2["endY"],
                 s=28, edgecolor=col, linewidth=1.0,
                 facecolor="#0C0D0E", zorder=4, ax=ax
             )
@@ -716,62 +1167,36 @@ def plot_winger_actions_for_player(
 
 
     # Tiros: flecha + marcador inicial distinto
-    # ----------- tiros como flechas (con endpoint robusto) ------------------------
-    def _endpoint_for_shot(r):
-        """
-        Devuelve (ex, ey) para dibujar la flecha de un tiro.
-        Prioridad:
-        1) endX/endY válidos (0..100)
-        2) (100, goalMouthY) si existe goalMouthY
-        3) proyección hasta x=100 usando el vector (x,y)->(ex,ey) o un
-            vector genérico hacia portería si no hay ex/ey.
-        """
-        x, y = float(r["x"]), float(r["y"])
-        ex, ey = r.get("ex"), r.get("ey")
-        # a) endX/endY válidos
-        if pd.notna(ex) and pd.notna(ey):
-            exf, eyf = float(ex), float(ey)
-            if 0.0 <= exf <= 100.0 and 0.0 <= eyf <= 100.0:
-                return exf, eyf
-        # b) goal mouth (a la derecha)
-        if pd.notna(r.get("gmy")):
-            return 100.0, float(r["gmy"])
-        # c) proyección lineal hacia x=100 (si hay ey/endY parcial)
-        if pd.notna(ex) and pd.notna(ey):
-            # ya cubierto arriba, pero por si llega algo fuera de rango
-            return min(100.0, max(0.0, float(ex))), min(100.0, max(0.0, float(ey)))
-        # d) fallback: flecha recta hacia la portería manteniendo la misma y
-        return 100.0, y
-
-    def draw_shot_set(df, *, col_key, lw=1.2, start_marker=None, start_text=None, head=14):
+    # ----------- tiros como flechas (con endpoint robusto, ver _shot_endpoints) --
+    def draw_shot_set(df, *, col_key, lw=1.2, start_marker=None, start_text=None, head=14,
+                      lw_glow=6.0, alpha_glow=0.18, head_glow=18, z=4):
         col = EVENT_COLORS[col_key]["edge"]
-        for _, r in df.dropna(subset=["x","y"]).iterrows():
-            x, y = float(r["x"]), float(r["y"])
-            ex, ey = _endpoint_for_shot(r)
-            
-            # flecha del tiro
-            if use_glow:
-                glow_arrow(ax, (x, y), (ex, ey), col, lw_core=lw, lw_glow=6.0, alpha_glow=0.18, z=4)
-            else:
-                ax.annotate(
-                    "", xy=(ex, ey), xytext=(x, y),
-                    arrowprops=dict(
-                        arrowstyle="->",
-                        lw=lw,
-                        color=col,
-                        mutation_scale=head,
-                        shrinkA=0, shrinkB=0,
-                        joinstyle="round", capstyle="round"
-                    ),
-                    zorder=4
-                )
-
-            # marcador de inicio (si procede)
-            if start_marker is not None:
-                ax.scatter([x], [y], s=70, marker=start_marker,
-                        facecolors="none", edgecolors=col, linewidths=1.1, zorder=5)
-            if start_text is not None:
-                ax.text(x, y, start_text, ha="center", va="center",
+        d2 = df.dropna(subset=["x","y"])
+        if d2.empty:
+            return
+        # Los tiros no se agrupan solos: solo si se pide un modo de densidad
+        mode = mode_for(col_key, d2, auto=False)
+        if mode in DENSITY_MODES:
+            draw_density(d2, col_key, mode)
+            return
+        x, y = d2["x"].to_numpy(dtype=float), d2["y"].to_numpy(dtype=float)
+        ex, ey = _shot_endpoints(d2)
+
+        # flechas de los tiros (glow + núcleo, o solo núcleo)
+        if use_glow:
+            glow_arrows(ax, x, y, ex, ey, col, lw_core=lw, lw_glow=lw_glow,
+                        alpha_glow=alpha_glow, head_glow=head_glow, z=z)
+        else:
+            glow_arrows(ax, x, y, ex, ey, col, lw_core=lw, head_core=head, z=z-0.1,
+                        use_glow=False)
+
+        # marcador de inicio (si procede)
+        if start_marker is not None:
+            ax.scatter(x, y, s=70, marker=start_marker,
+                    facecolors="none", edgecolors=col, linewidths=1.1, zorder=5)
+        if start_text is not None:
+            for xi, yi in zip(x, y):
+                ax.text(xi, yi, start_text, ha="center", va="center",
                         fontsize=11, color=col, zorder=5)
 
     # Tiros a puerta 
@@ -780,65 +1205,134 @@ def plot_winger_actions_for_player(
     draw_shot_set(SH_OFF, col_key="shot_off", lw=0.8,  head=13, start_marker=None, start_text=None)
 
     # GOL: flecha más gruesa
-    for _, r in G_GOAL.dropna(subset=["x","y"]).iterrows():
-        x, y = float(r["x"]), float(r["y"])
-        ex, ey = _endpoint_for_shot(r)
-        if use_glow:
-            glow_arrow(ax, (x, y), (ex, ey), EVENT_COLORS["goal"]["edge"],
-                    lw_core=3.0, lw_glow=8.0, alpha_glow=0.22, z=6)
-        else:
-            ax.annotate(
-                "", xy=(ex, ey), xytext=(x, y),
-                arrowprops=dict(
-                    arrowstyle="->",
-                    lw=3.0,
-                    color=EVENT_COLORS["goal"]["edge"],
-                    mutation_scale=18,
-                    shrinkA=0, shrinkB=0,
-                    joinstyle="round", capstyle="round"
-                ),
-                zorder=6
-            )
+    draw_shot_set(G_GOAL, col_key="goal", lw=3.0, head=18,
+                  lw_glow=8.0, alpha_glow=0.22, z=6)
+
+    def draw_point_set(df, *, col_key, **cell_style):
+        # Capas de puntos: True si ya está dibujada como celdas o densidad
+        d2 = df.dropna(subset=["x","y"])
+        mode = mode_for(col_key, d2)
+        if mode == "cells":
+            _binned_points(ax, d2, EVENT_COLORS[col_key]["edge"], **cell_style)
+        elif mode in DENSITY_MODES:
+            draw_density(d2, col_key, mode)
+        return mode != "events"
 
     # Regates
-    ax.scatter(DRIBBLE_OK["x"], DRIBBLE_OK["y"], s=30, facecolors="none",
-            edgecolors=EVENT_COLORS["dribble_ok"]["edge"], linewidths=1.2, zorder=4)
-    for _, r in DRIBBLE_NG.dropna(subset=["x","y"]).iterrows():
-        x, y = float(r["x"]), float(r["y"])
-        dx = 1.0   # largo de cada trazo
-        lw = 1.6   # más gruesa
-        col = EVENT_COLORS["dribble_ng"]["edge"]
-        ax.plot([x-dx, x+dx], [y-dx, y+dx], color=col, lw=lw, zorder=4)
-        ax.plot([x-dx, x+dx], [y+dx, y-dx], color=col, lw=lw, zorder=4)
+    if not draw_point_set(DRIBBLE_OK, col_key="dribble_ok", s=30, lw=1.2):
+        ax.scatter(DRIBBLE_OK["x"], DRIBBLE_OK["y"], s=30, facecolors="none",
+                edgecolors=EVENT_COLORS["dribble_ok"]["edge"], linewidths=1.2, zorder=4)
+    if not draw_point_set(DRIBBLE_NG, col_key="dribble_ng", marker="x", s=40, lw=1.6):
+        for _, r in DRIBBLE_NG.dropna(subset=["x","y"]).iterrows():
+            x, y = float(r["x"]), float(r["y"])
+            dx = 1.0   # largo de cada trazo
+            lw = 1.6   # más gruesa
+            col = EVENT_COLORS["dribble_ng"]["edge"]
+            ax.plot([x-dx, x+dx], [y-dx, y+dx], color=col, lw=lw, zorder=4)
+            ax.plot([x-dx, x+dx], [y+dx, y-dx], color=col, lw=lw, zorder=4)
 
     # Recuperaciones (rombo pequeño)
-    ax.scatter(RECOVER["x"], RECOVER["y"], s=25, marker="D", facecolors="none",
-            edgecolors=EVENT_COLORS["recover"]["edge"], linewidths=1.8, zorder=4)
+    if not draw_point_set(RECOVER, col_key="recover", marker="D", s=25, lw=1.8):
+        ax.scatter(RECOVER["x"], RECOVER["y"], s=25, marker="D", facecolors="none",
+                edgecolors=EVENT_COLORS["recover"]["edge"], linewidths=1.8, zorder=4)
 
     # Leyenda
     if show_legend:
-        draw_winger_legend(ax)
+        draw_winger_legend(ax, modes=used_modes)
 
 # Busca los jugadores, csv y demás
+@traced()
 def plot_winger_actions_for_player_auto(
     ax,
     player_id,
-    players_files,
-    events_files,
+    players_files=None,
+    events_files=None,
     show_legend=True,
+    index=None,
+    store=None,
 ):
     """
     Wrapper automático:
     busca el partido en los CSV *_lg_jugadores y *_lg_eventos
     y llama a plot_winger_actions_for_player.
+    Los eventos normalizados del partido se comparten con la red de pases.
     """
-    # este helper ya está definido en el flujo
-    dfe, dfp = get_match_data_for_player(player_id, players_files, events_files)
-    if dfe is None:
+    entry = find_match_for_player(player_id, players_files, events_files, index=index)
+    if entry is None:
         return
+    dfp = _load_match_players(entry, store)
+    events = _match_events_frame(entry, store)
     plot_winger_actions_for_player(
-        ax, dfe,
+        ax, events,
         player_id=int(float(player_id)),
         df_players=dfp,
         show_legend=show_legend,
     )
+
+# --- Acciones de una temporada (o rango de jornadas) ----------------------------
+@traced(rows="return")
+def season_player_events(player_id, players_files=None, events_files=None, *, index=None,
+                         store=None, jornadas=None, window=None):
+    """
+    EventsFrame con SOLO los eventos de player_id en sus partidos del índice
+    (o en las jornadas indicadas; window=N → últimos N partidos), en orden.
+    - Con store EventArrays: filas del jugador por su índice (sin leer partidos).
+    - Con store EventStore: Parquet de esos partidos filtrado por playerId.
+    - Sin store: cada partido por _match_events_frame (memo compartido con los
+      demás paneles) y se queda solo con las filas del jugador.
+    """
+    entries = _player_entries(player_id, players_files, events_files, index, jornadas)
+    if window is not None:
+        entries = entries[-int(window):]
+    if not entries:
+        return None
+    pid = int(float(player_id))
+    matches = [e["match"] for e in entries]
+
+    if store is not None and all(m in store for m in matches):
+        if hasattr(store, "player_frame"):
+            return store.player_frame(pid, matches=matches)
+        if hasattr(store, "load_player_events"):
+            df = store.load_player_events(pid, matches=matches, columns=EVENTS_FRAME_COLUMNS)
+            return normalize_events(df)
+
+    frames = []
+    for entry in entries:
+        ev = _match_events_frame(entry, store)
+        frames.append(ev.take((ev.df["pid"] == pid).to_numpy(dtype=bool, na_value=False)))
+    return concat_events(frames)
+
+
+@traced()
+def plot_season_winger_actions_for_player_auto(
+    ax,
+    player_id,
+    players_files=None,
+    events_files=None,
+    show_legend=True,
+    index=None,
+    store=None,
+    jornadas=None,
+    window=None,
+    density_threshold=DENSE_LAYER_THRESHOLD,
+    layer_modes=None,
+    dense_mode="cells",
+):
+    """
+    Como plot_winger_actions_for_player_auto pero con las acciones de todos
+    los partidos del jugador (o de jornadas / window, ver season_player_events).
+    Las capas con muchos eventos (centros, pases clave...) se agrupan a partir
+    de density_threshold (dense_mode; layer_modes fija el modo por capa).
+    """
+    events = season_player_events(player_id, players_files, events_files, index=index,
+                                  store=store, jornadas=jornadas, window=window)
+    if events is None or len(events) == 0:
+        return
+    plot_winger_actions_for_player(
+        ax, events,
+        player_id=int(float(player_id)),
+        show_legend=show_legend,
+        density_threshold=density_threshold,
+        layer_modes=layer_modes,
+        dense_mode=dense_mode,
+    )